@@ -1,9 +1,136 @@
 from django.contrib import admin
-from .models import Project, ProjectUpdate, CitizenReport, KenyaCounty, KenyaSubCounty, Kenyawards
+from django.contrib.gis.db.models.functions import AsSVG, Envelope, NumPoints
+from django.db.models import Count, Value
+from django.utils.html import format_html
+from .models import Project, ProjectUpdate, CitizenReport, KenyaCounty, KenyaSubCounty, Kenyawards, BackgroundJob, CSVImportJob
+from .models import Sector, County, Agency, Contractor, WardCoverage
+from .admin_csv_upload import ProjectCSVUploadAdmin
+from .geo import GeodesicArea, SimplifyPreserveTopology
+from .lookups import normalize
 
-admin.site.register(Project)
+admin.site.register(Project, ProjectCSVUploadAdmin)
 admin.site.register(ProjectUpdate)
 admin.site.register(CitizenReport)
-admin.site.register(KenyaCounty)
-admin.site.register(KenyaSubCounty)
-admin.site.register(Kenyawards)
\ No newline at end of file
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "run_after", "finished_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("created_at", "started_at", "finished_at", "last_error")
+
+
+@admin.register(CSVImportJob)
+class CSVImportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "original_name", "status", "rows_processed", "rows_failed", "created_at")
+    list_filter = ("status",)
+    readonly_fields = [f.name for f in CSVImportJob._meta.fields]
+
+
+@admin.register(Sector, County, Agency, Contractor)
+class LookupValueAdmin(admin.ModelAdmin):
+    """Renaming a value here updates the text on all of its projects."""
+    list_display = ("name", "key", "project_count")
+    search_fields = ("name", "key")
+    readonly_fields = ("key",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(project_count=Count("projects"))
+
+    @admin.display(ordering="project_count")
+    def project_count(self, obj):
+        return obj.project_count
+
+    def save_model(self, request, obj, form, change):
+        if not obj.key:
+            obj.key = normalize(obj.name)
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(WardCoverage)
+class WardCoverageAdmin(admin.ModelAdmin):
+    """Read-only; rebuilt by the ``ward_coverage`` job."""
+    list_display = ("ward", "sector", "status", "distance_m", "computed_at")
+    list_filter = ("status", "sector")
+    search_fields = ("ward__ward", "ward__county")
+    list_select_related = ("ward", "sector")
+    raw_id_fields = ("nearest_project",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class BoundaryAdmin(admin.ModelAdmin):
+    """
+    Boundary tables without loading their multipolygons: the changelist
+    defers ``geom`` and gets vertex count and area from SQL, and the change
+    page shows a simplified SVG outline instead of an editable map.
+    """
+    exclude = ("geom",)
+    readonly_fields = ("vertex_count", "area_km2", "geometry_preview")
+    list_per_page = 100
+    show_full_result_count = False
+    # Outline resolution: simplify to about 1/PREVIEW_DETAIL of the extent
+    PREVIEW_DETAIL = 400
+    PREVIEW_SIZE = 320
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("geom").annotate(
+            vertex_count=NumPoints("geom"),
+            area_m2=GeodesicArea("geom"),
+        )
+
+    @admin.display(description="Vertices", ordering="vertex_count")
+    def vertex_count(self, obj):
+        return obj.vertex_count
+
+    @admin.display(description="Area (km²)", ordering="area_m2")
+    def area_km2(self, obj):
+        return round(obj.area_m2 / 1e6, 2) if obj.area_m2 is not None else None
+
+    @admin.display(description="Geometry")
+    def geometry_preview(self, obj):
+        if obj.pk is None:
+            return "-"
+        rows = self.model.objects.filter(pk=obj.pk)
+        envelope = rows.annotate(envelope=Envelope("geom")).values_list("envelope", flat=True).first()
+        if envelope is None:
+            return "-"
+        xmin, ymin, xmax, ymax = envelope.extent
+        width, height = (xmax - xmin) or 1e-6, (ymax - ymin) or 1e-6
+        tolerance = max(width, height) / self.PREVIEW_DETAIL
+        path = rows.annotate(
+            svg=AsSVG(SimplifyPreserveTopology("geom", Value(tolerance)), precision=5)
+        ).values_list("svg", flat=True).first()
+        # ST_AsSVG flips y (SVG y grows downwards), hence -ymax as the top edge
+        return format_html(
+            '<svg viewBox="{} {} {} {}" width="{}" height="{}" preserveAspectRatio="xMidYMid meet" '
+            'style="background:#f8f9fa;border:1px solid #ddd">'
+            '<path d="{}" fill="#7bc96f" fill-opacity="0.6" stroke="#196127" '
+            'stroke-width="{}" fill-rule="evenodd"/></svg>',
+            xmin, -ymax, width, height, self.PREVIEW_SIZE, self.PREVIEW_SIZE,
+            path or "", max(width, height) / self.PREVIEW_SIZE,
+        )
+
+
+@admin.register(KenyaCounty)
+class KenyaCountyAdmin(BoundaryAdmin):
+    list_display = ("county", "pop_2009", "vertex_count", "area_km2")
+    search_fields = ("county",)
+
+
+@admin.register(KenyaSubCounty)
+class KenyaSubCountyAdmin(BoundaryAdmin):
+    list_display = ("subcounty", "county", "province", "vertex_count", "area_km2")
+    list_filter = ("county",)
+    search_fields = ("subcounty", "county")
+
+
+@admin.register(Kenyawards)
+class KenyawardsAdmin(BoundaryAdmin):
+    list_display = ("ward", "subcounty", "county", "vertex_count", "area_km2")
+    list_filter = ("county", "subcounty")
+    search_fields = ("ward", "subcounty", "county")
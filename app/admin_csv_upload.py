@@ -1,71 +1,96 @@
 from django import forms
 from django.contrib import admin
-from django.shortcuts import render, redirect
-from django.urls import path
-import csv
-from .models import Project
-from django.contrib.gis.geos import Point
-import datetime
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import path, reverse
+from .jobs import enqueue
+from .models import CSVImportJob
 
 class CSVUploadForm(forms.Form):
     csv_file = forms.FileField(label="Upload CSV file")
+    dry_run = forms.BooleanField(
+        required=False, label="Dry run (only report new, changed and unchanged rows)"
+    )
 
 class ProjectCSVUploadAdmin(admin.ModelAdmin):
-    change_list_template = "admin/app/project_csv_upload.html"
+    change_list_template = "admin/app/project_change_list.html"
 
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             path('upload-csv/', self.admin_site.admin_view(self.upload_csv), name='project-upload-csv'),
+            path('upload-csv/<int:pk>/', self.admin_site.admin_view(self.import_job), name='project-import-job'),
+            path('upload-csv/<int:pk>/status/', self.admin_site.admin_view(self.import_job_status), name='project-import-job-status'),
+            path('upload-csv/<int:pk>/rejected/', self.admin_site.admin_view(self.import_job_rejected), name='project-import-job-rejected'),
         ]
         return custom_urls + urls
 
     def upload_csv(self, request):
+        """Store the upload on disk and hand it to the job worker."""
         if request.method == "POST":
             form = CSVUploadForm(request.POST, request.FILES)
             if form.is_valid():
                 csv_file = form.cleaned_data['csv_file']
-                decoded_file = csv_file.read().decode('utf-8').splitlines()
-                reader = csv.DictReader(decoded_file)
-                for row in reader:
-                    location = None
-                    lat = row.get('Latitude') or row.get('latitude')
-                    lon = row.get('Longitude') or row.get('longitude')
-                    if lat and lon:
-                        try:
-                            location = Point(float(lon), float(lat))
-                        except Exception:
-                            location = None
-                    # Parse dates
-                    def parse_date(date_str):
-                        if not date_str:
-                            return None
-                        for fmt in ('%d/%m/%Y', '%Y-%m-%d'):
-                            try:
-                                return datetime.datetime.strptime(date_str, fmt).date()
-                            except Exception:
-                                continue
-                        return None
-                    Project.objects.create(
-                        project_id=row.get('Project ID'),
-                        name=row.get('Project Name'),
-                        sector=row.get('Sector'),
-                        status=row.get('Status').lower(),
-                        project_manager=row.get('Project Manager'),
-                        person_responsible=row.get('Person Responsible'),
-                        location=location,
-                        county=row.get('County'),
-                        start_date=parse_date(row.get('Start Date')),
-                        end_date=parse_date(row.get('End Date')),
-                        budget=row.get('Budget (KES)'),
-                        description='',
-                        implementing_agency='',
-                        contractor='',
-                    )
-                self.message_user(request, "Projects uploaded successfully!")
-                return redirect('..')
+                import_job = CSVImportJob.objects.create(
+                    csv_file=csv_file,
+                    original_name=csv_file.name,
+                    file_size=csv_file.size,
+                    uploaded_by=request.user,
+                    dry_run=form.cleaned_data['dry_run'],
+                )
+                enqueue("csv_import", {"import_id": import_job.pk}, max_attempts=1)
+                if import_job.dry_run:
+                    self.message_user(request, "CSV uploaded. The dry run is running in the background; nothing will be saved.")
+                else:
+                    self.message_user(request, "CSV uploaded. The import is running in the background.")
+                return redirect('admin:project-import-job', pk=import_job.pk)
         else:
             form = CSVUploadForm()
-        return render(request, "admin/app/project_csv_upload.html", {"form": form})
+        context = {
+            **self.admin_site.each_context(request),
+            "form": form,
+            "recent_imports": CSVImportJob.objects.select_related("uploaded_by")[:10],
+        }
+        return render(request, "admin/app/project_csv_upload.html", context)
 
-admin.site.register(Project, ProjectCSVUploadAdmin)
+    def import_job(self, request, pk):
+        import_job = get_object_or_404(CSVImportJob, pk=pk)
+        context = {
+            **self.admin_site.each_context(request),
+            "import_job": import_job,
+            "status_url": reverse('admin:project-import-job-status', args=[pk]),
+            "title": f"Import: {import_job.original_name}",
+        }
+        return render(request, "admin/app/csv_import_job.html", context)
+
+    def import_job_status(self, request, pk):
+        """Polled by the job page for live progress."""
+        import_job = get_object_or_404(CSVImportJob, pk=pk)
+        return JsonResponse({
+            "status": import_job.status,
+            "progress_percent": import_job.progress_percent,
+            "rows_processed": import_job.rows_processed,
+            "rows_created": import_job.rows_created,
+            "rows_updated": import_job.rows_updated,
+            "rows_unchanged": import_job.rows_unchanged,
+            "rows_failed": import_job.rows_failed,
+            "rows_missing": import_job.rows_missing,
+            "rows_per_second": import_job.rows_per_second,
+            "elapsed_seconds": round(import_job.elapsed_seconds, 1),
+            "error_counts": import_job.error_counts,
+            "message": import_job.message,
+            "rejected_url": (
+                reverse('admin:project-import-job-rejected', args=[pk])
+                if import_job.rejected_file else ""
+            ),
+        })
+
+    def import_job_rejected(self, request, pk):
+        import_job = get_object_or_404(CSVImportJob, pk=pk)
+        if not import_job.rejected_file:
+            raise Http404("No rejected rows for this import")
+        return FileResponse(
+            import_job.rejected_file.open("rb"),
+            as_attachment=True,
+            filename=f"rejected_{import_job.original_name or 'rows.csv'}",
+        )
@@ -0,0 +1,334 @@
+"""
+Vectorised spatial analytics over project budgets (NumPy).
+"""
+import math
+
+import numpy as np
+from django.contrib.gis.db.models.functions import Centroid
+from django.db.models import F, Func, Q, Subquery, DecimalField
+
+from .geo import PointX, PointY, project_points, projected_ref, to_local_metres, to_lon_lat
+from .lookups import LOOKUP_FIELDS, lookup_names
+from .models import Kenyawards
+
+# Longest grid edge in cells; keeps payloads small whatever the extent.
+MAX_GRID_CELLS = 200
+# Points processed per matrix product, bounding memory to rows x chunk floats.
+KDE_CHUNK = 10000
+
+# Two-tailed z thresholds for 99/95/90% confidence
+GI_CLASSES = ((2.576, "99"), (1.960, "95"), (1.645, "90"))
+
+# Budget distribution summaries
+BUDGET_QUANTILES = (0.0, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 1.0)
+IQR_FENCE = 1.5
+# Iglewicz & Hoaglin: |0.6745 (x - median) / MAD| above 3.5 is an outlier
+MAD_CONSISTENCY = 0.6745
+MAD_THRESHOLD = 3.5
+MAX_OUTLIERS_PER_GROUP = 50
+
+
+def kernel_density(x, y, weights, bandwidth, cell_size):
+    """
+    Weighted Gaussian kernel density on a regular grid in projected metres.
+
+    The Gaussian kernel is separable, so the surface is ``Gy·diag(w)·Gxᵀ``:
+    two small exponentials and one matrix product instead of a
+    cells × points distance matrix.
+
+    Returns ``(density, (minx, miny, maxx, maxy), cell_size)``; density is in
+    weight units per square metre, rows ordered north to south.
+    """
+    pad = 3 * bandwidth
+    minx, maxx = x.min() - pad, x.max() + pad
+    miny, maxy = y.min() - pad, y.max() + pad
+    longest = max(maxx - minx, maxy - miny)
+    cell_size = max(cell_size, longest / MAX_GRID_CELLS)
+
+    cols = int(math.ceil((maxx - minx) / cell_size))
+    rows = int(math.ceil((maxy - miny) / cell_size))
+    maxx, miny = minx + cols * cell_size, maxy - rows * cell_size
+
+    centres_x = minx + (np.arange(cols) + 0.5) * cell_size
+    centres_y = maxy - (np.arange(rows) + 0.5) * cell_size
+
+    density = np.zeros((rows, cols))
+    for start in range(0, len(x), KDE_CHUNK):
+        chunk = slice(start, start + KDE_CHUNK)
+        gx = np.exp(-0.5 * ((centres_x[:, None] - x[None, chunk]) / bandwidth) ** 2)
+        gy = np.exp(-0.5 * ((centres_y[:, None] - y[None, chunk]) / bandwidth) ** 2)
+        density += (gy * weights[None, chunk]) @ gx.T
+
+    density /= 2 * math.pi * bandwidth ** 2
+    return density, (minx, miny, maxx, maxy), cell_size
+
+
+def getis_ord_gi_star(values, x, y, distance_band=None):
+    """
+    Getis-Ord Gi* z-scores with binary distance-band weights (self included).
+
+    When ``distance_band`` is omitted the smallest band that gives every
+    feature at least one neighbour is used. Returns ``(z, p, distance_band)``.
+    """
+    n = len(values)
+    distances = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+    if distance_band is None:
+        nearest = np.where(np.eye(n, dtype=bool), np.inf, distances).min(axis=1)
+        distance_band = float(nearest.max()) if n > 1 else 0.0
+
+    weights = (distances <= distance_band).astype(np.float64)
+    # Binary weights: sum of w equals sum of w squared.
+    w_sum = weights.sum(axis=1)
+
+    mean = values.mean()
+    std = math.sqrt(max((values ** 2).mean() - mean ** 2, 0.0))
+    numerator = weights @ values - mean * w_sum
+    denominator = std * np.sqrt(np.maximum(n * w_sum - w_sum ** 2, 0.0) / max(n - 1, 1))
+
+    z = np.divide(numerator, denominator, out=np.zeros(n), where=denominator > 0)
+    p = np.array([math.erfc(abs(v) / math.sqrt(2)) for v in z])
+    return z, p, distance_band
+
+
+def classify_gi(z):
+    for threshold, confidence in GI_CLASSES:
+        if z >= threshold:
+            return f"hot_{confidence}"
+        if z <= -threshold:
+            return f"cold_{confidence}"
+    return "not_significant"
+
+
+def density_surface(projects, bandwidth_m=5000, cell_m=1000):
+    """
+    Budget-weighted density grid as a compact JSON-ready dict.
+
+    ``values`` holds one byte per cell (0-255, linear in density, row-major
+    from the north-west corner); multiply by ``max_density / 255`` for
+    KES per km².
+    """
+    _, lon, lat, budget = project_points(projects)
+    if len(lon) == 0:
+        return {"type": "grid", "project_count": 0, "rows": 0, "cols": 0, "values": []}
+
+    x, y, origin = to_local_metres(lon, lat)
+    density, (minx, miny, maxx, maxy), cell_size = kernel_density(x, y, budget, bandwidth_m, cell_m)
+    density_km2 = density * 1e6
+
+    peak = float(density_km2.max())
+    scaled = np.zeros(density_km2.shape, dtype=np.uint8)
+    if peak > 0:
+        scaled = np.rint(density_km2 / peak * 255).astype(np.uint8)
+
+    west, south = to_lon_lat(minx, miny, origin)
+    east, north = to_lon_lat(maxx, maxy, origin)
+    return {
+        "type": "grid",
+        "project_count": int(len(lon)),
+        "total_budget": float(budget.sum()),
+        "bandwidth_m": bandwidth_m,
+        "cell_m": round(cell_size, 1),
+        "bbox": [round(float(v), 6) for v in (west, south, east, north)],
+        "rows": int(density.shape[0]),
+        "cols": int(density.shape[1]),
+        "max_density": round(peak, 2),
+        "units": "KES per km²",
+        "values": scaled.ravel().tolist(),
+    }
+
+
+def ward_hotspots(projects, counties=None, distance_m=None):
+    """
+    Getis-Ord Gi* over the total filtered budget located in each ward.
+
+    Ward totals come from one query (a correlated subquery per ward row) and
+    ward centroids are extracted in SQL, so no ward geometry is loaded.
+    """
+    budget_in_ward = (
+        projects.filter(location_utm__intersects=projected_ref("geom_utm"))
+        .order_by()
+        .values(total=Func(F("budget"), function="SUM"))
+    )
+    wards = Kenyawards.objects.all()
+    if counties:
+        county_q = Q()
+        for county in counties:
+            county_q |= Q(county__iexact=county)
+        wards = wards.filter(county_q)
+
+    rows = list(
+        wards.annotate(
+            total_budget=Subquery(budget_in_ward, output_field=DecimalField(max_digits=20, decimal_places=2)),
+            cx=PointX(Centroid("geom")),
+            cy=PointY(Centroid("geom")),
+        ).values_list("id", "ward", "subcounty", "county", "total_budget", "cx", "cy")
+    )
+    if len(rows) < 3:
+        return {"type": "wards", "ward_count": len(rows), "wards": {}}
+
+    values = np.array([float(r[4] or 0) for r in rows])
+    x, y, _ = to_local_metres(np.array([r[5] for r in rows]), np.array([r[6] for r in rows]))
+    z, p, band = getis_ord_gi_star(values, x, y, distance_m)
+
+    return {
+        "type": "wards",
+        "ward_count": len(rows),
+        "distance_band_m": round(band, 1),
+        "wards": {
+            str(row[0]): {
+                "ward": row[1],
+                "subcounty": row[2],
+                "county": row[3],
+                "total_budget": values[i],
+                "z": round(float(z[i]), 3),
+                "p": round(float(p[i]), 4),
+                "class": classify_gi(z[i]),
+            }
+            for i, row in enumerate(rows)
+        },
+    }
+
+
+def segment_quantiles(values, starts, counts, q):
+    """
+    Linearly interpolated quantiles of every group at once.
+
+    ``values`` is sorted by group and then by value, group ``i`` occupying
+    ``values[starts[i]:starts[i] + counts[i]]``. Returns a groups × len(q)
+    array matching ``np.quantile(..., method="linear")`` per group.
+    """
+    position = starts[:, None] + np.asarray(q)[None, :] * (counts[:, None] - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    fraction = position - lower
+    return values[lower] + (values[upper] - values[lower]) * fraction
+
+
+def budget_distribution(budgets, groups, bins=20):
+    """
+    Per-group budget quantiles, log-scale histogram and outlier flags.
+
+    ``budgets`` are positive amounts and ``groups`` integer group codes of
+    the same length. Everything is computed for all groups together: one
+    sort by (group, budget), segment arithmetic for the quantiles, one
+    ``bincount`` for the histograms. Outliers are judged on log10(budget),
+    where project budgets are roughly symmetric, with both Tukey's IQR
+    fences and the MAD-based modified z-score.
+
+    Returns a dict of arrays indexed by position in ``codes``.
+    """
+    order = np.lexsort((budgets, groups))
+    budgets, groups = budgets[order], groups[order]
+    logs = np.log10(budgets)
+    codes, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+    member = np.repeat(np.arange(len(codes)), counts)
+
+    quantiles = segment_quantiles(budgets, starts, counts, BUDGET_QUANTILES)
+    totals = np.add.reduceat(budgets, starts)
+
+    # Shared log-spaced bins so histograms are comparable across groups
+    low, high = logs.min(), logs.max()
+    edges = np.linspace(low, high if high > low else low + 1, bins + 1)
+    bin_index = np.clip(np.searchsorted(edges, logs, side="right") - 1, 0, bins - 1)
+    histograms = np.bincount(member * bins + bin_index, minlength=len(codes) * bins).reshape(-1, bins)
+
+    q1, median, q3 = segment_quantiles(logs, starts, counts, (0.25, 0.5, 0.75)).T
+    iqr = q3 - q1
+    lower_fence, upper_fence = q1 - IQR_FENCE * iqr, q3 + IQR_FENCE * iqr
+
+    deviation = np.abs(logs - median[member])
+    deviation_sorted = deviation[np.lexsort((deviation, member))]
+    mad = segment_quantiles(deviation_sorted, starts, counts, (0.5,))[:, 0]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        modified_z = np.where(
+            mad[member] > 0, MAD_CONSISTENCY * (logs - median[member]) / mad[member], 0.0
+        )
+    iqr_outlier = (logs < lower_fence[member]) | (logs > upper_fence[member])
+    mad_outlier = np.abs(modified_z) > MAD_THRESHOLD
+
+    return {
+        "order": order,
+        "codes": codes,
+        "counts": counts,
+        "totals": totals,
+        "means": totals / counts,
+        "quantiles": quantiles,
+        "bin_edges": 10 ** edges,
+        "histograms": histograms,
+        "iqr_fences": 10 ** np.column_stack((lower_fence, upper_fence)),
+        "mad": mad,
+        "member": member,
+        "modified_z": modified_z,
+        "iqr_outlier": iqr_outlier,
+        "mad_outlier": mad_outlier,
+    }
+
+
+def budget_distributions(projects, group_by="sector", bins=20):
+    """
+    JSON-ready budget distributions of ``projects`` per sector or county
+    (``group_by`` is a ``LOOKUP_FIELDS`` name) or overall (``"all"``).
+
+    Budgets come from a single ``values_list`` query; only the names of the
+    flagged outliers are fetched afterwards.
+    """
+    ref = LOOKUP_FIELDS[group_by][0] if group_by != "all" else None
+    fields = ("id", "budget", ref) if ref else ("id", "budget")
+    rows = list(projects.filter(budget__gt=0).order_by().values_list(*fields))
+    missing = projects.exclude(budget__gt=0).count()
+    if not rows:
+        return {"group_by": group_by, "project_count": 0, "missing_budget": missing, "groups": []}
+
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    budgets = np.fromiter((float(r[1]) for r in rows), dtype=np.float64, count=len(rows))
+    groups = np.zeros(len(rows), dtype=np.int64)
+    if ref:
+        groups = np.fromiter((-1 if r[2] is None else r[2] for r in rows), dtype=np.int64, count=len(rows))
+
+    result = budget_distribution(budgets, groups, bins)
+    ids = ids[result["order"]]
+    flagged = result["iqr_outlier"] | result["mad_outlier"]
+    names = {}
+    if flagged.any():
+        names = dict(projects.model.objects.filter(id__in=ids[flagged].tolist()).values_list("id", "name"))
+    labels = lookup_names(group_by) if ref else {}
+
+    sorted_budgets = budgets[result["order"]]
+    output = []
+    for i, code in enumerate(result["codes"]):
+        rows_in_group = np.flatnonzero(flagged & (result["member"] == i))
+        rows_in_group = rows_in_group[np.argsort(-np.abs(result["modified_z"][rows_in_group]))]
+        output.append({
+            "key": None if code < 0 or not ref else int(code),
+            "name": labels.get(int(code), "Not Specified") if ref else "All projects",
+            "count": int(result["counts"][i]),
+            "total_budget": float(result["totals"][i]),
+            "mean_budget": round(float(result["means"][i]), 2),
+            "quantiles": [round(float(v), 2) for v in result["quantiles"][i]],
+            "histogram": result["histograms"][i].tolist(),
+            "iqr_fences": [round(float(v), 2) for v in result["iqr_fences"][i]],
+            "log10_mad": round(float(result["mad"][i]), 4),
+            "outlier_count": int(len(rows_in_group)),
+            "outliers": [
+                {
+                    "id": int(ids[j]),
+                    "name": names.get(int(ids[j]), ""),
+                    "budget": float(sorted_budgets[j]),
+                    "modified_z": round(float(result["modified_z"][j]), 2),
+                    "iqr": bool(result["iqr_outlier"][j]),
+                    "mad": bool(result["mad_outlier"][j]),
+                }
+                for j in rows_in_group[:MAX_OUTLIERS_PER_GROUP]
+            ],
+        })
+    output.sort(key=lambda g: g["total_budget"], reverse=True)
+
+    return {
+        "group_by": group_by,
+        "project_count": len(rows),
+        "missing_budget": missing,
+        "quantile_levels": list(BUDGET_QUANTILES),
+        "bin_edges": [round(float(v), 2) for v in result["bin_edges"]],
+        "groups": output,
+    }
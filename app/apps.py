@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        # Register job handlers and model signal receivers.
+        from . import coverage, images, importers, intake, signals  # noqa: F401
@@ -0,0 +1,125 @@
+"""
+Pre-built boundary files served by WhiteNoise instead of the GeoJSON views.
+
+``build_boundary_assets`` (run in the release step) writes each level as
+content-hashed GeoJSON and TopoJSON under ``STATIC_ROOT/boundaries/`` with
+``.gz`` and ``.br`` siblings, plus a small ``manifest.json`` mapping the
+plain names to the hashed ones. Only geometry and static attributes go into
+the files; per-boundary project statistics still come from the views
+(``?geometry=0``) because they change with every import.
+"""
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.urls import reverse
+
+from .models import KenyaCounty, KenyaSubCounty, Kenyawards
+from .topojson import topology
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, WhiteNoise does the same
+    brotli = None
+
+ASSET_DIR = "boundaries"
+MANIFEST_NAME = f"{ASSET_DIR}/manifest.json"
+FORMATS = ("geojson", "topojson")
+COORDINATE_DIGITS = 6  # ~0.1 m, far below the source data's accuracy
+
+# level -> (model, static properties, view serving the same layer)
+LEVELS = {
+    "counties": (
+        KenyaCounty,
+        lambda b: {"id": b.id, "county": b.county, "pop_2009": b.pop_2009,
+                   "area_sqkm": round(b.geom.area * 10000, 2)},
+        "counties_geojson",
+    ),
+    "subcounties": (
+        KenyaSubCounty,
+        lambda b: {"id": b.id, "subcounty": b.subcounty, "county": b.county, "province": b.province},
+        "subcounties_geojson",
+    ),
+    "wards": (
+        Kenyawards,
+        lambda b: {"id": b.id, "ward": b.ward, "subcounty": b.subcounty, "county": b.county},
+        "wards_geojson",
+    ),
+}
+
+
+def _round_coords(coords):
+    if isinstance(coords[0], (int, float)):
+        return [round(c, COORDINATE_DIGITS) for c in coords]
+    return [_round_coords(c) for c in coords]
+
+
+def render_level(level):
+    """Return ``{format: bytes}`` for one admin level."""
+    model, properties, _ = LEVELS[level]
+    features = [(b.id, properties(b), b.geom) for b in model.objects.order_by("id")]
+
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": pk,
+                "geometry": {"type": geom.geom_type, "coordinates": _round_coords(geom.coords)},
+                "properties": props,
+            }
+            for pk, props, geom in features
+        ],
+    }
+    return {
+        "geojson": json.dumps(geojson, separators=(",", ":")).encode("utf-8"),
+        "topojson": json.dumps(topology(level, features), separators=(",", ":")).encode("utf-8"),
+    }
+
+
+def hashed_name(name, content):
+    """``boundaries/wards.geojson`` -> ``boundaries/wards.<md5[:12]>.geojson``."""
+    root, ext = os.path.splitext(name)
+    return f"{root}.{hashlib.md5(content).hexdigest()[:12]}{ext}"
+
+
+def compressed_versions(content):
+    """``{suffix: bytes}`` for the precompressed siblings WhiteNoise looks for."""
+    versions = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        versions[".br"] = brotli.compress(content, quality=11)
+    return versions
+
+
+def write_manifest(static_root, paths):
+    with open(os.path.join(static_root, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"paths": paths}, f, indent=2, sort_keys=True)
+
+
+@lru_cache(maxsize=4)
+def _load_manifest(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["paths"]
+
+
+def manifest():
+    """Plain name -> hashed name for the built assets ({} before the first build)."""
+    path = os.path.join(settings.STATIC_ROOT or "", MANIFEST_NAME)
+    try:
+        return _load_manifest(path, os.path.getmtime(path))
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def asset_url(level, fmt="geojson"):
+    """
+    URL of the pre-built file for ``level``, or of the equivalent view when
+    the assets have not been built (e.g. local development).
+    """
+    name = manifest().get(f"{ASSET_DIR}/{level}.{fmt}")
+    if name:
+        return f"{settings.STATIC_URL}{name}"
+    return reverse(LEVELS[level][2])
@@ -0,0 +1,62 @@
+"""
+Versioned caching for derived project data.
+
+Every cached analytics payload is keyed by a global *data version* that is
+bumped whenever projects or boundaries change, so stale entries simply stop
+being read and no per-key invalidation is needed.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+DATA_VERSION_KEY = "project-data-version"
+
+
+def _fresh_version():
+    """
+    A version no earlier counter can have reached. Caches evict the counter
+    like any other key; restarting at 1 would make entries cached under the
+    old low versions current again while they are still within their timeout.
+    """
+    return time.time_ns()
+
+
+def data_version():
+    """Current project data version."""
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        seed = _fresh_version()
+        cache.add(DATA_VERSION_KEY, seed, None)
+        version = cache.get(DATA_VERSION_KEY, seed)
+    return version
+
+
+def bump_data_version():
+    """Invalidate every versioned cache entry."""
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        cache.set(DATA_VERSION_KEY, _fresh_version(), None)
+
+
+def spec_cache_key(prefix, spec):
+    """Stable cache key for ``prefix`` + JSON-serialisable ``spec``."""
+    digest = hashlib.sha1(
+        json.dumps(spec, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{prefix}:v{data_version()}:{digest}"
+
+
+def cached_for_spec(prefix, spec, compute, timeout=None):
+    """Return the cached result of ``compute()`` for ``spec``, computing on a miss."""
+    key = spec_cache_key(prefix, spec)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        if timeout is None:
+            timeout = getattr(settings, "ANALYTICS_CACHE_TIMEOUT", 60 * 60)
+        cache.set(key, result, timeout)
+    return result
@@ -0,0 +1,75 @@
+"""
+Incremental change feed for map clients.
+
+A client fetches ``/projects/changes/`` once for a full snapshot and then
+polls with the returned ``cursor``; each poll carries only the projects
+saved since then (``Project.updated_at``) and the ids of projects that were
+deleted (``ProjectTombstone``) or no longer match the client's filters.
+
+Cursors are opaque to clients: microseconds since the epoch of the poll's
+start. Each poll re-reads a short overlap before the cursor so that rows
+written by a transaction that committed late are not missed; clients apply
+features by id, so the occasional repeat is harmless.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+from .models import Project, ProjectTombstone
+
+CURSOR_OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(moment):
+    return str((moment - _EPOCH) // timedelta(microseconds=1))
+
+
+def decode_cursor(cursor):
+    try:
+        return _EPOCH + timedelta(microseconds=int(cursor))
+    except (TypeError, ValueError, OverflowError):
+        raise InvalidCursor(f"Invalid cursor '{cursor}'")
+
+
+def record_tombstone(project):
+    """Remember a deleted project and drop tombstones past the retention window."""
+    ProjectTombstone.objects.create(project_pk=project.pk, project_id=project.project_id or "")
+    ProjectTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()
+
+
+def changes_since(since, matching):
+    """
+    Projects changed after ``since``.
+
+    ``matching`` is the client's filtered ``Project.objects.for_map()``
+    queryset. Returns ``(changed, removed_ids)``: the changed projects still
+    in ``matching`` that the snapshot would draw (those with ``lon``/``lat``,
+    including the coordinate-column fallback) and the ids the client should
+    drop. ``None`` means
+    ``since`` is older than the tombstone retention and the client must
+    reload the full collection.
+    """
+    if since < timezone.now() - TOMBSTONE_RETENTION:
+        return None
+
+    window_start = since - CURSOR_OVERLAP
+    changed_ids = set(
+        Project.objects.filter(updated_at__gte=window_start).values_list("pk", flat=True)
+    )
+    changed = list(
+        matching.filter(updated_at__gte=window_start, lon__isnull=False, lat__isnull=False).order_by("pk")
+    )
+
+    removed = changed_ids - {project.pk for project in changed}
+    removed.update(
+        ProjectTombstone.objects.filter(deleted_at__gte=window_start)
+        .values_list("project_pk", flat=True)
+    )
+    return changed, sorted(removed)
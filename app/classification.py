@@ -0,0 +1,145 @@
+"""
+Class breaks for the choropleth boundary layers (NumPy).
+
+Breaks are computed once on the server and cached per data version, so
+every client colours a layer with the same classes. A classification is
+``k + 1`` ascending edges ``[min, upper_1, ..., upper_k]``; a value belongs
+to the first class whose upper edge is at least the value.
+"""
+import numpy as np
+from django.db.models import DecimalField, F, Func, IntegerField, Subquery
+
+from .boundary_assets import LEVELS
+from .geo import projected_ref
+
+METHODS = ("jenks", "quantile", "equal_interval")
+METRICS = ("count", "budget", "per_capita")
+MIN_CLASSES, MAX_CLASSES = 2, 9
+# Above this many values Jenks runs on evenly spaced order statistics;
+# the DP needs (n + 1)² floats.
+JENKS_MAX_VALUES = 2000
+
+
+def _segment_costs(x):
+    """
+    Sum of squared deviations of every run ``x[i:j]`` as an (n+1)×(n+1)
+    matrix, from prefix sums; impossible runs (``j <= i``) are ``inf``.
+    """
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    length = np.arange(len(x) + 1)[None, :] - np.arange(len(x) + 1)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        costs = (s2[None, :] - s2[:, None]) - (s1[None, :] - s1[:, None]) ** 2 / length
+    costs[length <= 0] = np.inf
+    return np.maximum(costs, 0)
+
+
+def jenks_breaks(values, k):
+    """
+    Fisher-Jenks natural breaks: the split of the sorted values into ``k``
+    runs with the least total within-class squared deviation. Each step of
+    the dynamic programme is one broadcast over all (start, end) pairs.
+    """
+    x = np.sort(np.asarray(values, dtype=np.float64))
+    distinct = np.unique(x).tolist()
+    if len(distinct) <= k:
+        # One class per distinct value
+        return distinct[:1] + distinct
+    if len(x) > JENKS_MAX_VALUES:
+        x = x[np.linspace(0, len(x) - 1, JENKS_MAX_VALUES).round().astype(int)]
+
+    # Standardise first; prefix sums of raw budgets squared lose precision
+    scale = x.std() or 1.0
+    costs = _segment_costs((x - x.mean()) / scale)
+
+    n = len(x)
+    best = costs[0]  # best[j]: cost of x[:j] in one class
+    starts = []
+    for _ in range(1, k):
+        total = best[:, None] + costs
+        start = total.argmin(axis=0)
+        best = total[start, np.arange(n + 1)]
+        starts.append(start)
+
+    cuts, end = [], n
+    for start in reversed(starts):
+        end = start[end]
+        cuts.append(end)
+    uppers = [x[c - 1] for c in sorted(cuts)]
+    return [float(x[0])] + [float(v) for v in uppers] + [float(x[-1])]
+
+
+def quantile_breaks(values, k):
+    """Edges with (as nearly as ties allow) the same number of values per class."""
+    edges = np.quantile(np.asarray(values, dtype=np.float64), np.linspace(0, 1, k + 1))
+    return np.unique(edges).tolist()
+
+
+def equal_interval_breaks(values, k):
+    values = np.asarray(values, dtype=np.float64)
+    return np.linspace(values.min(), values.max(), k + 1).tolist()
+
+
+BREAKS = {
+    "jenks": jenks_breaks,
+    "quantile": quantile_breaks,
+    "equal_interval": equal_interval_breaks,
+}
+
+
+def assign_classes(values, breaks):
+    """Class index (0-based) of every value for ``breaks`` edges."""
+    if len(breaks) < 2:
+        return np.zeros(len(values), dtype=int)
+    return np.searchsorted(np.asarray(breaks[1:-1]), values, side="left")
+
+
+def boundary_metrics(level, projects):
+    """
+    ``(ids, {metric: values})`` for every boundary of ``level``, counting the
+    projects of ``projects`` located inside it. One query: the per-boundary
+    count and budget are correlated subqueries, no geometry is loaded.
+    """
+    model = LEVELS[level][0]
+    in_boundary = projects.filter(location_utm__within=projected_ref("geom_utm")).order_by()
+    fields = ["id", "project_count", "total_budget"] + (["pop_2009"] if level == "counties" else [])
+    rows = list(
+        model.objects.annotate(
+            project_count=Subquery(
+                in_boundary.values(n=Func(F("id"), function="COUNT")), output_field=IntegerField()
+            ),
+            total_budget=Subquery(
+                in_boundary.values(total=Func(F("budget"), function="SUM")),
+                output_field=DecimalField(max_digits=20, decimal_places=2),
+            ),
+        ).order_by("id").values_list(*fields)
+    )
+
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    counts = np.array([r[1] or 0 for r in rows], dtype=np.float64)
+    budgets = np.array([float(r[2] or 0) for r in rows], dtype=np.float64)
+    metrics = {"count": counts, "budget": budgets}
+    if level == "counties":
+        population = np.array([r[3] or 0 for r in rows], dtype=np.float64)
+        # Same convention as the county GeoJSON: unknown population counts as 1
+        metrics["per_capita"] = budgets / np.where(population > 0, population, 1)
+    return ids, metrics
+
+
+def classify(level, metric, method, k, projects):
+    """JSON-ready classification of one boundary level."""
+    ids, metrics = boundary_metrics(level, projects)
+    values = metrics[metric]
+    breaks = BREAKS[method](values, k) if len(values) else []
+    classes = assign_classes(values, breaks)
+    class_count = max(len(breaks) - 1, 1)
+    return {
+        "level": level,
+        "metric": metric,
+        "method": method,
+        "classes": class_count,
+        "breaks": [round(b, 4) for b in breaks],
+        "class_counts": np.bincount(classes, minlength=class_count).tolist() if len(values) else [],
+        "values": {str(i): round(float(v), 4) for i, v in zip(ids, values)},
+        "assignments": {str(i): int(c) for i, c in zip(ids, classes)},
+    }
@@ -0,0 +1,131 @@
+"""
+Compact binary ("columnar") encoding of project points for the map.
+
+Layout, all little-endian::
+
+    b"KPC1" | uint32 header length | JSON header | column buffers
+
+The header is padded with spaces so the column data, and every column in
+it, starts on an 8-byte boundary and a JavaScript client can wrap each one
+in a typed array (``new Float32Array(buffer, offset, length)``) without
+copying. It lists each column's type, byte offset (from the end of the
+header) and length plus the dictionaries for the categorical columns,
+which are sent as small integer codes instead of repeated strings.
+"""
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"KPC1"
+CONTENT_TYPE = "application/vnd.kenya-projects.columnar"
+
+_TYPE_NAMES = {
+    np.dtype("<u1"): "uint8",
+    np.dtype("<u2"): "uint16",
+    np.dtype("<u4"): "uint32",
+    np.dtype("<f4"): "float32",
+    np.dtype("<f8"): "float64",
+}
+_DTYPES = {name: dtype for dtype, name in _TYPE_NAMES.items()}
+
+DICTIONARY_COLUMNS = ("status", "sector", "county")
+
+
+def _pad(length, alignment=8):
+    return -length % alignment
+
+
+def _dictionary_encode(values):
+    """Return ``(codes, dictionary)`` with the smallest unsigned code type."""
+    dictionary, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    dtype = "<u1" if len(dictionary) <= 0x100 else "<u2"
+    return codes.astype(dtype), [str(v) for v in dictionary]
+
+
+def _utf8_column(strings):
+    """UTF-8 bytes of all strings plus ``len + 1`` uint32 offsets delimiting each one."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype="<u1"), offsets
+
+
+def encode(columns, dictionaries, count):
+    """Pack ``{name: little-endian ndarray}`` columns into one binary blob."""
+    layout, offset = {}, 0
+    for name, array in columns.items():
+        layout[name] = {"type": _TYPE_NAMES[array.dtype], "offset": offset, "length": len(array)}
+        offset += array.nbytes + _pad(array.nbytes)
+
+    header = json.dumps(
+        {"version": 1, "count": count, "columns": layout, "dictionaries": dictionaries},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header += b" " * _pad(len(MAGIC) + 4 + len(header))
+
+    parts = [MAGIC, struct.pack("<I", len(header)), header]
+    for array in columns.values():
+        parts.append(np.ascontiguousarray(array).tobytes())
+        parts.append(b"\0" * _pad(array.nbytes))
+    return b"".join(parts)
+
+
+def decode(blob):
+    """Inverse of :func:`encode`: ``(header, {name: ndarray})`` as zero-copy views."""
+    if blob[:4] != MAGIC:
+        raise ValueError("Not a columnar project payload")
+    (header_length,) = struct.unpack_from("<I", blob, 4)
+    data_start = len(MAGIC) + 4 + header_length
+    header = json.loads(blob[len(MAGIC) + 4:data_start])
+    arrays = {
+        name: np.frombuffer(
+            blob, dtype=_DTYPES[col["type"]], count=col["length"], offset=data_start + col["offset"]
+        )
+        for name, col in header["columns"].items()
+    }
+    return header, arrays
+
+
+PROJECT_FIELDS = ("id", "lon", "lat", "budget", "status", "sector", "county", "name")
+
+
+def project_rows(queryset):
+    """
+    ``PROJECT_FIELDS`` tuples for the mapped projects in ``queryset``, with
+    the same latitude/longitude fallback as the GeoJSON response.
+    """
+    return list(
+        queryset.for_map()
+        .filter(lon__isnull=False, lat__isnull=False)
+        .order_by("id")
+        .values_list(*PROJECT_FIELDS)
+    )
+
+
+def rows_payload(rows, precision=32):
+    """
+    Encode ``PROJECT_FIELDS`` tuples: ``id``, ``lon``, ``lat`` (Float32 or
+    Float64), ``budget``, dictionary-coded ``status``/``sector``/``county``
+    and UTF-8 ``name`` with ``name_offsets``.
+    """
+    ids, lon, lat, budget, status, sector, county, name = zip(*rows) if rows else ([],) * 8
+
+    coord_dtype = "<f8" if precision == 64 else "<f4"
+    columns = {
+        "id": np.asarray(ids, dtype="<u4"),
+        "lon": np.asarray(lon, dtype=coord_dtype),
+        "lat": np.asarray(lat, dtype=coord_dtype),
+        "budget": np.asarray([float(b or 0) for b in budget], dtype="<f8"),
+    }
+    dictionaries = {}
+    for column, values in zip(DICTIONARY_COLUMNS, (status, sector, county)):
+        columns[column], dictionaries[column] = _dictionary_encode([v or "" for v in values])
+    columns["name"], columns["name_offsets"] = _utf8_column([v or "" for v in name])
+
+    return encode(columns, dictionaries, len(rows))
+
+
+def project_payload(queryset, precision=32):
+    """Columnar payload for the mapped projects in ``queryset``."""
+    return rows_payload(project_rows(queryset), precision)
@@ -0,0 +1,130 @@
+"""
+Ward service coverage: how far each ward is from the nearest project of a
+given sector and status ("which wards are furthest from a completed
+health facility?").
+
+Answering that live means a nearest-neighbour search per ward, so
+``rebuild_ward_coverage`` precomputes every (ward, sector, status)
+distance into ``WardCoverage`` and the coverage endpoint only reads it.
+Each (sector, status) pair is one query in which every ward's nearest
+project is found by a KNN subquery on the ``Project.location`` GiST index.
+"""
+from datetime import timedelta
+
+from django.contrib.gis.db.models.functions import Centroid
+from django.db import transaction
+from django.db.models import Min, OuterRef, Subquery
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .geo import NearestTo
+from .jobs import enqueue, job
+from .models import BackgroundJob, Kenyawards, Project, WardCoverage
+
+# Imports often come in bursts; one rebuild shortly after the last is enough.
+REBUILD_DELAY = timedelta(minutes=2)
+# Project fields the stored distances depend on
+COVERAGE_FIELDS = {"location", "sector", "sector_ref", "status"}
+
+
+def _nearest_by_ward(sector_id, status):
+    """``(ward id, nearest project id, distance m)`` for every ward."""
+    candidates = (
+        Project.objects.filter(location__isnull=False, sector_ref_id=sector_id, status=status)
+        .annotate(distance=NearestTo("location", OuterRef("centroid")))
+        .order_by("distance")
+    )
+    return (
+        Kenyawards.objects.annotate(centroid=Centroid("geom"))
+        .annotate(
+            nearest_id=Subquery(candidates.values("id")[:1]),
+            distance_m=Subquery(candidates.values("distance")[:1]),
+        )
+        .values_list("id", "nearest_id", "distance_m")
+    )
+
+
+def compute_ward_coverage():
+    """Replace all ``WardCoverage`` rows; returns the number written."""
+    computed_at = timezone.now()
+    pairs = (
+        Project.objects.filter(location__isnull=False, sector_ref__isnull=False)
+        .values_list("sector_ref_id", "status")
+        .distinct()
+        .order_by()
+    )
+    rows = [
+        WardCoverage(
+            ward_id=ward_id, sector_id=sector_id, status=status,
+            distance_m=distance_m, nearest_project_id=nearest_id, computed_at=computed_at,
+        )
+        for sector_id, status in pairs
+        for ward_id, nearest_id, distance_m in _nearest_by_ward(sector_id, status)
+        if distance_m is not None
+    ]
+    with transaction.atomic():
+        WardCoverage.objects.all().delete()
+        WardCoverage.objects.bulk_create(rows, batch_size=2000)
+    return len(rows)
+
+
+@job("ward_coverage")
+def rebuild_ward_coverage(background_job):
+    """Job handler: recompute the coverage table."""
+    compute_ward_coverage()
+    bump_data_version()
+
+
+def schedule_ward_coverage():
+    """
+    Queue a rebuild once the surrounding transaction commits, unless one is
+    already waiting. Checking after the commit lets a transaction that saves
+    many projects queue a single job.
+    """
+    transaction.on_commit(_queue_rebuild)
+
+
+def _queue_rebuild():
+    if not BackgroundJob.objects.filter(kind="ward_coverage", status="pending").exists():
+        enqueue("ward_coverage", delay=REBUILD_DELAY)
+
+
+def ward_coverage(sectors, statuses):
+    """
+    JSON-ready distance from each ward to the nearest project in any of
+    ``sectors`` (lookup ids) with any of ``statuses``. Wards without such a
+    project anywhere are left out.
+    """
+    rows = (
+        WardCoverage.objects.filter(sector_id__in=sectors, status__in=statuses)
+        .values("ward_id", "ward__ward", "ward__subcounty", "ward__county")
+        .annotate(distance_m=Min("distance_m"))
+        .order_by("-distance_m")
+    )
+    wards = {}
+    for row in rows:
+        wards[str(row["ward_id"])] = {
+            "ward": row["ward__ward"],
+            "subcounty": row["ward__subcounty"],
+            "county": row["ward__county"],
+            "distance_m": round(row["distance_m"], 1),
+        }
+    # Nearest project per ward, from the row that achieved the minimum
+    nearest = (
+        WardCoverage.objects.filter(sector_id__in=sectors, status__in=statuses)
+        .order_by("ward_id", "distance_m")
+        .values_list("ward_id", "nearest_project_id")
+    )
+    for ward_id, project_id in nearest:
+        entry = wards.get(str(ward_id))
+        if entry is not None and "nearest_project" not in entry:
+            entry["nearest_project"] = project_id
+
+    computed = WardCoverage.objects.order_by("-computed_at").values_list("computed_at", flat=True).first()
+    return {
+        "type": "wards",
+        "ward_count": len(wards),
+        "computed_at": computed,
+        "furthest": list(wards)[:10],
+        "wards": wards,
+    }
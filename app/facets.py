@@ -0,0 +1,132 @@
+"""
+Facet counts for the filter sidebars.
+
+For a filter spec, every value of each facet (status, sector, county,
+fiscal year, implementing agency) gets the number of projects and their
+summed budget under all the *other* filters, so a sidebar can show what
+ticking one more box would return without losing the sibling options.
+
+All five facets come from one grouped scan: the non-facet filters (budget,
+progress, dates, subcounty/ward boundaries) go in the WHERE clause and the rows are grouped by every
+facet column at once. Each group then counts towards a facet when it
+matches the selections of all the other facets.
+"""
+import re
+
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractYear
+
+from .caching import cached_for_spec
+from .filters import apply_filter_spec
+from .lookups import lookup_ids, lookup_names, normalize, search_lookup_ids
+from .models import Project
+
+# facet -> (grouped column, lookup field for the label, or None for raw values)
+FACETS = {
+    "status": ("status", None),
+    "sector": ("sector_ref", "sector"),
+    "county": ("county_ref", "county"),
+    "year": ("facet_year", None),
+    "agency": ("agency_ref", "implementing_agency"),
+}
+
+
+def _selections(spec, search):
+    """Allowed grouped-column values per facet filtered in ``spec``."""
+    selected = {}
+    for facet, (_, lookup_field) in FACETS.items():
+        value = spec.get(facet)
+        if not value:
+            continue
+        if facet == "year":
+            try:
+                selected[facet] = {int(value)}
+            except (TypeError, ValueError):
+                continue
+        elif lookup_field:
+            ids = search_lookup_ids(lookup_field, value) if search else lookup_ids(lookup_field, value)
+            selected[facet] = set(ids.values_list("pk", flat=True))
+        else:
+            selected[facet] = set(value)
+    return selected
+
+
+def _build_facet_counts(spec, search):
+    selected = _selections(spec, search)
+    base = {name: value for name, value in spec.items() if name not in FACETS}
+    columns = [column for column, _ in FACETS.values()]
+    groups = (
+        apply_filter_spec(Project.objects.all(), base)
+        .annotate(facet_year=ExtractYear("start_date"))
+        .for_stats(*columns)
+        .annotate(n=Count("id"), budget_total=Sum("budget"))
+    )
+
+    totals = {facet: {} for facet in FACETS}
+    matched = {"count": 0, "budget": 0.0}
+    for row in groups:
+        budget = float(row["budget_total"] or 0)
+        misses = [
+            facet for facet, allowed in selected.items()
+            if row[FACETS[facet][0]] not in allowed
+        ]
+        if len(misses) > 1:
+            continue
+        # A group that misses one facet still counts towards that facet's options
+        for facet in misses or FACETS:
+            key = row[FACETS[facet][0]]
+            if key is None:
+                continue
+            entry = totals[facet].setdefault(key, [0, 0.0])
+            entry[0] += row["n"]
+            entry[1] += budget
+        if not misses:
+            matched["count"] += row["n"]
+            matched["budget"] += budget
+
+    status_labels = dict(Project.STATUS_CHOICES)
+    result = {}
+    for facet, (_, lookup_field) in FACETS.items():
+        names = lookup_names(lookup_field) if lookup_field else {}
+        values = {}
+        for key, (count, budget) in sorted(totals[facet].items(), key=lambda item: -item[1][0]):
+            name = names.get(key, key) if lookup_field else key
+            values[name] = {"count": count, "budget": round(budget, 2)}
+            if facet == "status":
+                values[name]["label"] = status_labels.get(key, key)
+        result[facet] = values
+    result["total"] = {"count": matched["count"], "budget": round(matched["budget"], 2)}
+    return result
+
+
+def facet_counts(spec, search=False):
+    """
+    ``{facet: {value: {"count", "budget"}}, "total": {...}}`` for a filter
+    spec, values ordered by count. Cached until the next data version bump.
+
+    With ``search`` the sector, county and agency selections match names
+    containing the given text, like the project list's ``search_lookup``
+    filters, instead of exact names.
+    """
+    name = "facets-search" if search else "facets"
+    return cached_for_spec(name, spec, lambda: _build_facet_counts(spec, search))
+
+
+def _spelling_key(name):
+    """Matching key that also ignores inner punctuation and spaces ("Murang'a", "Muranga")."""
+    return re.sub(r"[\W_]+", "", normalize(name))
+
+
+def facet_for_names(values, names):
+    """
+    One facet of ``facet_counts()`` keyed by ``names`` instead of lookup
+    names, e.g. the county boundary spellings of the home page dropdown.
+    Values are matched on a spelling-insensitive key; names without
+    projects are left out.
+    """
+    by_key = {}
+    for value, entry in values.items():
+        total = by_key.setdefault(_spelling_key(value), {"count": 0, "budget": 0.0})
+        total["count"] += entry["count"]
+        total["budget"] = round(total["budget"] + entry["budget"], 2)
+    return {name: by_key[_spelling_key(name)] for name in names if _spelling_key(name) in by_key}
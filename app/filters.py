@@ -0,0 +1,148 @@
+"""
+Normalised project filters shared by the JSON analytics endpoints.
+
+A *filter spec* is a plain dict built from the query string with lists
+sorted and empty values dropped, so two requests for the same data produce
+the same spec (and the same cache key) regardless of parameter order.
+
+``filter_options()`` returns the dropdown values every page offers.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.gis.db.models import Union
+
+from .caching import cached_for_spec
+from .lookups import LOOKUP_FIELDS, filter_lookup
+from .models import Project, KenyaCounty, KenyaSubCounty, Kenyawards
+
+LIST_PARAMS = ("status", "sector", "county", "agency")
+# Spatial filters of the home page, applied to projects inside the named boundaries
+BOUNDARY_PARAMS = ("subcounty", "ward")
+SINGLE_PARAMS = (
+    "year", "min_budget", "max_budget", "start_date", "end_date",
+    "min_progress", "max_progress",
+)
+
+
+def filter_spec_from_request(request, list_params=LIST_PARAMS):
+    """Build a filter spec from ``request.GET``."""
+    spec = {}
+    for name in list_params:
+        values = sorted({v for v in request.GET.getlist(name) if v and v != "None"})
+        if values:
+            spec[name] = values
+    for name in SINGLE_PARAMS:
+        value = request.GET.get(name)
+        if value and value != "None":
+            spec[name] = value
+    return spec
+
+
+def apply_filter_spec(queryset, spec):
+    """Apply a filter spec to a ``Project`` queryset."""
+    if spec.get("year"):
+        queryset = queryset.filter(start_date__year=spec["year"])
+    if spec.get("status"):
+        queryset = queryset.filter(status__in=spec["status"])
+    if spec.get("sector"):
+        queryset = filter_lookup(queryset, "sector", spec["sector"])
+    if spec.get("county"):
+        queryset = filter_lookup(queryset, "county", spec["county"])
+    if spec.get("agency"):
+        queryset = filter_lookup(queryset, "implementing_agency", spec["agency"])
+
+    for name, lookup in (("min_budget", "budget__gte"), ("max_budget", "budget__lte")):
+        if spec.get(name):
+            try:
+                queryset = queryset.filter(**{lookup: Decimal(spec[name])})
+            except (InvalidOperation, ValueError, TypeError):
+                pass
+
+    for name, lookup in (("min_progress", "progress__gte"), ("max_progress", "progress__lte")):
+        if spec.get(name):
+            try:
+                queryset = queryset.filter(**{lookup: int(spec[name])})
+            except (ValueError, TypeError):
+                pass
+
+    if spec.get("start_date"):
+        queryset = queryset.filter(start_date__gte=spec["start_date"])
+    if spec.get("end_date"):
+        queryset = queryset.filter(end_date__lte=spec["end_date"])
+    return filter_within_boundaries(queryset, spec.get("subcounty"), spec.get("ward"))
+
+
+def filter_within_boundaries(queryset, subcounties=None, wards=None):
+    """
+    Projects inside any of the named subcounties and any of the named wards.
+    Names matching no boundary leave the queryset unfiltered.
+    """
+    for model, field, names in ((KenyaSubCounty, "subcounty", subcounties), (Kenyawards, "ward", wards)):
+        if not names:
+            continue
+        shape = model.objects.filter(**{f"{field}__in": names}).aggregate(union=Union("geom_utm"))["union"]
+        if shape is not None:
+            queryset = queryset.filter(location_utm__within=shape)
+    return queryset
+
+
+def _distinct(queryset, field):
+    return list(
+        queryset.exclude(**{f"{field}__isnull": True})
+        .exclude(**{field: ""})
+        .values_list(field, flat=True)
+        .distinct()
+        .order_by(field)
+    )
+
+
+def _used_lookup_names(field):
+    """Names of the lookup values that at least one project refers to."""
+    model = LOOKUP_FIELDS[field][1]
+    return list(
+        model.objects.filter(projects__isnull=False)
+        .values_list("name", flat=True)
+        .distinct()
+        .order_by("name")
+    )
+
+
+def _distinct_pairs(model, parent, child):
+    # values_list keeps the boundary geometries out of the query.
+    return (
+        model.objects.exclude(**{f"{parent}__isnull": True}).exclude(**{parent: ""})
+        .exclude(**{f"{child}__isnull": True}).exclude(**{child: ""})
+        .values_list(parent, child)
+        .distinct()
+        .order_by(parent, child)
+    )
+
+
+def _build_filter_options():
+    county_subcounties = {}
+    for county, subcounty in _distinct_pairs(KenyaSubCounty, "county", "subcounty"):
+        county_subcounties.setdefault(county, []).append(subcounty)
+
+    subcounty_wards = {}
+    for subcounty, ward in _distinct_pairs(Kenyawards, "subcounty", "ward"):
+        subcounty_wards.setdefault(subcounty, []).append(ward)
+
+    return {
+        "fiscal_years": sorted(
+            {d.year for d in Project.objects.dates("start_date", "year")}, reverse=True
+        ),
+        "sectors": _used_lookup_names("sector"),
+        "project_counties": _used_lookup_names("county"),
+        "agencies": _used_lookup_names("implementing_agency"),
+        "counties": _distinct(KenyaCounty.objects.all(), "county"),
+        "county_subcounties": county_subcounties,
+        "subcounty_wards": subcounty_wards,
+    }
+
+
+def filter_options():
+    """
+    Dropdown values (years, sectors, counties, boundary hierarchy), cached
+    until the next data version bump.
+    """
+    return cached_for_spec("filter-options", {}, _build_filter_options)
@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 from .models import CitizenReport
 
 class CitizenReportForm(forms.ModelForm):
@@ -9,4 +10,40 @@ class CitizenReportForm(forms.ModelForm):
             'description': forms.Textarea(attrs={'rows': 4, 'class': 'form-control'}),
             'report_type': forms.Select(attrs={'class': 'form-control'}),
             'photo': forms.FileInput(attrs={'class': 'form-control'}),
-        }
\ No newline at end of file
+        }
+
+class ReportIntakeForm(forms.Form):
+    """
+    The citizen report fields without the image decode: the photo is only
+    checked for size and file signature here and fully verified by the
+    ``citizen_report_intake`` job.
+    """
+    MAX_DESCRIPTION_CHARS = 5000
+    # Leading bytes of the formats Pillow reads from phone cameras and galleries
+    PHOTO_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n", b"GIF87a", b"GIF89a")
+
+    report_type = forms.ChoiceField(
+        choices=CitizenReport.REPORT_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    description = forms.CharField(
+        max_length=MAX_DESCRIPTION_CHARS,
+        widget=forms.Textarea(attrs={'rows': 4, 'class': 'form-control'}),
+    )
+    photo = forms.FileField(
+        required=False,
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': 'image/*'}),
+    )
+
+    def clean_photo(self):
+        photo = self.cleaned_data.get("photo")
+        if not photo:
+            return photo
+        if photo.size > settings.REPORT_MAX_PHOTO_MB * 1024 * 1024:
+            raise forms.ValidationError(f"The photo is larger than {settings.REPORT_MAX_PHOTO_MB} MB.")
+        head = photo.read(12)
+        photo.seek(0)
+        is_webp = head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+        if not (is_webp or head.startswith(self.PHOTO_SIGNATURES)):
+            raise forms.ValidationError("Upload a JPEG, PNG, GIF or WebP photo.")
+        return photo
@@ -0,0 +1,119 @@
+"""
+Resized, EXIF-stripped derivatives of uploaded photos.
+
+Originals stay untouched in ``MEDIA_ROOT``; each variant is written next to
+it as ``<name>.<size>.<ext>`` and recorded on the owning model's
+``photo_variants`` field so templates never have to stat the filesystem.
+"""
+import io
+import os
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .jobs import job
+
+# variant name -> (longest edge in px, Pillow format, file extension)
+PHOTO_VARIANTS = {
+    "thumb": (320, "JPEG", "jpg"),
+    "thumb_webp": (320, "WEBP", "webp"),
+    "medium": (1280, "JPEG", "jpg"),
+    "medium_webp": (1280, "WEBP", "webp"),
+}
+
+SAVE_OPTIONS = {
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+    "WEBP": {"quality": 80, "method": 6},
+}
+
+
+def variant_name(name, variant):
+    """Storage name of ``variant`` for the original file ``name``."""
+    root, _ = os.path.splitext(name)
+    size = variant.removesuffix("_webp")
+    return f"{root}.{size}.{PHOTO_VARIANTS[variant][2]}"
+
+
+def _load_upright(fieldfile):
+    """Open an upload, apply its EXIF orientation and flatten it to RGB."""
+    fieldfile.open("rb")
+    try:
+        image = Image.open(fieldfile)
+        image.load()
+    finally:
+        fieldfile.close()
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def generate_variants(fieldfile):
+    """
+    Write every variant for ``fieldfile`` and return ``{variant: name}``.
+
+    Images are re-encoded from pixel data only, so EXIF (including GPS tags
+    from phones) never reaches the derivatives.
+    """
+    storage = fieldfile.storage
+    source = _load_upright(fieldfile)
+    variants = {"source": fieldfile.name}
+
+    for variant, (edge, fmt, _) in PHOTO_VARIANTS.items():
+        image = source.copy()
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        image.save(buffer, fmt, exif=b"", **SAVE_OPTIONS[fmt])
+
+        name = variant_name(fieldfile.name, variant)
+        if storage.exists(name):
+            storage.delete(name)
+        variants[variant] = storage.save(name, ContentFile(buffer.getvalue()))
+
+    return variants
+
+
+def delete_variants(variants, storage):
+    """Remove previously generated files listed in a ``photo_variants`` dict."""
+    for variant, name in variants.items():
+        if variant != "source" and name and storage.exists(name):
+            storage.delete(name)
+
+
+def photo_url(instance, variant=None):
+    """
+    URL of ``variant`` for ``instance.photo``, falling back to the original
+    upload while the variant has not been generated yet.
+    """
+    if not instance.photo:
+        return ""
+    variants = instance.photo_variants or {}
+    name = variants.get(variant) if variants.get("source") == instance.photo.name else None
+    return instance.photo.storage.url(name) if name else instance.photo.url
+
+
+@job("photo_variants")
+def build_photo_variants(background_job):
+    """Job handler: generate variants for one ``ProjectUpdate``/``CitizenReport``."""
+    model = apps.get_model("app", background_job.payload["model"])
+    instance = model.objects.filter(pk=background_job.payload["pk"]).first()
+    if instance is None or not instance.photo:
+        return
+
+    old_variants = instance.photo_variants or {}
+    if old_variants.get("source") == instance.photo.name:
+        return  # already up to date
+
+    variants = generate_variants(instance.photo)
+    # .update() keeps this from re-firing post_save and the enqueue signal.
+    model.objects.filter(pk=instance.pk).update(photo_variants=variants)
+    stale = {k: v for k, v in old_variants.items() if v not in variants.values()}
+    delete_variants(stale, instance.photo.storage)
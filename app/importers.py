@@ -0,0 +1,383 @@
+"""
+Project CSV import shared by the ``admin_csv_upload`` command and the admin
+upload page.
+
+Rows are parsed one at a time from a stream and written in batches, so memory
+use stays flat regardless of file size.
+
+Each project stores a digest of its normalised import fields
+(``Project.import_hash``). Re-importing a file only writes the rows whose
+digest changed, so a monthly re-upload with a few edits costs a few updates
+rather than a rewrite of every row; ``dry_run`` reports the counts without
+writing anything.
+"""
+import csv
+import datetime
+import hashlib
+import io
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.gis.geos import Point
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .coverage import schedule_ward_coverage
+from .jobs import job
+from .lookups import ProjectLookups, clean
+from .models import Project, CSVImportJob
+
+REQUIRED_COLUMNS = ["Project ID", "Project Name", "County"]
+
+# Fields parsed from a CSV row; their normalised values make up the import hash
+PARSED_FIELDS = [
+    "name", "sector", "status", "project_manager", "person_responsible",
+    "location", "county", "start_date", "end_date", "budget",
+    "description", "implementing_agency", "contractor",
+]
+
+# Model fields written by the importer (besides project_id)
+IMPORT_FIELDS = PARSED_FIELDS + [
+    "sector_ref", "county_ref", "agency_ref", "contractor_ref", "import_hash",
+]
+
+BATCH_SIZE = 500
+
+
+class RowError(ValueError):
+    """A CSV row that cannot be imported; the message is shown to the user."""
+
+
+def parse_date(date_str):
+    """Try to parse date in multiple formats."""
+    if not date_str or not date_str.strip():
+        return None
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(date_str.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise RowError(f"Unrecognised date '{date_str}'")
+
+
+def parse_decimal(val):
+    """Convert string to Decimal, cleaning up unwanted chars."""
+    if not val:
+        return None
+    cleaned = (
+        str(val)
+        .replace(",", "")  # remove thousand separators
+        .replace("“", "")
+        .replace("”", "")
+        .replace('"', "")
+        .strip()
+    )
+    if not cleaned:
+        return None
+    try:
+        return Decimal(cleaned)
+    except (InvalidOperation, ValueError):
+        raise RowError(f"Invalid budget '{val}'")
+
+
+def parse_location(row):
+    lat = row.get("Latitude") or row.get("latitude")
+    lon = row.get("Longitude") or row.get("longitude")
+    if not (lat and lon):
+        return None
+    try:
+        return Point(float(lon), float(lat), srid=4326)
+    except (TypeError, ValueError):
+        raise RowError("Invalid coordinates")
+
+
+def content_hash(values):
+    """
+    Digest of the ``PARSED_FIELDS`` in ``values``, insensitive to whitespace
+    and number formatting differences in the source file.
+    """
+    parts = []
+    for field in PARSED_FIELDS:
+        value = values.get(field)
+        if value is None:
+            part = ""
+        elif field == "location":
+            part = f"{value.x:.6f},{value.y:.6f}"
+        elif isinstance(value, Decimal):
+            part = f"{value:.2f}"
+        elif isinstance(value, datetime.date):
+            part = value.isoformat()
+        else:
+            part = clean(str(value))
+        parts.append(part)
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_project_row(row):
+    """
+    Return ``(project_id, defaults)`` for one CSV row, or raise ``RowError``.
+    ``defaults`` includes the row's ``import_hash``.
+    """
+    project_id = (row.get("Project ID") or "").strip()
+    if not project_id:
+        raise RowError("Missing Project ID")
+
+    parsed_start = parse_date(row.get("Start Date"))
+    parsed_end = parse_date(row.get("End Date"))
+    start_date = parsed_start or datetime.date.today()
+    end_date = parsed_end or start_date
+    budget = parse_decimal(row.get("Budget (KES)")) or Decimal("0.00")
+
+    status = row.get("Status")
+    status = status.lower().strip() if status else "planned"
+
+    defaults = {
+        "name": row.get("Project Name") or "Untitled Project",
+        "sector": row.get("Sector") or "",
+        "status": status,
+        "project_manager": row.get("Project Manager") or "",
+        "person_responsible": row.get("Person Responsible") or "",
+        "location": parse_location(row),
+        "county": row.get("County") or "Unknown",
+        "start_date": start_date,
+        "end_date": end_date,
+        "budget": budget,
+        "description": "",
+        "implementing_agency": "",
+        "contractor": "",
+    }
+    # Hash the dates as given: a missing start date defaults to today and
+    # would otherwise make the row look edited every day.
+    defaults["import_hash"] = content_hash(
+        {**defaults, "start_date": parsed_start, "end_date": parsed_end}
+    )
+    return project_id, defaults
+
+
+def _error_category(message):
+    """Group messages like "Invalid budget '12x'" under "Invalid budget"."""
+    return re.sub(r"\s*'.*'", "", message).split(":")[0].strip()
+
+
+def _save_batch(batch):
+    """
+    Upsert ``{project_id: defaults}`` with one SELECT, one INSERT and one UPDATE.
+    Returns ``(created, updated)``.
+    """
+    existing = Project.objects.in_bulk(list(batch), field_name="project_id")
+    now = timezone.now()
+    to_create, to_update = [], []
+
+    for project_id, defaults in batch.items():
+        project = existing.get(project_id)
+        if project is None:
+            to_create.append(Project(project_id=project_id, **defaults))
+            continue
+        for field, value in defaults.items():
+            setattr(project, field, value)
+        project.updated_at = now
+        to_update.append(project)
+
+    with transaction.atomic():
+        Project.objects.bulk_create(to_create)
+        Project.objects.bulk_update(to_update, IMPORT_FIELDS + ["updated_at"])
+    return len(to_create), len(to_update)
+
+
+def _save_rows_individually(batch):
+    """Fallback when a batch fails: find the offending rows one by one."""
+    created = updated = 0
+    failures = {}
+    for project_id, defaults in batch.items():
+        try:
+            with transaction.atomic():
+                _, was_created = Project.objects.update_or_create(
+                    project_id=project_id, defaults=defaults
+                )
+        except Exception as e:
+            failures[project_id] = f"Database error: {e}"
+            continue
+        if was_created:
+            created += 1
+        else:
+            updated += 1
+    return created, updated, failures
+
+
+def import_projects(rows, on_reject=None, on_progress=None, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Import an iterable of CSV dict rows.
+
+    ``on_reject(line_number, row, message)`` is called for every skipped row and
+    ``on_progress(stats)`` after every batch. Returns the final stats dict:
+    ``created``/``updated`` count written rows, ``unchanged`` rows whose
+    import hash matched and ``missing`` existing projects absent from the
+    file (reported only, never deleted). With ``dry_run`` nothing is
+    written and ``created``/``updated`` are what the import would do.
+    """
+    stats = {
+        "processed": 0, "created": 0, "updated": 0, "unchanged": 0, "missing": 0,
+        "failed": 0, "errors": Counter(),
+    }
+    batch, pending_rows = {}, {}
+    seen = set()
+    # Sector/county/agency/contractor text -> lookup ids, cached for the whole file
+    lookups = ProjectLookups()
+
+    def reject(line_number, row, message):
+        stats["failed"] += 1
+        stats["errors"][_error_category(message)] += 1
+        if on_reject:
+            on_reject(line_number, row, message)
+
+    def flush():
+        if not batch:
+            return
+        seen.update(batch)
+        stored = dict(
+            Project.objects.filter(project_id__in=list(batch)).values_list("project_id", "import_hash")
+        )
+        changed = {
+            project_id: defaults for project_id, defaults in batch.items()
+            if stored.get(project_id) != defaults["import_hash"]
+        }
+        stats["unchanged"] += len(batch) - len(changed)
+
+        if dry_run:
+            created = sum(1 for project_id in changed if project_id not in stored)
+            updated, failures = len(changed) - created, {}
+        elif changed:
+            for defaults in changed.values():
+                lookups.apply(defaults)
+            try:
+                created, updated = _save_batch(changed)
+                failures = {}
+            except Exception:
+                created, updated, failures = _save_rows_individually(changed)
+        else:
+            created = updated = 0
+            failures = {}
+        stats["created"] += created
+        stats["updated"] += updated
+        for project_id, message in failures.items():
+            line_number, row = pending_rows[project_id]
+            reject(line_number, row, message)
+        batch.clear()
+        pending_rows.clear()
+        if on_progress:
+            on_progress(stats)
+
+    # Line 1 is the header row
+    for line_number, row in enumerate(rows, start=2):
+        stats["processed"] += 1
+        try:
+            project_id, defaults = parse_project_row(row)
+        except RowError as e:
+            reject(line_number, row, str(e))
+            continue
+
+        # A later duplicate of the same Project ID replaces the earlier row
+        batch[project_id] = defaults
+        pending_rows[project_id] = (line_number, row)
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+    existing_ids = (
+        Project.objects.exclude(project_id__isnull=True).exclude(project_id="")
+        .values_list("project_id", flat=True)
+    )
+    stats["missing"] = sum(1 for project_id in existing_ids.iterator() if project_id not in seen)
+
+    # bulk_create/bulk_update bypass the post_save signal that normally does this.
+    if not dry_run and (stats["created"] or stats["updated"]):
+        bump_data_version()
+        schedule_ward_coverage()
+    return stats
+
+
+def run_csv_import(import_job):
+    """Stream ``import_job.csv_file`` into the database, recording progress."""
+    CSVImportJob.objects.filter(pk=import_job.pk).update(
+        status="running", started_at=timezone.now(), message=""
+    )
+
+    rejected = tempfile.NamedTemporaryFile(
+        mode="w+", newline="", encoding="utf-8", suffix=".csv", delete=False
+    )
+    try:
+        with import_job.csv_file.open("rb") as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            reader = csv.DictReader(text)
+
+            missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+            if missing:
+                raise RowError(f"Missing required column(s): {', '.join(missing)}")
+
+            writer = csv.writer(rejected)
+            writer.writerow(["Line", "Error"] + reader.fieldnames)
+
+            def on_reject(line_number, row, message):
+                writer.writerow([line_number, message] + [row.get(f, "") for f in reader.fieldnames])
+
+            last_saved = [0.0]
+
+            def on_progress(stats):
+                # Avoid hammering the row on fast imports: at most twice a second.
+                if time.monotonic() - last_saved[0] < 0.5:
+                    return
+                last_saved[0] = time.monotonic()
+                CSVImportJob.objects.filter(pk=import_job.pk).update(**_progress_fields(stats, raw.tell()))
+
+            stats = import_projects(
+                reader, on_reject=on_reject, on_progress=on_progress, dry_run=import_job.dry_run
+            )
+
+        fields = _progress_fields(stats, import_job.file_size)
+        if stats["failed"]:
+            rejected.flush()
+            rejected.seek(0)
+            base = os.path.splitext(os.path.basename(import_job.csv_file.name))[0]
+            import_job.rejected_file.save(f"{base}_rejected.csv", File(rejected), save=False)
+            fields["rejected_file"] = import_job.rejected_file.name
+
+        CSVImportJob.objects.filter(pk=import_job.pk).update(
+            status="done", finished_at=timezone.now(), **fields
+        )
+    except Exception as e:
+        CSVImportJob.objects.filter(pk=import_job.pk).update(
+            status="failed", finished_at=timezone.now(), message=str(e)
+        )
+        if not isinstance(e, RowError):
+            raise
+    finally:
+        rejected.close()
+        os.unlink(rejected.name)
+
+
+def _progress_fields(stats, bytes_processed):
+    return {
+        "bytes_processed": bytes_processed,
+        "rows_processed": stats["processed"],
+        "rows_created": stats["created"],
+        "rows_updated": stats["updated"],
+        "rows_unchanged": stats["unchanged"],
+        "rows_failed": stats["failed"],
+        "rows_missing": stats["missing"],
+        "error_counts": dict(stats["errors"]),
+    }
+
+
+@job("csv_import")
+def process_csv_import(background_job):
+    """Job handler: run one admin-uploaded ``CSVImportJob``."""
+    import_job = CSVImportJob.objects.filter(pk=background_job.payload["import_id"]).first()
+    if import_job is None or import_job.status == "done":
+        return
+    run_csv_import(import_job)
@@ -0,0 +1,155 @@
+"""
+Fast intake for citizen reports.
+
+During a baraza campaign, reports arrive in bursts from slow mobile links.
+The request therefore only does what must happen before the reply:
+
+* a per-client rate limit (an approximate counter per fixed window in the
+  shared cache);
+* cheap field checks in ``ReportIntakeForm``: choices, length, photo size
+  and file signature;
+* moving the photo into storage. The intake views spool uploads to a
+  temporary file as they arrive, so this is a rename, not a copy;
+* one INSERT of the report, plus its job.
+
+The ``citizen_report_intake`` job then does the expensive part: a full
+image decode, the resized variants, and the moderation bookkeeping
+(duplicate and bad-photo flags, ``processed_at``).
+"""
+import hashlib
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from .images import delete_variants, generate_variants
+from .jobs import enqueue, job
+from .models import CitizenReport
+
+logger = logging.getLogger(__name__)
+
+# A report repeating one the same client sent for the project this recently is flagged
+DUPLICATE_WINDOW = timedelta(hours=24)
+
+
+def client_key(request):
+    """
+    Hashed identity of the submitter: the user when logged in, otherwise
+    the client address. ``TRUSTED_PROXY_COUNT`` says how many
+    ``X-Forwarded-For`` hops were added by our own proxies.
+    """
+    if request.user.is_authenticated:
+        identity = f"user:{request.user.pk}"
+    else:
+        address = request.META.get("REMOTE_ADDR", "")
+        proxies = getattr(settings, "TRUSTED_PROXY_COUNT", 0)
+        forwarded = [a.strip() for a in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if a.strip()]
+        if proxies and len(forwarded) >= proxies:
+            address = forwarded[-proxies]
+        identity = f"addr:{address}"
+    return hashlib.sha256(f"{settings.SECRET_KEY}:{identity}".encode()).hexdigest()
+
+
+def throttle(key):
+    """
+    Count one submission for ``key``. Returns 0 when it is allowed, else
+    the seconds until the client's window resets.
+
+    The limit is approximate on the default DatabaseCache: its ``incr()``
+    reads and rewrites the row, so simultaneous submissions from one client
+    can count once and a burst may exceed the limit by the number of
+    requests in flight. Redis or Memcached (``CACHE_BACKEND``) count
+    atomically. The limit only guards against floods, so that is enough.
+    """
+    limit = settings.REPORT_RATE_LIMIT
+    window = settings.REPORT_RATE_WINDOW_SECONDS
+    if limit <= 0:
+        return 0
+    now = time.time()
+    cache_key = f"report-rate:{key}:{int(now // window)}"
+    cache.add(cache_key, 0, timeout=window * 2)
+    try:
+        count = cache.incr(cache_key)
+    except ValueError:  # evicted between add() and incr()
+        cache.set(cache_key, 1, timeout=window * 2)
+        count = 1
+    if count <= limit:
+        return 0
+    return max(int(window - now % window), 1)
+
+
+def accept_report(project_id, cleaned_data, key, user=None):
+    """Store a validated report and queue its processing; returns the report."""
+    report = CitizenReport(
+        project_id=project_id,
+        report_type=cleaned_data["report_type"],
+        description=cleaned_data["description"],
+        reported_by=user if user is not None and user.is_authenticated else None,
+        client_key=key,
+    )
+    photo = cleaned_data.get("photo")
+    if photo:
+        report.photo.save(photo.name, photo, save=False)
+    try:
+        with transaction.atomic():
+            # bulk_create() sends no post_save, so the photo_variants signal
+            # stays quiet; the intake job builds the variants itself.
+            CitizenReport.objects.bulk_create([report])
+            enqueue("citizen_report_intake", {"pk": report.pk})
+    except Exception:
+        if report.photo:
+            report.photo.delete(save=False)
+        raise
+    return report
+
+
+def _photo_is_readable(fieldfile):
+    fieldfile.open("rb")
+    try:
+        with Image.open(fieldfile) as image:
+            image.verify()
+        return True
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        return False
+    finally:
+        fieldfile.close()
+
+
+@job("citizen_report_intake")
+def process_report(background_job):
+    """Job handler: verify the photo, build variants and flag the report for moderators."""
+    report = CitizenReport.objects.filter(pk=background_job.payload["pk"]).first()
+    if report is None or report.processed_at is not None:
+        return
+
+    flags = list(report.moderation_flags or [])
+    changes = {}
+    if report.photo:
+        if _photo_is_readable(report.photo):
+            if (report.photo_variants or {}).get("source") != report.photo.name:
+                changes["photo_variants"] = generate_variants(report.photo)
+        else:
+            logger.info("Citizen report %s: dropping unreadable photo %s", report.pk, report.photo.name)
+            delete_variants(report.photo_variants or {}, report.photo.storage)
+            report.photo.delete(save=False)
+            changes.update(photo="", photo_variants={})
+            flags.append("invalid_photo")
+
+    if report.client_key and CitizenReport.objects.filter(
+        project_id=report.project_id,
+        client_key=report.client_key,
+        description=report.description,
+        created_at__gte=report.created_at - DUPLICATE_WINDOW,
+        pk__lt=report.pk,
+    ).exists():
+        flags.append("duplicate")
+
+    # .update() keeps this from firing post_save and the photo_variants signal
+    CitizenReport.objects.filter(pk=report.pk).update(
+        **changes, moderation_flags=sorted(set(flags)), processed_at=timezone.now()
+    )
@@ -0,0 +1,114 @@
+"""
+Minimal database-backed job queue.
+
+Work is stored as ``BackgroundJob`` rows and executed by the ``run_jobs``
+management command, so no external broker is needed. Handlers register
+themselves with the ``@job("kind")`` decorator.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+_HANDLERS = {}
+
+
+def job(kind):
+    """Register the decorated function as the handler for ``kind`` jobs."""
+    def decorator(func):
+        _HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, delay=None, max_attempts=3):
+    """
+    Queue a job once the surrounding transaction commits.
+
+    Returns the unsaved-until-commit job instance so callers can keep a handle
+    on it (e.g. to link progress records).
+    """
+    if kind not in _HANDLERS:
+        raise ValueError(f"No job handler registered for '{kind}'")
+
+    run_after = timezone.now() + delay if delay else timezone.now()
+    background_job = BackgroundJob(
+        kind=kind,
+        payload=payload or {},
+        run_after=run_after,
+        max_attempts=max_attempts,
+    )
+    transaction.on_commit(background_job.save)
+    return background_job
+
+
+def _claim(job_id):
+    """Atomically move a pending job to running; False if another worker won."""
+    return BackgroundJob.objects.filter(pk=job_id, status="pending").update(
+        status="running",
+        started_at=timezone.now(),
+        attempts=F("attempts") + 1,
+    ) == 1
+
+
+def run_job(background_job):
+    """Execute a claimed job and record its outcome."""
+    handler = _HANDLERS.get(background_job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No job handler registered for '{background_job.kind}'")
+        handler(background_job)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Job %s failed", background_job)
+        if background_job.attempts < background_job.max_attempts and handler is not None:
+            # Exponential back-off: 30s, 60s, 120s, ...
+            backoff = timedelta(seconds=30 * 2 ** (background_job.attempts - 1))
+            background_job.status = "pending"
+            background_job.run_after = timezone.now() + backoff
+        else:
+            background_job.status = "failed"
+            background_job.finished_at = timezone.now()
+        background_job.last_error = error[-4000:]
+        background_job.save(update_fields=["status", "run_after", "finished_at", "last_error"])
+        return False
+
+    background_job.status = "done"
+    background_job.finished_at = timezone.now()
+    background_job.save(update_fields=["status", "finished_at"])
+    return True
+
+
+def run_pending(limit=50, kinds=None):
+    """
+    Claim and run up to ``limit`` due jobs. Returns the number processed.
+
+    Safe to call from several workers at once: each job is claimed with a
+    conditional UPDATE before it runs.
+    """
+    due = BackgroundJob.objects.filter(status="pending", run_after__lte=timezone.now())
+    if kinds:
+        due = due.filter(kind__in=kinds)
+
+    processed = 0
+    for job_id in list(due.order_by("run_after", "id").values_list("id", flat=True)[:limit]):
+        if not _claim(job_id):
+            continue
+        run_job(BackgroundJob.objects.get(pk=job_id))
+        processed += 1
+    return processed
+
+
+def requeue_stale(older_than=timedelta(minutes=30)):
+    """Return jobs stuck in 'running' (e.g. after a worker crash) to the queue."""
+    cutoff = timezone.now() - older_than
+    return BackgroundJob.objects.filter(status="running", started_at__lt=cutoff).update(
+        status="pending", run_after=timezone.now()
+    )
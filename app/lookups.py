@@ -0,0 +1,124 @@
+"""
+Dimension tables for the free-text project attributes.
+
+``Project.sector``, ``county``, ``implementing_agency`` and ``contractor``
+each have an integer foreign key to a small lookup table (``sector_ref``
+etc.). Input text is matched on a normalised key, so "Health", "health "
+and "HEALTH." all land on the same row and group together, and filters and
+group-bys compare integers instead of strings.
+"""
+import re
+
+from django.db.models import Q
+
+from .models import Agency, Contractor, County, Sector
+
+# Project text field -> (foreign key field, lookup model)
+LOOKUP_FIELDS = {
+    "sector": ("sector_ref", Sector),
+    "county": ("county_ref", County),
+    "implementing_agency": ("agency_ref", Agency),
+    "contractor": ("contractor_ref", Contractor),
+}
+
+
+def clean(text):
+    """Trim and collapse whitespace; this is the spelling stored for new values."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def normalize(text):
+    """Matching key: cleaned, case-folded, without surrounding punctuation."""
+    return clean(text).strip(" .,;:-_").casefold()
+
+
+class LookupCache:
+    """
+    In-memory key -> ``(id, name)`` map of one lookup table, loaded on first
+    use and extended as new values are created. Meant to live for one import.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._entries = None
+
+    def resolve(self, text):
+        """``(id, canonical name)`` for ``text``, or ``(None, "")`` when blank."""
+        key = normalize(text)
+        if not key:
+            return None, ""
+        if self._entries is None:
+            self._entries = {
+                key: (pk, name)
+                for pk, key, name in self.model.objects.values_list("pk", "key", "name")
+            }
+        if key not in self._entries:
+            obj, _ = self.model.objects.get_or_create(key=key, defaults={"name": clean(text)[:200]})
+            self._entries[key] = (obj.pk, obj.name)
+        return self._entries[key]
+
+
+class ProjectLookups:
+    """One ``LookupCache`` per lookup table, for resolving many rows."""
+
+    def __init__(self):
+        self.caches = {field: LookupCache(model) for field, (_, model) in LOOKUP_FIELDS.items()}
+
+    def apply(self, values):
+        """
+        Set ``<ref>_id`` in a dict of ``Project`` field values and replace
+        the text with its canonical spelling. Returns ``values``.
+        """
+        for field, (ref, _) in LOOKUP_FIELDS.items():
+            if field not in values:
+                continue
+            pk, name = self.caches[field].resolve(values[field])
+            values[f"{ref}_id"] = pk
+            if pk is not None:
+                values[field] = name
+        return values
+
+
+def resolve_lookups(project):
+    """Point a single project's foreign keys at (possibly new) lookup rows."""
+    for field, (ref, model) in LOOKUP_FIELDS.items():
+        text = getattr(project, field)
+        key = normalize(text)
+        if not key:
+            setattr(project, f"{ref}_id", None)
+            continue
+        obj, _ = model.objects.get_or_create(key=key, defaults={"name": clean(text)[:200]})
+        setattr(project, f"{ref}_id", obj.pk)
+        setattr(project, field, obj.name)
+
+
+def lookup_ids(field, names):
+    """Queryset of the lookup ids matching any of ``names``."""
+    model = LOOKUP_FIELDS[field][1]
+    return model.objects.filter(key__in={normalize(n) for n in names}).values("pk")
+
+
+def filter_lookup(queryset, field, names):
+    """Filter projects whose ``field`` is one of ``names`` using the integer key."""
+    ref = LOOKUP_FIELDS[field][0]
+    return queryset.filter(**{f"{ref}__in": lookup_ids(field, names)})
+
+
+def search_lookup_ids(field, texts):
+    """Queryset of the lookup ids whose name contains any of ``texts``, ignoring case."""
+    model = LOOKUP_FIELDS[field][1]
+    matches = Q()
+    for text in texts:
+        matches |= Q(name__icontains=clean(text))
+    return model.objects.filter(matches).values("pk")
+
+
+def search_lookup(queryset, field, text):
+    """``field__icontains=text``, evaluated on the small lookup table."""
+    ref = LOOKUP_FIELDS[field][0]
+    return queryset.filter(**{f"{ref}__in": search_lookup_ids(field, [text])})
+
+
+def lookup_names(field):
+    """``{id: name}`` for a lookup table, to label integer group-bys."""
+    return dict(LOOKUP_FIELDS[field][1].objects.values_list("pk", "name"))
@@ -1,10 +1,7 @@
 import csv
-import datetime
 import time
-from decimal import Decimal, InvalidOperation
 from django.core.management.base import BaseCommand, CommandError
-from django.contrib.gis.geos import Point
-from app.models import Project
+from app.importers import REQUIRED_COLUMNS, import_projects
 
 
 class Command(BaseCommand):
@@ -14,109 +11,57 @@ class Command(BaseCommand):
         parser.add_argument(
             "csv_file", type=str, help="The path to the CSV file to upload"
         )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Report new, changed, unchanged and missing projects without saving"
+        )
 
     def handle(self, *args, **options):
         csv_file_path = options["csv_file"]
 
-        def parse_date(date_str):
-            """Try to parse date in multiple formats."""
-            if not date_str:
-                return None
-            for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
-                try:
-                    return datetime.datetime.strptime(date_str.strip(), fmt).date()
-                except Exception:
-                    continue
-            return None
+        def on_reject(line_number, row, message):
+            self.stderr.write(self.style.WARNING(f"Skipped line {line_number}: {message}"))
 
-        def parse_decimal(val):
-            """Convert string to Decimal, cleaning up unwanted chars."""
-            if not val:
-                return None
-            try:
-                cleaned = (
-                    str(val)
-                    .replace(",", "")  # remove thousand separators
-                    .replace("“", "")
-                    .replace("”", "")
-                    .replace('"', "")
-                    .strip()
-                )
-                return Decimal(cleaned) if cleaned else None
-            except (InvalidOperation, ValueError):
-                return None
+        def on_progress(stats):
+            self.stdout.write(f"Processed {stats['processed']} rows...")
 
         try:
             start_time = time.time()
 
-            with open(csv_file_path, newline="", encoding="utf-8") as csvfile:
+            with open(csv_file_path, newline="", encoding="utf-8-sig") as csvfile:
                 reader = csv.DictReader(csvfile)
 
                 # ✅ validate required columns
-                required_fields = ["Project ID", "Project Name", "County"]
-                for field in required_fields:
-                    if field not in reader.fieldnames:
+                for field in REQUIRED_COLUMNS:
+                    if field not in (reader.fieldnames or []):
                         raise CommandError(f"Missing required column: {field}")
 
-                count_new, count_updated = 0, 0
-
-                for i, row in enumerate(reader, start=1):
-                    # Handle location (lat/lon)
-                    location = None
-                    lat = row.get("Latitude") or row.get("latitude")
-                    lon = row.get("Longitude") or row.get("longitude")
-                    if lat and lon:
-                        try:
-                            location = Point(float(lon), float(lat))
-                        except Exception:
-                            location = None
-
-                    # Safely parse fields with fallbacks
-                    project_id = row.get("Project ID")
-                    start_date = parse_date(row.get("Start Date")) or datetime.date.today()
-                    end_date = parse_date(row.get("End Date")) or start_date
-                    budget = parse_decimal(row.get("Budget (KES)")) or Decimal("0.00")
-
-                    status = row.get("Status")
-                    status = status.lower().strip() if status else "planned"
-
-                    defaults = {
-                        "name": row.get("Project Name") or "Untitled Project",
-                        "sector": row.get("Sector") or "",
-                        "status": status,
-                        "project_manager": row.get("Project Manager") or "",
-                        "person_responsible": row.get("Person Responsible") or "",
-                        "location": location,
-                        "county": row.get("County") or "Unknown",
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "budget": budget,
-                        "description": "",
-                        "implementing_agency": "",
-                        "contractor": "",
-                    }
-
-                    # Update if exists, create if not
-                    obj, created = Project.objects.update_or_create(
-                        project_id=project_id, defaults=defaults
-                    )
-                    if created:
-                        count_new += 1
-                    else:
-                        count_updated += 1
-
-                    # ✅ log progress every 100 rows
-                    if i % 100 == 0:
-                        self.stdout.write(f"Processed {i} rows...")
+                stats = import_projects(
+                    reader, on_reject=on_reject, on_progress=on_progress, dry_run=options["dry_run"]
+                )
 
             elapsed = round(time.time() - start_time, 2)
+            if options["dry_run"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Dry run: {stats['created']} new, {stats['updated']} changed, "
+                        f"{stats['unchanged']} unchanged, {stats['failed']} invalid, "
+                        f"{stats['missing']} existing projects not in the file. Nothing was saved."
+                    )
+                )
+                return
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"Upload complete: {count_new} new, {count_updated} updated in {elapsed} seconds."
+                    f"Upload complete: {stats['created']} new, {stats['updated']} updated, "
+                    f"{stats['unchanged']} unchanged, {stats['failed']} skipped in {elapsed} seconds."
                 )
             )
+            if stats["missing"]:
+                self.stdout.write(f"{stats['missing']} existing projects were not in the file (left untouched).")
 
         except FileNotFoundError:
             raise CommandError(f'File "{csv_file_path}" does not exist')
+        except CommandError:
+            raise
         except Exception as e:
             raise CommandError(f"Error processing file: {e}")
@@ -0,0 +1,13 @@
+import time
+from django.core.management.base import BaseCommand
+from app.progress import refresh_project_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute Project.progress and last_update_at from the latest project updates"
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        count = refresh_project_progress()
+        elapsed = round(time.time() - start_time, 2)
+        self.stdout.write(self.style.SUCCESS(f"✅ Refreshed progress for {count} projects in {elapsed} seconds."))
@@ -0,0 +1,128 @@
+import gzip
+import json
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from app.columnar import decode, project_rows, rows_payload
+from app.filters import apply_filter_spec
+from app.models import Project
+
+
+STATUSES = [choice[0] for choice in Project.STATUS_CHOICES]
+SECTORS = ["Education", "Health", "Roads", "Water", "Agriculture", "Energy", "ICT", "Housing"]
+COUNTIES = ["Kitui", "Machakos", "Makueni", "Nairobi", "Kajiado", "Embu", "Meru", "Tharaka-Nithi"]
+
+
+def synthetic_rows(count, seed=0):
+    """Random projects spread over Kenya, for benchmarking without a database."""
+    rng = random.Random(seed)
+    return [
+        (
+            i,
+            rng.uniform(34.0, 41.9),
+            rng.uniform(-4.7, 5.0),
+            round(rng.lognormvariate(16, 1.5), 2),
+            rng.choice(STATUSES),
+            rng.choice(SECTORS),
+            rng.choice(COUNTIES),
+            f"{rng.choice(SECTORS)} project {i} in {rng.choice(COUNTIES)}",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def geojson_payload(rows):
+    """The same points as ``project_locations_geojson`` serves them."""
+    return json.dumps({
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [float(lon), float(lat)]},
+                "properties": {
+                    "id": pk,
+                    "name": name,
+                    "status": status,
+                    "county": county,
+                    "sector": sector or "",
+                    "budget": float(budget) if budget else 0,
+                },
+            }
+            for pk, lon, lat, budget, status, sector, county, name in rows
+        ],
+    }).encode("utf-8")
+
+
+def _median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = "Compare size and decode time of the GeoJSON and columnar project payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--synthetic", type=int, metavar="N",
+            help="Benchmark N generated projects instead of the database"
+        )
+        parser.add_argument("--county", action="append", help="Only projects in this county (repeatable)")
+        parser.add_argument(
+            "--repeat", type=int, default=5,
+            help="Decodes per format; the median time is reported"
+        )
+
+    def handle(self, *args, **options):
+        if options["synthetic"]:
+            rows = synthetic_rows(options["synthetic"])
+            source = f"{len(rows)} synthetic projects"
+        else:
+            spec = {"county": sorted(options["county"])} if options["county"] else {}
+            rows = project_rows(apply_filter_spec(Project.objects.all(), spec))
+            source = f"{len(rows)} mapped projects"
+        repeat = max(options["repeat"], 1)
+
+        self.stdout.write(self.style.NOTICE(f"🚀 Benchmarking project payloads for {source}"))
+
+        payloads = {
+            "geojson": geojson_payload(rows),
+            "columnar (float32)": rows_payload(rows, 32),
+            "columnar (float64)": rows_payload(rows, 64),
+        }
+
+        def decode_columnar(blob):
+            # Typed-array views plus the per-feature strings a popup needs
+            header, arrays = decode(blob)
+            offsets, names = arrays["name_offsets"], arrays["name"].tobytes()
+            statuses = header["dictionaries"]["status"]
+            for i in range(header["count"]):
+                names[offsets[i]:offsets[i + 1]].decode("utf-8")
+                statuses[arrays["status"][i]]
+
+        decoders = {
+            "geojson": lambda blob: json.loads(blob),
+            "columnar (float32)": decode_columnar,
+            "columnar (float64)": decode_columnar,
+        }
+
+        baseline = len(payloads["geojson"])
+        header = f"{'format':<20} {'bytes':>12} {'gzip':>12} {'vs geojson':>11} {'decode ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, blob in payloads.items():
+            compressed = len(gzip.compress(blob, compresslevel=6))
+            ratio = len(blob) / baseline * 100 if baseline else 0
+            elapsed = _median_ms(lambda: decoders[name](blob), repeat)
+            self.stdout.write(
+                f"{name:<20} {len(blob):>12,} {compressed:>12,} {ratio:>10.1f}% {elapsed:>10.2f}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            "✅ Decode times are Python-side; a JavaScript client can wrap the columnar "
+            "columns in typed arrays with no per-feature parsing."
+        ))
@@ -0,0 +1,124 @@
+import statistics
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from app.filters import apply_filter_spec
+from app.models import Project
+
+
+def _touch_point(project):
+    # What the views did before: parse the geography, then read x/y
+    location = project.location
+    return (location.x, location.y) if location else (project.longitude, project.latitude)
+
+
+# view -> (fields read per row, extra fields for for_map(), or None for the list card)
+VIEWS = {
+    "home": (
+        ("id", "name", "status", "county", "sector", "budget", "start_date", "end_date",
+         "description", "implementing_agency", "contractor", "project_manager"),
+        ("start_date", "end_date", "description", "implementing_agency", "contractor", "project_manager"),
+    ),
+    "dashboard": (
+        ("id", "project_id", "name", "status", "county", "sector", "budget", "start_date", "end_date",
+         "description", "implementing_agency", "contractor", "progress"),
+        ("project_id", "start_date", "end_date", "description", "implementing_agency", "contractor", "progress"),
+    ),
+    "project-map": (
+        ("id", "name", "status", "county", "sector", "budget", "start_date", "end_date", "description",
+         "implementing_agency", "project_manager", "progress", "last_update_at"),
+        ("start_date", "end_date", "description", "implementing_agency", "project_manager",
+         "progress", "last_update_at"),
+    ),
+    "project-locations": (
+        ("id", "name", "status", "county", "sector", "budget"),
+        (),
+    ),
+    "project-list": (
+        ("id", "name", "status", "county", "sector", "budget", "progress", "start_date", "end_date",
+         "implementing_agency"),
+        None,
+    ),
+}
+
+
+def full_rows(queryset, fields, with_point):
+    """The old path: whole model instances."""
+    rows = []
+    for project in queryset:
+        row = [getattr(project, f) for f in fields]
+        if with_point:
+            row.append(_touch_point(project))
+        else:
+            row.append(project.description[:300])
+        rows.append(row)
+    return rows
+
+
+def projected_rows(queryset, fields, extra):
+    """The new path: ``for_map()`` / ``for_list()``."""
+    rows = []
+    if extra is None:
+        for project in queryset.for_list():
+            rows.append([getattr(project, f) for f in fields] + [project.description_preview])
+    else:
+        for project in queryset.for_map(*extra):
+            rows.append([getattr(project, f) for f in fields] + [(project.lon, project.lat)])
+    return rows
+
+
+def measure(func, repeat):
+    """``(median ms, peak traced KiB, queries)`` of ``func`` over ``repeat`` runs."""
+    timings, peaks = [], []
+    for _ in range(repeat):
+        reset_queries()
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    return statistics.median(timings), max(peaks), len(connection.queries)
+
+
+class Command(BaseCommand):
+    help = "Compare time and memory of full Project instances against the slim projections, per view"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--county", action="append", help="Only projects in this county (repeatable)")
+        parser.add_argument("--view", action="append", choices=list(VIEWS), help="Only this view (repeatable)")
+        parser.add_argument(
+            "--repeat", type=int, default=3,
+            help="Runs per variant; the median time and largest peak are reported"
+        )
+
+    def handle(self, *args, **options):
+        spec = {"county": sorted(options["county"])} if options["county"] else {}
+        queryset = apply_filter_spec(Project.objects.all(), spec)
+        repeat = max(options["repeat"], 1)
+        views = options["view"] or list(VIEWS)
+
+        self.stdout.write(self.style.NOTICE(f"🚀 Benchmarking project queries over {queryset.count()} projects"))
+        header = f"{'view':<18} {'variant':<10} {'ms':>10} {'peak KiB':>12} {'queries':>8} {'time':>7} {'memory':>7}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        # Count queries even without DEBUG
+        connection.force_debug_cursor = True
+        try:
+            for view in views:
+                fields, extra = VIEWS[view]
+                full = measure(lambda: full_rows(queryset, fields, extra is not None), repeat)
+                slim = measure(lambda: projected_rows(queryset, fields, extra), repeat)
+                for variant, (ms, peak, queries) in (("full", full), ("slim", slim)):
+                    time_pct = ms / full[0] * 100 if full[0] else 0
+                    memory_pct = peak / full[1] * 100 if full[1] else 0
+                    self.stdout.write(
+                        f"{view:<18} {variant:<10} {ms:>10.2f} {peak:>12,.0f} {queries:>8} "
+                        f"{time_pct:>6.0f}% {memory_pct:>6.0f}%"
+                    )
+        finally:
+            connection.force_debug_cursor = False
+
+        self.stdout.write(self.style.SUCCESS("✅ Percentages are relative to the full-instance run of the same view."))
@@ -0,0 +1,94 @@
+import random
+import statistics
+import time
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F, Func, IntegerField, OuterRef, Subquery
+from app.geo import PointX, PointY, projected_ref
+from app.models import KenyaCounty, Kenyawards, Project
+
+
+def _ward_counts(lookup, ref):
+    """Projects per ward in one query, as the choropleth classes compute them."""
+    in_ward = Project.objects.filter(**{lookup: ref}).order_by().values(n=Func(F("id"), function="COUNT"))
+    return dict(
+        Kenyawards.objects.annotate(n=Subquery(in_ward, output_field=IntegerField()))
+        .values_list("id", "n")
+    )
+
+
+def _timed(func, repeat):
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+class Command(BaseCommand):
+    help = "Compare the geography/lon-lat spatial predicates with the projected *_utm columns"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sample", type=int, default=50, help="Points sampled for the point queries")
+        parser.add_argument("--radius-m", type=float, default=5000, help="Radius of the buffer queries")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the median is reported")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        repeat = max(options["repeat"], 1)
+        counties = list(KenyaCounty.objects.only("id", "geom"))
+        points = list(
+            Project.objects.filter(location__isnull=False)
+            .annotate(lon=PointX("location"), lat=PointY("location"))
+            .values_list("lon", "lat")
+        )
+        if not counties or not points:
+            raise CommandError("Needs loaded counties and mapped projects")
+        rng = random.Random(options["seed"])
+        sample = [Point(lon, lat, srid=4326) for lon, lat in rng.sample(points, min(options["sample"], len(points)))]
+        radius = D(m=options["radius_m"])
+
+        cases = {
+            f"{len(counties)} county counts": (
+                lambda: [Project.objects.filter(location__within=c.geom).count() for c in counties],
+                lambda: [Project.objects.within(c).count() for c in counties],
+            ),
+            "per-ward counts (1 query)": (
+                lambda: _ward_counts("location__within", OuterRef("geom")),
+                lambda: _ward_counts("location_utm__within", projected_ref("geom_utm")),
+            ),
+            f"{len(sample)} point-in-ward": (
+                lambda: [Kenyawards.objects.filter(geom__contains=p).values_list("id", flat=True).first()
+                         for p in sample],
+                lambda: [Kenyawards.objects.filter(geom_utm__contains=p).values_list("id", flat=True).first()
+                         for p in sample],
+            ),
+            f"{len(sample)} radius {radius.m:g} m": (
+                lambda: [Project.objects.filter(location__dwithin=(p, radius)).count() for p in sample],
+                lambda: [Project.objects.filter(location_utm__dwithin=(p, radius)).count() for p in sample],
+            ),
+        }
+
+        self.stdout.write(self.style.NOTICE(
+            f"🚀 {len(points)} mapped projects, {len(counties)} counties, median of {repeat} runs"
+        ))
+        header = f"{'query':<28} {'geography ms':>13} {'utm ms':>10} {'speed-up':>9} {'same result':>12}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, (old, new) in cases.items():
+            old_ms, old_result = _timed(old, repeat)
+            new_ms, new_result = _timed(new, repeat)
+            if isinstance(old_result, dict):
+                differing = sum(1 for k in old_result if old_result[k] != new_result.get(k))
+            else:
+                differing = sum(1 for a, b in zip(old_result, new_result) if a != b)
+            speedup = old_ms / new_ms if new_ms else 0
+            agreement = "yes" if not differing else f"{differing} differ"
+            self.stdout.write(f"{name:<28} {old_ms:>13.1f} {new_ms:>10.1f} {speedup:>8.1f}x {agreement:>12}")
+
+        self.stdout.write(self.style.SUCCESS(
+            "✅ Differences are points within a few metres of a boundary or the radius, "
+            "where planar UTM and the spheroid disagree."
+        ))
@@ -0,0 +1,70 @@
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from app.boundary_assets import (
+    ASSET_DIR, FORMATS, LEVELS, brotli, compressed_versions, hashed_name,
+    manifest, render_level, write_manifest,
+)
+
+
+class Command(BaseCommand):
+    help = "Write hashed, precompressed GeoJSON/TopoJSON boundary files into STATIC_ROOT"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--level", action="append", choices=list(LEVELS),
+            help="Only rebuild this admin level (repeatable)"
+        )
+        parser.add_argument(
+            "--prune", action="store_true",
+            help="Delete boundary files no longer referenced by the manifest"
+        )
+
+    def handle(self, *args, **options):
+        if not settings.STATIC_ROOT:
+            raise CommandError("STATIC_ROOT is not set")
+        asset_dir = os.path.join(settings.STATIC_ROOT, ASSET_DIR)
+        os.makedirs(asset_dir, exist_ok=True)
+        if brotli is None:
+            self.stdout.write(self.style.WARNING("⚠️ brotli is not installed; writing gzip only"))
+
+        paths = dict(manifest())
+        for level in options["level"] or list(LEVELS):
+            start_time = time.time()
+            rendered = render_level(level)
+            for fmt in FORMATS:
+                content = rendered[fmt]
+                name = f"{ASSET_DIR}/{level}.{fmt}"
+                hashed = hashed_name(name, content)
+                self._write(hashed, content)
+                sizes = {"raw": len(content)}
+                for suffix, data in compressed_versions(content).items():
+                    self._write(hashed + suffix, data)
+                    sizes[suffix.lstrip(".")] = len(data)
+                paths[name] = hashed
+                summary = ", ".join(f"{k} {v / 1024:,.0f} KB" for k, v in sizes.items())
+                self.stdout.write(f"  {hashed}: {summary}")
+            elapsed = round(time.time() - start_time, 2)
+            self.stdout.write(self.style.SUCCESS(f"✅ {level} built in {elapsed} seconds."))
+
+        write_manifest(settings.STATIC_ROOT, paths)
+
+        if options["prune"]:
+            keep = {os.path.basename(n) for n in paths.values()}
+            keep |= {k + s for k in keep for s in (".gz", ".br")}
+            keep.add("manifest.json")
+            for filename in os.listdir(asset_dir):
+                if filename not in keep:
+                    os.remove(os.path.join(asset_dir, filename))
+                    self.stdout.write(f"  Removed {filename}")
+
+        self.stdout.write(self.style.SUCCESS(f"📂 Manifest written to {os.path.join(asset_dir, 'manifest.json')}"))
+
+    def _write(self, name, content):
+        path = os.path.join(settings.STATIC_ROOT, name)
+        # Content-hashed names never change contents, so existing files are kept
+        if not os.path.exists(path):
+            with open(path + ".tmp", "wb") as f:
+                f.write(content)
+            os.replace(path + ".tmp", path)
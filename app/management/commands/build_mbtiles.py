@@ -0,0 +1,132 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.gis.db.models import Extent
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+from app.models import KenyaCounty
+from app.tiles import (
+    EMPTY_DIGEST, MBTiles, project_tile_digests, render_tile, tiles_for_bounds, vector_layers,
+)
+
+
+class Command(BaseCommand):
+    help = "Pre-render boundary and project vector tiles over a county and zoom range into an MBTiles file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="MBTiles file to create or update")
+        parser.add_argument(
+            "--county", action="append",
+            help="Only tiles over this county (repeatable; default all of Kenya)"
+        )
+        parser.add_argument("--min-zoom", type=int, default=6, help="Lowest zoom level (default 6)")
+        parser.add_argument("--max-zoom", type=int, default=14, help="Highest zoom level (default 14)")
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 4,
+            help="Tiles rendered in parallel, each on its own database connection (default: CPU count)"
+        )
+        parser.add_argument(
+            "--full", action="store_true",
+            help="Re-render every tile instead of only those whose projects changed"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Vector tiles are rendered by PostGIS (ST_AsMVT); SpatiaLite has no equivalent")
+        min_zoom, max_zoom = options["min_zoom"], options["max_zoom"]
+        if not 0 <= min_zoom <= max_zoom <= 20:
+            raise CommandError("Zoom levels must satisfy 0 <= --min-zoom <= --max-zoom <= 20")
+
+        counties = KenyaCounty.objects.all()
+        if options["county"]:
+            counties = counties.filter(county__in=options["county"])
+            missing = set(options["county"]) - set(counties.values_list("county", flat=True))
+            if missing:
+                raise CommandError(f"Unknown county: {', '.join(sorted(missing))}")
+        bounds = counties.aggregate(extent=Extent("geom"))["extent"]
+        if bounds is None:
+            raise CommandError("No county boundaries loaded; run load_county first")
+
+        start_time = time.time()
+        mbtiles = MBTiles(options["output"])
+        try:
+            planned = set(tiles_for_bounds(bounds, min_zoom, max_zoom))
+            digests = project_tile_digests(min_zoom, max_zoom)
+            stored = mbtiles.digests()
+            existing = {} if options["full"] else stored
+            stale = [tile for tile in stored if tile not in planned]
+            todo = sorted(
+                tile for tile in planned
+                if existing.get(tile) != digests.get(tile, EMPTY_DIGEST)
+            )
+            self.stdout.write(self.style.NOTICE(
+                f"🚀 {len(todo)} of {len(planned)} tiles to render at zoom {min_zoom}-{max_zoom} "
+                f"with {options['workers']} workers..."
+            ))
+
+            mbtiles.delete(stale)
+            written = self._render(mbtiles, todo, digests, max(options["workers"], 1))
+            center = ((bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2)
+            mbtiles.set_metadata({
+                "name": "Kenya projects" if not options["county"] else ", ".join(sorted(options["county"])),
+                "format": "pbf",
+                "type": "overlay",
+                "version": "1",
+                "description": "Admin boundaries and project points for offline field use",
+                "minzoom": str(min_zoom),
+                "maxzoom": str(max_zoom),
+                "bounds": ",".join(f"{v:.6f}" for v in bounds),
+                "center": f"{center[0]:.6f},{center[1]:.6f},{min(max_zoom, max(min_zoom, 10))}",
+                "json": vector_layers(min_zoom, max_zoom),
+                "generated_at": timezone.now().isoformat(),
+            })
+        finally:
+            mbtiles.close()
+
+        elapsed = round(time.time() - start_time, 2)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rendered {len(todo)} tiles ({written} with features), removed {len(stale)}, "
+            f"in {elapsed} seconds: {options['output']}"
+        ))
+
+    def _render(self, mbtiles, todo, digests, workers):
+        """Render ``todo`` on ``workers`` threads; only this thread writes SQLite."""
+        pending = iter(todo)
+        lock = threading.Lock()
+        results = queue.Queue(maxsize=workers * 16)
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        tile = next(pending, None)
+                    if tile is None:
+                        return
+                    results.put((tile, render_tile(*tile)))
+            finally:
+                connections.close_all()
+                results.put(None)
+
+        written = done = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker) for _ in range(workers)]
+            finished = 0
+            while finished < workers:
+                item = results.get()
+                if item is None:
+                    finished += 1
+                    continue
+                tile, data = item
+                mbtiles.write(*tile, data, digests.get(tile, EMPTY_DIGEST))
+                written += bool(data)
+                done += 1
+                if done % 1000 == 0:
+                    mbtiles.commit()
+                    self.stdout.write(f"  {done}/{len(todo)} tiles")
+            for future in futures:
+                future.result()
+        mbtiles.commit()
+        return written
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from app.caching import bump_data_version
+from app.coverage import compute_ward_coverage, schedule_ward_coverage
+
+
+class Command(BaseCommand):
+    help = "Precompute the distance from every ward to the nearest project per sector and status"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--enqueue", action="store_true",
+            help="Queue a rebuild for the run_jobs worker instead of running it now"
+        )
+
+    def handle(self, *args, **options):
+        if options["enqueue"]:
+            schedule_ward_coverage()
+            self.stdout.write(self.style.SUCCESS("✅ Ward coverage rebuild queued."))
+            return
+
+        self.stdout.write(self.style.NOTICE("🚀 Computing ward coverage..."))
+        start_time = time.time()
+        count = compute_ward_coverage()
+        bump_data_version()
+        elapsed = round(time.time() - start_time, 2)
+        self.stdout.write(self.style.SUCCESS(f"✅ Stored {count} ward/sector/status distances in {elapsed} seconds."))
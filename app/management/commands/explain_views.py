@@ -0,0 +1,202 @@
+import json
+import re
+import statistics
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from app.filters import apply_filter_spec
+from app.lookups import filter_lookup, search_lookup
+from app.models import Project
+
+
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    # SQLite prints "SCAN t" for a full scan, "SCAN t USING INDEX i" otherwise
+    "sqlite": re.compile(r"\bSCAN (\w+)(?! USING)"),
+}
+
+
+def _most_common(field):
+    row = (
+        Project.objects.exclude(**{field: ""})
+        .values(field).annotate(n=Count("id")).order_by("-n").first()
+    )
+    return row[field] if row else ""
+
+
+def canonical_queries():
+    """
+    The Project querysets issued by each view with representative filter
+    values taken from the data. They are built with the views' own helpers
+    (filter specs, lookup-key filters, ``for_stats``/``for_list``/``for_map``)
+    so the plans are those of the real requests. Each entry is (view, label,
+    columns used for filtering/ordering, queryset).
+    """
+    county = _most_common("county")
+    sector = _most_common("sector")
+    today = timezone.now().date()
+    projects = Project.objects.all()
+    home = apply_filter_spec(projects, {"status": ["ongoing"], "county": [county]})
+    dashboard = apply_filter_spec(projects, {"status": ["ongoing", "delayed"]})
+
+    return [
+        ("home", "status + county filter, top budgets",
+         ["status", "county_ref", "budget"],
+         home.order_by("-budget")[:10]),
+        ("home", "overdue ongoing projects",
+         ["status", "end_date"],
+         projects.filter(status="ongoing", end_date__lt=today).values("id")),
+        ("home", "deadlines in next 30 days",
+         ["status", "end_date"],
+         projects.filter(status="ongoing", end_date__gte=today, end_date__lte=today + timedelta(days=30)).values("id")),
+        ("home", "sector statistics",
+         ["sector", "status"],
+         projects.values("sector").annotate(count=Count("id"), total_budget=Sum("budget"),
+                                            completed=Count("id", filter=Q(status="completed")))),
+        ("home", "start year filter",
+         ["start_date"],
+         apply_filter_spec(projects, {"year": today.year}).values("id", "budget")),
+        ("dashboard", "budget + date range filter",
+         ["budget", "start_date", "end_date"],
+         apply_filter_spec(projects, {
+             "min_budget": "1000000", "max_budget": "500000000",
+             "start_date": today - timedelta(days=3 * 365), "end_date": today + timedelta(days=3 * 365),
+         })),
+        ("dashboard", "budget by sector",
+         ["status", "sector_ref"],
+         dashboard.for_stats("sector_ref").annotate(total_budget=Sum("budget")).order_by("-total_budget")[:10]),
+        ("dashboard", "projects by county",
+         ["status", "county_ref"],
+         dashboard.for_stats("county_ref").annotate(count=Count("id")).order_by("-count")[:10]),
+        ("dashboard", "county completion rates",
+         ["county_ref", "status"],
+         projects.for_stats("county_ref").annotate(total=Count("id"), completed=Count("id", filter=Q(status="completed")))),
+        ("dashboard", "monthly timeline",
+         ["start_date"],
+         projects.annotate(month=TruncMonth("start_date")).values("month").annotate(count=Count("id")).order_by("month")),
+        ("project_list", "default page",
+         ["created_at"],
+         projects.for_list().order_by("-created_at", "-id")[:12]),
+        ("project_list", "status filter page",
+         ["status", "created_at"],
+         projects.for_list().filter(status="completed").order_by("-created_at", "-id")[:12]),
+        ("project_list", "sector filter stats",
+         ["sector_ref", "budget"],
+         search_lookup(projects, "sector", sector).values("county").annotate(count=Count("id"), avg=Avg("budget"))),
+        ("project_map", "mapped projects by status + county",
+         ["location", "status", "county_ref"],
+         filter_lookup(projects.filter(location__isnull=False, status__in=["ongoing", "delayed"]), "county", [county])
+         .values("id", "status")),
+        ("project_locations_geojson", "county + sector filter",
+         ["county_ref", "sector_ref"],
+         apply_filter_spec(Project.objects.for_map(), {"county": [county], "sector": [sector]})),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Replay each view's Project queries, capture EXPLAIN plans and flag sequential scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat", type=int, default=5,
+            help="Executions per query; the median time is reported"
+        )
+        parser.add_argument(
+            "--output", help="Write results as JSON (use as a --compare baseline later)"
+        )
+        parser.add_argument(
+            "--compare", help="JSON file from an earlier --output run to show before/after timings"
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Print the full plan for every query"
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        analyze = vendor == "postgresql"
+        seq_scan = SEQ_SCAN_PATTERNS.get(vendor)
+        indexed = self._indexed_columns()
+
+        baseline = {}
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as f:
+                    baseline = {(r["view"], r["label"]): r for r in json.load(f)["results"]}
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Could not read baseline {options['compare']}: {e}")
+
+        self.stdout.write(self.style.NOTICE(
+            f"🚀 Replaying view queries on {vendor} ({Project.objects.count()} projects, "
+            f"{'EXPLAIN ANALYZE' if analyze else 'EXPLAIN'})"
+        ))
+
+        results = []
+        for view, label, columns, queryset in canonical_queries():
+            plan = queryset.explain(analyze=True) if analyze else queryset.explain()
+            timings = []
+            for _ in range(max(options["repeat"], 1)):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+
+            scanned = sorted(set(seq_scan.findall(plan))) if seq_scan else []
+            missing = [c for c in columns if c not in indexed]
+            results.append({
+                "view": view,
+                "label": label,
+                "median_ms": round(statistics.median(timings), 3),
+                "seq_scans": scanned,
+                "unindexed_columns": missing if scanned else [],
+                "plan": plan,
+            })
+
+        self._print_table(results, baseline)
+        if options["plans"]:
+            for r in results:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{r['view']}: {r['label']}"))
+                self.stdout.write(r["plan"])
+
+        suggestions = sorted({c for r in results for c in r["unindexed_columns"]})
+        if suggestions:
+            self.stdout.write(self.style.WARNING(
+                "⚠️ Sequential scans touch unindexed columns: " + ", ".join(suggestions)
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ No sequential scans on unindexed filter columns"))
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump({"vendor": vendor, "results": results}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"📂 Results written to {options['output']}"))
+
+    def _indexed_columns(self):
+        """Columns that lead at least one index on the project table."""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Project._meta.db_table)
+        columns = {c["columns"][0] for c in constraints.values() if c["index"] and c["columns"]}
+        return {f.name for f in Project._meta.concrete_fields if f.column in columns}
+
+    def _print_table(self, results, baseline):
+        header = f"{'view':<27} {'query':<38} {'ms':>9}"
+        if baseline:
+            header += f" {'before':>9} {'change':>8}"
+        header += "  seq scan"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for r in results:
+            line = f"{r['view']:<27} {r['label'][:38]:<38} {r['median_ms']:>9.2f}"
+            if baseline:
+                before = baseline.get((r["view"], r["label"]))
+                if before:
+                    change = (r["median_ms"] - before["median_ms"]) / before["median_ms"] * 100 if before["median_ms"] else 0
+                    line += f" {before['median_ms']:>9.2f} {change:>+7.0f}%"
+                else:
+                    line += f" {'-':>9} {'-':>8}"
+            line += "  " + (", ".join(r["seq_scans"]) or "-")
+            style = self.style.WARNING if r["unindexed_columns"] else (lambda s: s)
+            self.stdout.write(style(line))
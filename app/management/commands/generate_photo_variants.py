@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from app.images import generate_variants
+from app.jobs import enqueue
+from app.models import ProjectUpdate, CitizenReport
+
+
+class Command(BaseCommand):
+    help = "Generate resized photo variants for existing updates and citizen reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sync", action="store_true",
+            help="Resize in this process instead of queueing jobs for run_jobs"
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Regenerate even when variants are already up to date"
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in (ProjectUpdate, CitizenReport):
+            for instance in model.objects.exclude(photo="").only("pk", "photo", "photo_variants"):
+                current = (instance.photo_variants or {}).get("source") == instance.photo.name
+                if current and not options["force"]:
+                    continue
+
+                if options["sync"]:
+                    try:
+                        variants = generate_variants(instance.photo)
+                    except Exception as e:
+                        self.stderr.write(self.style.ERROR(f"⚠️ {model.__name__} {instance.pk}: {e}"))
+                        continue
+                    model.objects.filter(pk=instance.pk).update(photo_variants=variants)
+                else:
+                    if options["force"]:
+                        model.objects.filter(pk=instance.pk).update(photo_variants={})
+                    enqueue("photo_variants", {"model": model.__name__, "pk": instance.pk})
+                total += 1
+
+        action = "Generated" if options["sync"] else "Queued"
+        self.stdout.write(self.style.SUCCESS(f"✅ {action} variants for {total} photos"))
@@ -3,6 +3,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.gis.utils import LayerMapping
 from django.contrib.gis.gdal import DataSource
+from app.caching import bump_data_version
 from app.models import KenyaCounty
 
 
@@ -42,6 +43,8 @@ class Command(BaseCommand):
                 KenyaCounty, file, kenyacounty_mapping, layer=kenya_counties_layer
             )
             kenya_counties_layermapping.save(strict=True, verbose=True)
+            # Boundary GeoJSON and dropdown caches are keyed by the data version
+            bump_data_version()
             self.stdout.write(self.style.SUCCESS("✅ Counties loaded successfully!"))
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"⚠️ Import failed: {e}"))
@@ -3,6 +3,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.gis.utils import LayerMapping
 from django.contrib.gis.gdal import DataSource
+from app.caching import bump_data_version
 from app.models import KenyaSubCounty
 
 
@@ -42,6 +43,8 @@ class Command(BaseCommand):
                 KenyaSubCounty, file, kenyasubcounty_mapping, layer=kenya_layer
             )
             kenya_subcounty_mapping.save(strict=True, verbose=True)
+            # Boundary GeoJSON and dropdown caches are keyed by the data version
+            bump_data_version()
             self.stdout.write(self.style.SUCCESS("✅ SubCounties loaded successfully!"))
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"⚠️ Import failed: {e}"))
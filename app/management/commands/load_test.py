@@ -0,0 +1,259 @@
+import json
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+from wsgiref.util import setup_testing_defaults
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+
+from app.filters import filter_options
+
+
+def _one_filter(options, rng):
+    """No filter, or one year/sector/county filter as the pages' dropdowns send."""
+    choices = [{}]
+    if options["fiscal_years"]:
+        choices.append({"year": rng.choice(options["fiscal_years"])})
+    if options["sectors"]:
+        choices.append({"sector": rng.choice(options["sectors"])})
+    if options["project_counties"]:
+        choices.append({"county": rng.choice(options["project_counties"])})
+    return rng.choice(choices)
+
+
+# name -> (default weight, url name, params(filter options, rng))
+SCENARIOS = {
+    "home": (20, "home", _one_filter),
+    "dashboard": (10, "dashboard", _one_filter),
+    "project-list": (15, "project_list", lambda o, rng: {**_one_filter(o, rng), "page": rng.choice([1, 1, 2, 3])}),
+    "project-map": (10, "project_map", _one_filter),
+    "counties-geojson": (5, "counties_geojson", lambda o, rng: {}),
+    "county-stats": (10, "counties_geojson", lambda o, rng: {"geometry": "0"}),
+    "subcounties-geojson": (3, "subcounties_geojson", lambda o, rng: {}),
+    "wards-geojson": (3, "wards_geojson", lambda o, rng: (
+        {"county": rng.choice(o["counties"])} if o["counties"] else {}
+    )),
+    "project-locations": (10, "project_locations_geojson", _one_filter),
+    "project-locations-columnar": (5, "project_locations_geojson", lambda o, rng: {
+        **_one_filter(o, rng), "format": "columnar",
+    }),
+    "spatial-statistics": (2, "spatial_statistics", lambda o, rng: {}),
+    "hotspots": (2, "spending_hotspots", lambda o, rng: {"method": rng.choice(["kde", "gistar"])}),
+    "budget-distribution": (2, "budget_distribution", lambda o, rng: {
+        "group_by": rng.choice(["sector", "county"]),
+    }),
+    "classes": (3, "choropleth_classes", lambda o, rng: {"level": "counties", "classes": "4"}),
+}
+
+
+def _percentiles(latencies):
+    if not latencies:
+        return {}
+    values = np.percentile(np.asarray(latencies), [50, 95, 99])
+    return {
+        "p50_ms": round(float(values[0]), 2),
+        "p95_ms": round(float(values[1]), 2),
+        "p99_ms": round(float(values[2]), 2),
+        "mean_ms": round(float(np.mean(latencies)), 2),
+        "max_ms": round(float(np.max(latencies)), 2),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Drive the WSGI app (in-process or a running server) with a weighted mix of requests and report latency as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            help="Load a running server (e.g. http://127.0.0.1:8000) instead of the in-process WSGI app"
+        )
+        parser.add_argument("--concurrency", type=int, default=4, help="Simultaneous clients")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to run (default 30)")
+        parser.add_argument("--requests", type=int, help="Stop after this many requests instead")
+        parser.add_argument(
+            "--mix", action="append", default=[], metavar="NAME=WEIGHT",
+            help=f"Override a scenario weight, 0 disables it (repeatable). Scenarios: {', '.join(SCENARIOS)}"
+        )
+        parser.add_argument("--only", action="append", choices=list(SCENARIOS), help="Run only this scenario (repeatable)")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the request mix")
+        parser.add_argument("--no-warmup", action="store_true", help="Skip the untimed request per scenario")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        weights = self._weights(options)
+        concurrency = max(options["concurrency"], 1)
+        self.fetch = self._http_fetcher(options["base_url"]) if options["base_url"] else self._wsgi_fetcher()
+        self.filter_choices = filter_options()
+        names, scenario_weights = zip(*weights.items())
+
+        if not options["no_warmup"]:
+            self.stderr.write(self.style.NOTICE(f"🔥 Warming up {len(names)} scenarios..."))
+            rng = random.Random(options["seed"])
+            for name in names:
+                self._request(name, rng)
+
+        target = options["base_url"] or "in-process WSGI"
+        limit = options["requests"]
+        deadline = None if limit else time.perf_counter() + options["duration"]
+        issued = [0]
+        lock = threading.Lock()
+
+        def take():
+            if deadline is not None:
+                return time.perf_counter() < deadline
+            with lock:
+                if issued[0] >= limit:
+                    return False
+                issued[0] += 1
+                return True
+
+        def worker(index):
+            rng = random.Random(options["seed"] * 1000 + index + 1)
+            samples = []
+            try:
+                while take():
+                    name = rng.choices(names, scenario_weights)[0]
+                    samples.append((name, *self._request(name, rng)))
+            finally:
+                connections.close_all()
+            return samples
+
+        scope = f"{limit} requests" if limit else f"{options['duration']}s"
+        self.stderr.write(self.style.NOTICE(
+            f"🚀 Load testing {target} with {concurrency} clients ({scope})..."
+        ))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = [s for result in pool.map(worker, range(concurrency)) for s in result]
+        elapsed = time.perf_counter() - started
+
+        report = self._report(samples, elapsed, target, concurrency, weights)
+        body = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(body + "\n")
+            self.stderr.write(self.style.SUCCESS(f"✅ Report written to {options['output']}"))
+        else:
+            self.stdout.write(body)
+
+        total = report["total"]
+        self.stderr.write(self.style.SUCCESS(
+            f"✅ {total['requests']} requests in {report['elapsed_s']}s: "
+            f"{total['throughput_rps']} req/s, p95 {total.get('p95_ms', 0)} ms, "
+            f"{total['error_rate'] * 100:.1f}% errors"
+        ))
+
+    def _weights(self, options):
+        weights = {name: scenario[0] for name, scenario in SCENARIOS.items()}
+        if options["only"]:
+            weights = {name: weights[name] for name in options["only"]}
+        for item in options["mix"]:
+            name, _, value = item.partition("=")
+            if name not in SCENARIOS:
+                raise CommandError(f"Unknown scenario '{name}'. Choose from: {', '.join(SCENARIOS)}")
+            try:
+                weights[name] = float(value)
+            except ValueError:
+                raise CommandError(f"--mix {item}: weight must be a number")
+        weights = {name: weight for name, weight in weights.items() if weight > 0}
+        if not weights:
+            raise CommandError("Every scenario has weight 0")
+        return weights
+
+    def _request(self, name, rng):
+        """One request for scenario ``name``: ``(latency ms, status, bytes)``."""
+        _, url_name, params = SCENARIOS[name]
+        path = reverse(url_name)
+        query = urlencode(params(self.filter_choices, rng))
+        start = time.perf_counter()
+        try:
+            status, size = self.fetch(path, query)
+        except Exception:
+            status, size = 0, 0
+        return (time.perf_counter() - start) * 1000, status, size
+
+    def _wsgi_fetcher(self):
+        application = get_wsgi_application()
+
+        def fetch(path, query):
+            environ = {"PATH_INFO": path, "QUERY_STRING": query, "HTTP_HOST": "localhost"}
+            setup_testing_defaults(environ)
+            environ["wsgi.input"] = BytesIO()
+            response = {}
+
+            def start_response(status, headers, exc_info=None):
+                response["status"] = int(status.split(" ", 1)[0])
+
+            chunks = application(environ, start_response)
+            try:
+                size = sum(len(chunk) for chunk in chunks)
+            finally:
+                if hasattr(chunks, "close"):
+                    chunks.close()
+            return response["status"], size
+
+        return fetch
+
+    def _http_fetcher(self, base_url):
+        base_url = base_url.rstrip("/")
+
+        def fetch(path, query):
+            url = f"{base_url}{path}?{query}" if query else f"{base_url}{path}"
+            try:
+                with urlopen(url, timeout=60) as response:
+                    return response.status, len(response.read())
+            except HTTPError as e:
+                return e.code, len(e.read())
+            except URLError as e:
+                raise CommandError(f"{url}: {e.reason}")
+
+        return fetch
+
+    def _report(self, samples, elapsed, target, concurrency, weights):
+        by_scenario = defaultdict(list)
+        for sample in samples:
+            by_scenario[sample[0]].append(sample[1:])
+
+        def summary(rows):
+            latencies = [latency for latency, _, _ in rows]
+            errors = sum(1 for _, status, _ in rows if not 200 <= status < 400)
+            return {
+                "requests": len(rows),
+                "errors": errors,
+                "error_rate": round(errors / len(rows), 4) if rows else 0,
+                "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else 0,
+                **_percentiles(latencies),
+                "mean_bytes": int(sum(size for _, _, size in rows) / len(rows)) if rows else 0,
+            }
+
+        return {
+            "timestamp": timezone.now().isoformat(),
+            "git_revision": _git_revision(),
+            "target": target,
+            "concurrency": concurrency,
+            "elapsed_s": round(elapsed, 2),
+            "mix": weights,
+            "total": summary([sample[1:] for sample in samples]),
+            "endpoints": {name: summary(by_scenario[name]) for name in weights if by_scenario[name]},
+        }
@@ -0,0 +1,236 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from wsgiref.util import setup_testing_defaults
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from app.images import delete_variants
+from app.jobs import run_pending
+from app.models import BackgroundJob, CitizenReport, Project
+from app.management.commands.load_test import _git_revision, _percentiles
+
+
+def _sample_photo(width=1600, height=1200):
+    """A camera-sized JPEG, as phones upload them."""
+    image = Image.effect_noise((width, height), 64).convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class _Photo(BytesIO):
+    name = "load-test.jpg"
+
+
+class Command(BaseCommand):
+    help = "Flood the citizen report intake endpoint and report sustained submissions per second as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            help="Load a running server (e.g. http://127.0.0.1:8000) instead of the in-process WSGI app; "
+                 "it needs TRUSTED_PROXY_COUNT=1 to tell the simulated clients apart"
+        )
+        parser.add_argument("--concurrency", type=int, default=8, help="Simultaneous connections")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to run (default 30)")
+        parser.add_argument("--requests", type=int, help="Stop after this many submissions instead")
+        parser.add_argument(
+            "--clients", type=int, default=1000,
+            help="Distinct simulated phones; fewer clients than the rate allows shows up as 429s"
+        )
+        parser.add_argument("--photo-ratio", type=float, default=0.5, help="Share of reports with a photo")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--drain", action="store_true",
+            help="Afterwards run the queued intake jobs here and report their throughput"
+        )
+        parser.add_argument("--keep", action="store_true", help="Keep the created reports instead of deleting them")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        project_ids = list(Project.objects.order_by().values_list("id", flat=True)[:5000])
+        if not project_ids:
+            raise CommandError("No projects to report on")
+        report_types = [value for value, _ in CitizenReport.REPORT_CHOICES]
+        photo = _sample_photo()
+        self.send = self._http_sender(options["base_url"]) if options["base_url"] else self._wsgi_sender()
+
+        target = options["base_url"] or "in-process WSGI"
+        concurrency = max(options["concurrency"], 1)
+        limit = options["requests"]
+        deadline = None if limit else time.perf_counter() + options["duration"]
+        issued = [0]
+        lock = threading.Lock()
+
+        def take():
+            if deadline is not None:
+                return time.perf_counter() < deadline
+            with lock:
+                if issued[0] >= limit:
+                    return False
+                issued[0] += 1
+                return True
+
+        def worker(index):
+            rng = random.Random(options["seed"] * 1000 + index + 1)
+            samples = []
+            try:
+                while take():
+                    project_id = rng.choice(project_ids)
+                    fields = {
+                        "report_type": rng.choice(report_types),
+                        "description": f"Load test report {rng.getrandbits(48):012x}",
+                    }
+                    if rng.random() < options["photo_ratio"]:
+                        fields["photo"] = _Photo(photo)
+                    client = rng.randrange(max(options["clients"], 1))
+                    address = f"10.{client >> 16 & 255}.{client >> 8 & 255}.{client & 255}"
+                    path = reverse("report_intake", args=[project_id])
+                    start = time.perf_counter()
+                    try:
+                        status, body = self.send(path, encode_multipart(BOUNDARY, fields), address)
+                    except CommandError:
+                        raise
+                    except Exception:
+                        status, body = 0, b""
+                    latency = (time.perf_counter() - start) * 1000
+                    report_id = json.loads(body).get("id") if status == 202 else None
+                    samples.append((latency, status, report_id))
+            finally:
+                connections.close_all()
+            return samples
+
+        scope = f"{limit} submissions" if limit else f"{options['duration']}s"
+        self.stderr.write(self.style.NOTICE(
+            f"🚀 Submitting reports to {target} from {options['clients']} clients "
+            f"over {concurrency} connections ({scope})..."
+        ))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = [s for result in pool.map(worker, range(concurrency)) for s in result]
+        elapsed = time.perf_counter() - started
+        report_ids = [report_id for _, _, report_id in samples if report_id]
+
+        accepted = [latency for latency, status, _ in samples if status == 202]
+        throttled = sum(1 for _, status, _ in samples if status == 429)
+        errors = len(samples) - len(accepted) - throttled
+        report = {
+            "timestamp": timezone.now().isoformat(),
+            "git_revision": _git_revision(),
+            "target": target,
+            "concurrency": concurrency,
+            "clients": options["clients"],
+            "photo_ratio": options["photo_ratio"],
+            "elapsed_s": round(elapsed, 2),
+            "submissions": len(samples),
+            "accepted": len(accepted),
+            "throttled": throttled,
+            "errors": errors,
+            "accepted_per_s": round(len(accepted) / elapsed, 2) if elapsed else 0,
+            "accepted_latency": _percentiles(accepted),
+            "all_latency": _percentiles([latency for latency, _, _ in samples]),
+        }
+        if options["drain"]:
+            report["drain"] = self._drain()
+        if not options["keep"]:
+            self._cleanup(report_ids)
+
+        body = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(body + "\n")
+            self.stderr.write(self.style.SUCCESS(f"✅ Report written to {options['output']}"))
+        else:
+            self.stdout.write(body)
+        self.stderr.write(self.style.SUCCESS(
+            f"✅ {report['accepted']} reports accepted in {report['elapsed_s']}s: "
+            f"{report['accepted_per_s']} reports/s, p95 {report['accepted_latency'].get('p95_ms', 0)} ms, "
+            f"{throttled} throttled, {errors} errors"
+        ))
+
+    def _drain(self):
+        """Run the queued intake jobs in this process; ``{jobs, elapsed_s, jobs_per_s}``."""
+        processed = 0
+        started = time.perf_counter()
+        while True:
+            batch = run_pending(limit=200, kinds=["citizen_report_intake"])
+            if not batch:
+                break
+            processed += batch
+        elapsed = time.perf_counter() - started
+        return {
+            "jobs": processed,
+            "elapsed_s": round(elapsed, 2),
+            "jobs_per_s": round(processed / elapsed, 2) if elapsed else 0,
+        }
+
+    def _cleanup(self, report_ids):
+        """Delete the reports this run created, with their photos, variants and jobs."""
+        for i in range(0, len(report_ids), 500):
+            chunk = report_ids[i:i + 500]
+            for report in CitizenReport.objects.filter(pk__in=chunk).exclude(photo=""):
+                delete_variants(report.photo_variants or {}, report.photo.storage)
+                report.photo.delete(save=False)
+            CitizenReport.objects.filter(pk__in=chunk).delete()
+            BackgroundJob.objects.filter(kind="citizen_report_intake", payload__pk__in=chunk).delete()
+        self.stderr.write(self.style.NOTICE(f"🧹 Removed {len(report_ids)} load test reports"))
+
+    def _wsgi_sender(self):
+        application = get_wsgi_application()
+
+        def send(path, body, address):
+            environ = {
+                "PATH_INFO": path,
+                "REQUEST_METHOD": "POST",
+                "HTTP_HOST": "localhost",
+                "REMOTE_ADDR": address,
+                "CONTENT_TYPE": MULTIPART_CONTENT,
+                "CONTENT_LENGTH": str(len(body)),
+            }
+            setup_testing_defaults(environ)
+            environ["wsgi.input"] = BytesIO(body)
+            response = {}
+
+            def start_response(status, headers, exc_info=None):
+                response["status"] = int(status.split(" ", 1)[0])
+
+            chunks = application(environ, start_response)
+            try:
+                content = b"".join(chunks)
+            finally:
+                if hasattr(chunks, "close"):
+                    chunks.close()
+            return response["status"], content
+
+        return send
+
+    def _http_sender(self, base_url):
+        base_url = base_url.rstrip("/")
+
+        def send(path, body, address):
+            url = f"{base_url}{path}"
+            request = Request(url, data=body, method="POST", headers={
+                "Content-Type": MULTIPART_CONTENT,
+                "X-Forwarded-For": address,
+            })
+            try:
+                with urlopen(request, timeout=60) as response:
+                    return response.status, response.read()
+            except HTTPError as e:
+                return e.code, e.read()
+            except URLError as e:
+                raise CommandError(f"{url}: {e.reason}")
+
+        return send
@@ -3,6 +3,8 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.gis.utils import LayerMapping
 from django.contrib.gis.gdal import DataSource
+from app.caching import bump_data_version
+from app.coverage import schedule_ward_coverage
 from app.models import Kenyawards
 
 
@@ -41,6 +43,10 @@ class Command(BaseCommand):
                 Kenyawards, file, wards_mapping, layer=wards_layer
             )
             lm.save(strict=True, verbose=True)
+            # Boundary GeoJSON and dropdown caches are keyed by the data version
+            bump_data_version()
+            # Coverage rows belong to wards; recompute them for the loaded set
+            schedule_ward_coverage()
             self.stdout.write(self.style.SUCCESS("✅ Wards loaded successfully!"))
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"⚠️ Import failed: {e}"))
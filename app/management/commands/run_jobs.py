@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand
+from app.jobs import run_pending, requeue_stale
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (photo variants, imports, ...)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain the currently due jobs and exit instead of polling"
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=2.0,
+            help="Seconds to wait between polls when the queue is empty"
+        )
+        parser.add_argument(
+            "--batch", type=int, default=50,
+            help="Maximum jobs to claim per poll"
+        )
+        parser.add_argument(
+            "--kind", action="append", dest="kinds",
+            help="Only run jobs of this kind (repeatable)"
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f"Re-queued {requeued} stale jobs"))
+
+        self.stdout.write(self.style.NOTICE("🚀 Job worker started"))
+        try:
+            while True:
+                processed = run_pending(limit=options["batch"], kinds=options["kinds"])
+                if processed:
+                    self.stdout.write(f"Processed {processed} jobs")
+                if options["once"] and not processed:
+                    break
+                if not processed:
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("✅ Job worker stopped"))
@@ -0,0 +1,85 @@
+import time
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import reverse, resolve
+from app.filters import filter_options
+
+
+# name -> (label, URL name or None for filter_options(), query params)
+TARGETS = {
+    "options": ("Filter dropdown options", None, {}),
+    "counties": ("Counties GeoJSON", "counties_geojson", {}),
+    "county-stats": ("County project statistics", "counties_geojson", {"geometry": "0"}),
+    "subcounties": ("Subcounties GeoJSON", "subcounties_geojson", {}),
+    "wards": ("Wards GeoJSON", "wards_geojson", {}),
+    "projects": ("Project locations GeoJSON", "project_locations_geojson", {}),
+    "projects-columnar": ("Project locations (columnar)", "project_locations_geojson", {"format": "columnar"}),
+    "spatial": ("Spatial statistics", "spatial_statistics", {}),
+    "hotspots-kde": ("Spending density grid", "spending_hotspots", {"method": "kde"}),
+    "hotspots-gistar": ("Ward Gi* hot spots", "spending_hotspots", {"method": "gistar"}),
+    "budget-sectors": ("Budget distribution by sector", "budget_distribution", {"group_by": "sector"}),
+    "county-classes": ("County choropleth classes", "choropleth_classes", {"level": "counties", "classes": "4"}),
+    "facets": ("Filter facet counts", "project_facets", {}),
+    "timeline": ("Project timeline buckets", "project_timeline", {}),
+    "dashboard": ("Dashboard panels", "dashboard", {}),
+}
+
+
+class Command(BaseCommand):
+    help = "Precompute the default-filter GeoJSON, dashboard and dropdown caches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only", action="append", choices=list(TARGETS),
+            help="Warm only this cache (repeatable)"
+        )
+        parser.add_argument(
+            "--strict", action="store_true",
+            help="Exit with an error if any cache could not be built"
+        )
+
+    def handle(self, *args, **options):
+        names = options["only"] or list(TARGETS)
+        # The views are called in-process, so the host only has to pass ALLOWED_HOSTS
+        factory = RequestFactory(SERVER_NAME="localhost")
+        failures = []
+        started = time.time()
+
+        self.stdout.write(self.style.NOTICE(f"🚀 Warming {len(names)} caches..."))
+        for name in names:
+            label, url_name, params = TARGETS[name]
+            start_time = time.time()
+            try:
+                if url_name is None:
+                    filter_options()
+                    size = None
+                else:
+                    size = self._warm_view(factory, url_name, params)
+            except Exception as e:
+                failures.append(name)
+                self.stderr.write(self.style.ERROR(f"⚠️ {label}: {e}"))
+                continue
+
+            elapsed = round(time.time() - start_time, 2)
+            detail = f" ({size / 1024:.1f} KB)" if size is not None else ""
+            self.stdout.write(f"  {label}: {elapsed}s{detail}")
+
+        total = round(time.time() - started, 2)
+        if failures:
+            message = f"Failed to warm: {', '.join(failures)}"
+            if options["strict"]:
+                raise CommandError(message)
+            self.stderr.write(self.style.WARNING(message))
+        self.stdout.write(self.style.SUCCESS(f"✅ Warmed {len(names) - len(failures)} caches in {total} seconds."))
+
+    def _warm_view(self, factory, url_name, params):
+        """Call a view the way a first visitor would; returns the response size."""
+        path = reverse(url_name)
+        request = factory.get(path, params)
+        request.user = AnonymousUser()
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.status_code != 200:
+            raise CommandError(f"HTTP {response.status_code}: {response.content[:200].decode(errors='replace')}")
+        return len(response.content)
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_alter_project_budget_alter_project_county_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='citizenreport',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Storage names of resized copies of the photo, keyed by variant'),
+        ),
+        migrations.AddField(
+            model_name='projectupdate',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Storage names of resized copies of the photo, keyed by variant'),
+        ),
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='Registered handler name', max_length=50)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['run_after', 'id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='app_backgro_status_486cdb_idx')],
+            },
+        ),
+    ]
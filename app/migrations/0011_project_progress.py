@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_csvimportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='last_update_at',
+            field=models.DateTimeField(blank=True, help_text='When the most recent project update was posted', null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Progress percentage from the most recent project update'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['progress'], name='app_project_progres_0676de_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['last_update_at'], name='app_project_last_up_7484e5_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+import re
+
+from django.db import migrations
+from django.db.models import Count
+
+# Same rules as app.lookups, copied so later edits there don't change history.
+FIELDS = [
+    ("sector", "sector_ref", "Sector"),
+    ("county", "county_ref", "County"),
+    ("implementing_agency", "agency_ref", "Agency"),
+    ("contractor", "contractor_ref", "Contractor"),
+]
+
+
+def clean(text):
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def normalize(text):
+    return clean(text).strip(" .,;:-_").casefold()
+
+
+def populate_lookups(apps, schema_editor):
+    """
+    Create one lookup row per normalised value, named after its most common
+    spelling, then point every project at it and rewrite the text to match.
+    """
+    Project = apps.get_model("app", "Project")
+    for field, ref, model_name in FIELDS:
+        model = apps.get_model("app", model_name)
+
+        spellings = {}
+        counts = Project.objects.order_by().values(field).annotate(n=Count("id")).values_list(field, "n")
+        for value, count in counts:
+            key = normalize(value)
+            if key:
+                spellings.setdefault(key, []).append((count, value))
+
+        for key, variants in spellings.items():
+            name = clean(max(variants, key=lambda v: v[0])[1])
+            lookup = model.objects.create(key=key[:200], name=name[:200])
+            Project.objects.filter(**{f"{field}__in": [v for _, v in variants]}).update(
+                **{field: name, ref: lookup}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0014_project_lookup_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_lookups, migrations.RunPython.noop),
+    ]
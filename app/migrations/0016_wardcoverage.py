@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0015_populate_project_lookups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WardCoverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('planned', 'Planned'), ('ongoing', 'Ongoing'), ('completed', 'Completed'), ('delayed', 'Delayed')], max_length=20)),
+                ('distance_m', models.FloatField(help_text='Distance to the nearest such project in metres')),
+                ('computed_at', models.DateTimeField()),
+                ('nearest_project', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='app.project')),
+                ('sector', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ward_coverage', to='app.sector')),
+                ('ward', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coverage', to='app.kenyawards')),
+            ],
+            options={
+                'verbose_name_plural': 'ward coverage',
+                'constraints': [models.UniqueConstraint(fields=('sector', 'status', 'ward'), name='ward_coverage_unique')],
+            },
+        ),
+    ]
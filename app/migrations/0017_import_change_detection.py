@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0016_wardcoverage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csvimportjob',
+            name='dry_run',
+            field=models.BooleanField(default=False, help_text='Only report what the import would change'),
+        ),
+        migrations.AddField(
+            model_name='csvimportjob',
+            name='rows_missing',
+            field=models.PositiveIntegerField(default=0, help_text='Existing projects not present in the file'),
+        ),
+        migrations.AddField(
+            model_name='csvimportjob',
+            name='rows_unchanged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='import_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Digest of the normalised CSV fields last imported; unchanged rows are skipped', max_length=32),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:51
+
+import django.contrib.gis.db.models.fields
+import django.contrib.gis.db.models.functions
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0017_import_change_detection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kenyacounty',
+            name='geom_utm',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.gis.db.models.functions.Transform('geom', 32737), output_field=django.contrib.gis.db.models.fields.MultiPolygonField(null=True, srid=32737)),
+        ),
+        migrations.AddField(
+            model_name='kenyasubcounty',
+            name='geom_utm',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.gis.db.models.functions.Transform('geom', 32737), output_field=django.contrib.gis.db.models.fields.MultiPolygonField(null=True, srid=32737)),
+        ),
+        migrations.AddField(
+            model_name='kenyawards',
+            name='geom_utm',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.gis.db.models.functions.Transform('geom', 32737), output_field=django.contrib.gis.db.models.fields.MultiPolygonField(null=True, srid=32737)),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='location_utm',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.gis.db.models.functions.Transform(django.db.models.functions.comparison.Cast('location', django.contrib.gis.db.models.fields.GeometryField(srid=4326)), 32737), output_field=django.contrib.gis.db.models.fields.PointField(null=True, srid=32737)),
+        ),
+        migrations.AddIndex(
+            model_name='kenyacounty',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['geom_utm'], name='county_geom_utm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kenyasubcounty',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['geom_utm'], name='subcounty_geom_utm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kenyawards',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['geom_utm'], name='ward_geom_utm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['location_utm'], name='project_location_utm_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0018_projected_geometry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='citizenreport',
+            name='client_key',
+            field=models.CharField(blank=True, editable=False, help_text='Hashed submitter identity, for rate limiting and duplicate checks', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='citizenreport',
+            name='moderation_flags',
+            field=models.JSONField(blank=True, default=list, help_text='Why the intake job wants a moderator to look closer, e.g. duplicate or invalid_photo'),
+        ),
+        migrations.AddField(
+            model_name='citizenreport',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, help_text='When the intake job verified the photo and ran the moderation checks', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='citizenreport',
+            index=models.Index(fields=['project', 'client_key', 'created_at'], name='report_client_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0019_citizenreport_intake'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_county_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_sector_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['county_ref', 'status'], name='project_county_ref_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['sector_ref', 'status'], name='project_sector_ref_status_idx'),
+        ),
+    ]
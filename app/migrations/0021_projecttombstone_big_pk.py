@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0020_project_lookup_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projecttombstone',
+            name='project_pk',
+            field=models.PositiveBigIntegerField(help_text='Primary key of the deleted project'),
+        ),
+    ]
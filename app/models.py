@@ -1,5 +1,90 @@
 from django.contrib.gis.db import models
+from django.contrib.gis.db.models.functions import Transform
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GistIndex
+from django.db.models.functions import Cast, Coalesce, Substr
+from django.utils import timezone
+
+from .geo import PROJECTED_SRID, PointX, PointY
+
+
+def projected_geometry(field_class, source, geography=False):
+    """
+    Database-maintained planar copy of ``source`` in ``PROJECTED_SRID``.
+    Containment and distance filters on it compare in metres against a plain
+    geometry GiST index instead of casting lon/lat values row by row. On
+    SpatiaLite the column is trigger-maintained with an R*Tree instead (see
+    ``app.spatialite``).
+    """
+    if geography:
+        source = Cast(source, models.GeometryField(srid=4326))
+    return models.GeneratedField(
+        expression=Transform(source, PROJECTED_SRID),
+        output_field=field_class(srid=PROJECTED_SRID, null=True),
+        db_persist=True,
+    )
+
+
+class ProjectQuerySet(models.QuerySet):
+    """
+    Named projections so views load only the columns they render.
+
+    Full instances carry the ``description`` text and the ``location``
+    geography, which GEOS has to parse per row; a map feature needs neither.
+    """
+
+    MAP_FIELDS = ("id", "name", "status", "county", "sector", "budget")
+    LIST_FIELDS = (
+        "id", "name", "status", "county", "sector", "budget", "progress",
+        "start_date", "end_date", "implementing_agency", "created_at", "last_update_at",
+    )
+    # Enough of the description for the list card's 15-word teaser
+    LIST_DESCRIPTION_CHARS = 300
+
+    def for_map(self, *fields):
+        """
+        ``MAP_FIELDS`` plus ``fields`` as deferred instances, with ``lon`` and
+        ``lat`` floats extracted in SQL (falling back to the explicit
+        longitude/latitude columns; ``None`` when the project is unmapped).
+        """
+        return self.only(*self.MAP_FIELDS, *fields).annotate(
+            lon=Coalesce(PointX("location"), Cast("longitude", models.FloatField())),
+            lat=Coalesce(PointY("location"), Cast("latitude", models.FloatField())),
+        )
+
+    def for_list(self):
+        """Columns of a project list card; the description is cut short in SQL."""
+        return self.only(*self.LIST_FIELDS).annotate(
+            description_preview=Substr("description", 1, self.LIST_DESCRIPTION_CHARS),
+        )
+
+    def within(self, boundary):
+        """
+        Projects inside a county, subcounty or ward instance. Compares the
+        projected columns in SQL, so the boundary geometry is never shipped.
+        """
+        shape = type(boundary).objects.filter(pk=boundary.pk).values("geom_utm")
+        return self.filter(location_utm__within=models.Subquery(
+            shape, output_field=models.MultiPolygonField(srid=PROJECTED_SRID)
+        ))
+
+    def for_stats(self, *fields):
+        """Unordered ``values()`` rows of ``fields``, for grouping and aggregation."""
+        return self.order_by().values(*fields)
+
+
+class ProjectManager(models.Manager.from_queryset(ProjectQuerySet)):
+    """Instances leave out ``location_utm``; queries still filter on it."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer("location_utm")
+
+
+class BoundaryManager(models.Manager):
+    """Instances leave out ``geom_utm``; queries still filter on it."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer("geom_utm")
 
 
 class Project(models.Model):
@@ -53,6 +138,7 @@ class Project(models.Model):
         geography=True, null=True, blank=True,
         help_text="GIS Point from Latitude/Longitude"
     )
+    location_utm = projected_geometry(models.PointField, "location", geography=True)
     county = models.CharField(
         max_length=100,
         help_text="County where the project is located"
@@ -77,16 +163,79 @@ class Project(models.Model):
     implementing_agency = models.CharField(max_length=200, blank=True)
     contractor = models.CharField(max_length=200, blank=True)
 
+    # Integer keys for the free-text fields above, kept in step on save and
+    # by the importer (see app.lookups). The text columns hold the canonical
+    # spelling for display; grouping and filtering use these.
+    sector_ref = models.ForeignKey(
+        "Sector", null=True, blank=True, editable=False,
+        on_delete=models.PROTECT, related_name="projects"
+    )
+    county_ref = models.ForeignKey(
+        "County", null=True, blank=True, editable=False,
+        on_delete=models.PROTECT, related_name="projects"
+    )
+    agency_ref = models.ForeignKey(
+        "Agency", null=True, blank=True, editable=False,
+        on_delete=models.PROTECT, related_name="projects"
+    )
+    contractor_ref = models.ForeignKey(
+        "Contractor", null=True, blank=True, editable=False,
+        on_delete=models.PROTECT, related_name="projects"
+    )
+
+    # Progress, denormalised from the latest ProjectUpdate (see app.progress)
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Progress percentage from the most recent project update"
+    )
+    last_update_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="When the most recent project update was posted"
+    )
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    import_hash = models.CharField(
+        max_length=32, blank=True, editable=False,
+        help_text="Digest of the normalised CSV fields last imported; unchanged rows are skipped"
+    )
+
+    objects = ProjectManager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["progress"]),
+            models.Index(fields=["last_update_at"]),
+            # Filters and orderings used by the home, dashboard, list and map
+            # views (see the explain_views command).
+            models.Index(fields=["-created_at"], name="project_created_idx"),
+            models.Index(fields=["status", "-created_at"], name="project_status_created_idx"),
+            models.Index(fields=["county_ref", "status"], name="project_county_ref_status_idx"),
+            models.Index(fields=["sector_ref", "status"], name="project_sector_ref_status_idx"),
+            models.Index(fields=["start_date"], name="project_start_date_idx"),
+            models.Index(fields=["budget"], name="project_budget_idx"),
+            models.Index(fields=["updated_at"], name="project_updated_idx"),
+            models.Index(
+                fields=["end_date"], condition=models.Q(status="ongoing"),
+                name="project_ongoing_end_idx",
+            ),
+            models.Index(
+                fields=["status"], condition=models.Q(location__isnull=False),
+                name="project_mapped_status_idx",
+            ),
+            GistIndex(fields=["location_utm"], name="project_location_utm_idx"),
+        ]
 
     def __str__(self):
         return f"{self.project_id or 'N/A'} - {self.name}"
 
+    def save(self, *args, **kwargs):
+        from .lookups import resolve_lookups
+        resolve_lookups(self)
+        super().save(*args, **kwargs)
+
 
 class ProjectUpdate(models.Model):
     """
@@ -100,6 +249,10 @@ class ProjectUpdate(models.Model):
     description = models.TextField()
     progress_percentage = models.IntegerField(default=0)
     photo = models.ImageField(upload_to="project_updates/", blank=True)
+    photo_variants = models.JSONField(
+        default=dict, blank=True,
+        help_text="Storage names of resized copies of the photo, keyed by variant"
+    )
     reported_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -129,24 +282,207 @@ class CitizenReport(models.Model):
     report_type = models.CharField(max_length=50, choices=REPORT_CHOICES)
     description = models.TextField()
     photo = models.ImageField(upload_to="citizen_reports/", blank=True)
+    photo_variants = models.JSONField(
+        default=dict, blank=True,
+        help_text="Storage names of resized copies of the photo, keyed by variant"
+    )
     reported_by = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, blank=True
     )
     created_at = models.DateTimeField(auto_now_add=True)
     is_approved = models.BooleanField(default=False)
+    client_key = models.CharField(
+        max_length=64, blank=True, editable=False,
+        help_text="Hashed submitter identity, for rate limiting and duplicate checks"
+    )
+    moderation_flags = models.JSONField(
+        default=list, blank=True,
+        help_text="Why the intake job wants a moderator to look closer, e.g. duplicate or invalid_photo"
+    )
+    processed_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="When the intake job verified the photo and ran the moderation checks"
+    )
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "client_key", "created_at"], name="report_client_recent_idx"),
+        ]
 
     def __str__(self):
         return f"{self.project.name} - {self.report_type}"
 
 
+class LookupValue(models.Model):
+    """
+    Canonical spelling of a free-text project attribute. Spellings that only
+    differ in case, spacing or stray punctuation share one ``key``.
+    """
+
+    name = models.CharField(max_length=200)
+    key = models.CharField(
+        max_length=200, unique=True,
+        help_text="Normalised name used to match CSV and form input"
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class Sector(LookupValue):
+    pass
+
+
+class County(LookupValue):
+    class Meta(LookupValue.Meta):
+        verbose_name_plural = "counties"
+
+
+class Agency(LookupValue):
+    class Meta(LookupValue.Meta):
+        verbose_name_plural = "agencies"
+
+
+class Contractor(LookupValue):
+    pass
+
+
+class ProjectTombstone(models.Model):
+    """
+    Record of a deleted project, so the change feed can tell map clients
+    to drop it.
+    """
+
+    project_pk = models.PositiveBigIntegerField(help_text="Primary key of the deleted project")
+    project_id = models.CharField(max_length=50, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-deleted_at"]
+
+    def __str__(self):
+        return f"{self.project_id or self.project_pk} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+class BackgroundJob(models.Model):
+    """
+    A unit of deferred work picked up by the ``run_jobs`` worker.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50, help_text="Registered handler name")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class CSVImportJob(models.Model):
+    """
+    A project CSV uploaded through the admin and imported by the job worker.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    csv_file = models.FileField(upload_to="imports/")
+    original_name = models.CharField(max_length=255, blank=True)
+    file_size = models.BigIntegerField(default=0)
+    uploaded_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    dry_run = models.BooleanField(
+        default=False, help_text="Only report what the import would change"
+    )
+
+    # Progress, refreshed periodically while the import runs
+    bytes_processed = models.BigIntegerField(default=0)
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_created = models.PositiveIntegerField(default=0)
+    rows_updated = models.PositiveIntegerField(default=0)
+    rows_unchanged = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    rows_missing = models.PositiveIntegerField(
+        default=0, help_text="Existing projects not present in the file"
+    )
+    error_counts = models.JSONField(
+        default=dict, blank=True,
+        help_text="Number of rejected rows per error message"
+    )
+    rejected_file = models.FileField(upload_to="imports/rejected/", blank=True)
+    message = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.original_name or self.csv_file.name} ({self.status})"
+
+    @property
+    def progress_percent(self):
+        if self.status == "done":
+            return 100
+        if not self.file_size:
+            return 0
+        return min(99, round(self.bytes_processed / self.file_size * 100))
+
+    @property
+    def elapsed_seconds(self):
+        if not self.started_at:
+            return 0
+        end = self.finished_at or timezone.now()
+        return max((end - self.started_at).total_seconds(), 0)
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed_seconds
+        return round(self.rows_processed / elapsed, 1) if elapsed else 0
+
+
 class Kenyawards(models.Model):
     county = models.CharField(max_length=40)
     subcounty = models.CharField(max_length=80)
     ward = models.CharField(max_length=80)
     geom = models.MultiPolygonField(srid=4326)
+    geom_utm = projected_geometry(models.MultiPolygonField, "geom")
+
+    objects = BoundaryManager()
+
+    class Meta:
+        indexes = [GistIndex(fields=["geom_utm"], name="ward_geom_utm_idx")]
 
     def __str__(self):
         return self.ward or f"Ward {self.id}"
@@ -157,6 +493,12 @@ class KenyaCounty(models.Model):
     pop_2009 = models.BigIntegerField()
     country = models.CharField(max_length=5)
     geom = models.MultiPolygonField(srid=4326)
+    geom_utm = projected_geometry(models.MultiPolygonField, "geom")
+
+    objects = BoundaryManager()
+
+    class Meta:
+        indexes = [GistIndex(fields=["geom_utm"], name="county_geom_utm_idx")]
 
     def __str__(self):
         return self.county or f"County {self.id}"
@@ -168,6 +510,37 @@ class KenyaSubCounty(models.Model):
     county = models.CharField(max_length=254)
     subcounty = models.CharField(max_length=254)
     geom = models.MultiPolygonField(srid=4326)
+    geom_utm = projected_geometry(models.MultiPolygonField, "geom")
+
+    objects = BoundaryManager()
+
+    class Meta:
+        indexes = [GistIndex(fields=["geom_utm"], name="subcounty_geom_utm_idx")]
+
+    def __str__(self):
+        return self.subcounty or f"SubCounty {self.id}"
+
+
+class WardCoverage(models.Model):
+    """
+    Distance from a ward's centroid to the nearest mapped project of one
+    sector and status, precomputed by ``app.coverage``.
+    """
+
+    ward = models.ForeignKey("Kenyawards", on_delete=models.CASCADE, related_name="coverage")
+    sector = models.ForeignKey("Sector", on_delete=models.CASCADE, related_name="ward_coverage")
+    status = models.CharField(max_length=20, choices=Project.STATUS_CHOICES)
+    distance_m = models.FloatField(help_text="Distance to the nearest such project in metres")
+    nearest_project = models.ForeignKey(
+        Project, null=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["sector", "status", "ward"], name="ward_coverage_unique"),
+        ]
+        verbose_name_plural = "ward coverage"
 
     def __str__(self):
-        return self.subcounty or f"SubCounty {self.id}"
\ No newline at end of file
+        return f"{self.ward} - {self.sector} ({self.status}): {self.distance_m:.0f} m"
@@ -0,0 +1,34 @@
+"""
+Keeps ``Project.progress`` and ``Project.last_update_at`` in step with the
+latest ``ProjectUpdate`` so list views never query updates per project.
+"""
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .caching import bump_data_version
+from .models import Project, ProjectUpdate
+
+
+def _latest_update(field):
+    return Subquery(
+        ProjectUpdate.objects.filter(project=OuterRef("pk"))
+        .order_by("-created_at", "-id")
+        .values(field)[:1]
+    )
+
+
+def refresh_project_progress(project_ids=None):
+    """
+    Recompute progress for the given projects (all when ``None``) with a
+    single correlated UPDATE. Returns the number of projects touched.
+    """
+    projects = Project.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+
+    count = projects.update(
+        progress=Least(Greatest(Coalesce(_latest_update("progress_percentage"), Value(0)), Value(0)), Value(100)),
+        last_update_at=_latest_update("created_at"),
+    )
+    bump_data_version()
+    return count
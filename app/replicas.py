@@ -0,0 +1,101 @@
+"""
+Read-replica routing for the analytics and GeoJSON views.
+
+Only views wrapped in ``@use_read_replica`` read from a replica; everything
+else (admin, imports, report submission, the job worker) stays on
+``default``. After a client makes a write, a short-lived cookie pins its
+reads to the primary so it always sees its own changes.
+"""
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PIN_COOKIE = "db_primary_pin"
+
+_read_alias = ContextVar("read_alias", default=None)
+# alias -> time.monotonic() before which the replica is skipped
+_unhealthy_until = {}
+
+
+def replica_aliases():
+    return list(getattr(settings, "REPLICA_DATABASES", []))
+
+
+def choose_replica():
+    """A reachable replica alias, or ``"default"`` when none is available."""
+    now = time.monotonic()
+    candidates = [a for a in replica_aliases() if _unhealthy_until.get(a, 0) <= now]
+    random.shuffle(candidates)
+    for alias in candidates:
+        try:
+            connections[alias].ensure_connection()
+            return alias
+        except DatabaseError:
+            _unhealthy_until[alias] = now + getattr(settings, "REPLICA_RETRY_SECONDS", 30)
+    return "default"
+
+
+def use_read_replica(view):
+    """Serve the view's reads from a replica unless the client recently wrote."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or PIN_COOKIE in request.COOKIES
+            or not replica_aliases()
+        ):
+            return view(request, *args, **kwargs)
+
+        token = _read_alias.set(choose_replica())
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Writes always go to ``default``; reads follow ``use_read_replica``."""
+
+    def db_for_read(self, model, **hints):
+        # DatabaseCache rows are read where they are written: on a lagging
+        # replica every lookup would miss, and a missing data version would
+        # be re-seeded on each request.
+        if model._meta.app_label == "django_cache":
+            return "default"
+        return _read_alias.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+
+class ReplicaStickinessMiddleware:
+    """
+    After a successful write request, set a cookie that keeps the client's
+    reads on the primary for ``REPLICA_STICKY_SECONDS`` (read-your-writes).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            replica_aliases()
+            and request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                PIN_COOKIE, "1",
+                max_age=getattr(settings, "REPLICA_STICKY_SECONDS", 10),
+                httponly=True, samesite="Lax",
+            )
+        return response
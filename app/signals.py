@@ -0,0 +1,68 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .changes import record_tombstone
+from .coverage import COVERAGE_FIELDS, schedule_ward_coverage
+from .jobs import enqueue
+from .lookups import LOOKUP_FIELDS
+from .models import Project, ProjectUpdate, CitizenReport, Sector, County, Agency, Contractor
+from .progress import refresh_project_progress
+
+
+@receiver(post_save, sender=ProjectUpdate)
+@receiver(post_save, sender=CitizenReport)
+def queue_photo_variants(sender, instance, **kwargs):
+    """Resize new or replaced photos in the background instead of the request."""
+    if not instance.photo:
+        return
+    if (instance.photo_variants or {}).get("source") == instance.photo.name:
+        return
+    enqueue("photo_variants", {"model": sender.__name__, "pk": instance.pk})
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_caches(sender, **kwargs):
+    """Any project change makes versioned analytics caches stale."""
+    bump_data_version()
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def queue_ward_coverage(sender, update_fields=None, **kwargs):
+    """Ward distances depend on where projects are, their sector and status."""
+    if update_fields and not COVERAGE_FIELDS.intersection(update_fields):
+        return
+    schedule_ward_coverage()
+
+
+@receiver(post_delete, sender=Project)
+def record_project_tombstone(sender, instance, **kwargs):
+    """Let change-feed clients know the project is gone."""
+    record_tombstone(instance)
+
+
+@receiver(post_save, sender=ProjectUpdate)
+@receiver(post_delete, sender=ProjectUpdate)
+def sync_project_progress(sender, instance, **kwargs):
+    """Copy the latest update's progress onto its project."""
+    refresh_project_progress([instance.project_id])
+
+
+@receiver(post_save, sender=Sector)
+@receiver(post_save, sender=County)
+@receiver(post_save, sender=Agency)
+@receiver(post_save, sender=Contractor)
+def sync_lookup_name(sender, instance, created, **kwargs):
+    """Copy a renamed lookup value onto the text column of its projects."""
+    if created:
+        return
+    field, ref = next((f, r) for f, (r, model) in LOOKUP_FIELDS.items() if model is sender)
+    changed = (
+        Project.objects.filter(**{ref: instance}).exclude(**{field: instance.name})
+        .update(**{field: instance.name, "updated_at": timezone.now()})
+    )
+    if changed:
+        bump_data_version()
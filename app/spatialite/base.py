@@ -0,0 +1,285 @@
+"""
+SpatiaLite database backend for single-file deployments, the default
+engine without ``DB_LIVE``.
+
+This is Django's SpatiaLite backend plus three things the project's schema
+and views rely on:
+
+* A ``GeneratedField`` with a geometry output (the ``*_utm`` projections)
+  becomes a real geometry column. It is registered with
+  ``AddGeometryColumn``, given an R*Tree, and kept current by
+  ``AFTER INSERT`` / ``AFTER UPDATE OF`` triggers. SQLite's own generated
+  columns can carry neither SpatiaLite metadata nor a spatial index.
+* PostgreSQL-only index types (the GiST indexes in ``Meta.indexes``) are
+  skipped. The R*Tree that every geometry column gets stands in for them.
+* SpatiaLite never consults an R*Tree by itself. Topological lookups, and
+  ``dwithin`` on planar columns, on an indexed column therefore add a
+  ``rowid IN (SELECT rowid FROM SpatialIndex ...)`` pre-filter. Only rows
+  whose bounding box matches reach the exact GEOS test.
+"""
+from django.contrib.gis.db.backends.spatialite.base import DatabaseWrapper as SpatiaLiteDatabaseWrapper
+from django.contrib.gis.db.backends.spatialite.operations import (
+    SpatiaLiteOperations, SpatialiteNullCheckOperator,
+)
+from django.contrib.gis.db.backends.spatialite.schema import SpatialiteSchemaEditor
+from django.contrib.gis.db.backends.utils import SpatialOperator
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.postgres.indexes import PostgresIndex
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.expressions import Col
+from django.db.models.functions import Cast
+from django.db.models.sql import Query
+
+# Predicates that can only hold where the two bounding boxes intersect
+INDEXED_PREDICATES = (
+    "equals", "touches", "crosses", "within", "overlaps", "contains",
+    "intersects", "coveredby", "covers", "same_as", "exact",
+)
+
+
+def is_projection(field):
+    """Whether ``field`` is a ``GeneratedField`` producing a geometry."""
+    return bool(getattr(field, "generated", False)) and isinstance(field.output_field, GeometryField)
+
+
+def indexed_geometry(field):
+    """The geometry field behind ``field`` when it has an R*Tree, else None."""
+    if is_projection(field):
+        field = field.output_field
+    if isinstance(field, GeometryField) and field.spatial_index:
+        return field
+    return None
+
+
+def _without_geometry_casts(expression):
+    """Drop geometry/geography casts; SpatiaLite only has geometry."""
+    if isinstance(expression, Cast) and isinstance(expression.output_field, GeometryField):
+        return _without_geometry_casts(expression.get_source_expressions()[0])
+    sources = expression.get_source_expressions()
+    if not sources:
+        return expression
+    expression = expression.copy()
+    expression.set_source_expressions([
+        _without_geometry_casts(source) if source is not None else None for source in sources
+    ])
+    return expression
+
+
+class SpatialIndexMixin:
+    """Adds the R*Tree pre-filter when the left-hand side is an indexed column."""
+    search_frame = "%(rhs)s"
+    planar_only = False
+
+    def as_sql(self, connection, lookup, template_params, sql_params):
+        sql, params = super().as_sql(connection, lookup, template_params, sql_params)
+        column = lookup.lhs
+        if not isinstance(column, Col):
+            return sql, params
+        geometry = indexed_geometry(column.target)
+        if geometry is None or (self.planar_only and geometry.geodetic(connection)):
+            return sql, params
+        # A bare Col compiles without params, so ``params`` are the frame's
+        qualifier = template_params["lhs"].rpartition(".")[0]
+        rowid = f"{qualifier}.rowid" if qualifier else "rowid"
+        frame = self.search_frame % template_params
+        return (
+            f"({sql} AND {rowid} IN (SELECT rowid FROM SpatialIndex WHERE f_table_name = %s "
+            f"AND f_geometry_column = %s AND search_frame = {frame}))",
+            (*params, column.target.model._meta.db_table, column.target.column, *params),
+        )
+
+
+class IndexedPredicate(SpatialIndexMixin, SpatialiteNullCheckOperator):
+    pass
+
+
+class IndexedDistance(SpatialIndexMixin, SpatialOperator):
+    # Degrees would need a metre-to-degree frame; only planar columns use the index
+    search_frame = "ST_Buffer(%(rhs)s, %(value)s)"
+    planar_only = True
+
+
+class DatabaseOperations(SpatiaLiteOperations):
+    gis_operators = {
+        **SpatiaLiteOperations.gis_operators,
+        **{
+            name: IndexedPredicate(func=SpatiaLiteOperations.gis_operators[name].func)
+            for name in INDEXED_PREDICATES
+        },
+        "dwithin": IndexedDistance(func="PtDistWithin"),
+    }
+
+
+class DatabaseSchemaEditor(SpatialiteSchemaEditor):
+    sql_create_projection_trigger = (
+        "CREATE TRIGGER %(name)s AFTER %(event)s ON %(table)s BEGIN "
+        "UPDATE %(table)s SET %(column)s = %(expression)s WHERE rowid = NEW.rowid; END"
+    )
+    sql_drop_trigger = "DROP TRIGGER IF EXISTS %(name)s"
+    sql_update_projection = "UPDATE %(table)s SET %(column)s = %(expression)s"
+    sql_drop_table_if_exists = "DROP TABLE IF EXISTS %(table)s"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._remade_models = None
+
+    @staticmethod
+    def _projections(model):
+        return [field for field in model._meta.local_concrete_fields if is_projection(field)]
+
+    @staticmethod
+    def _as_geometry(field):
+        """The projection's output field, standing in for it in the parent's geometry SQL."""
+        geometry = field.output_field.clone()
+        geometry.set_attributes_from_name(field.name)
+        geometry.column = field.column
+        return geometry
+
+    def _projection_sql(self, field):
+        """``(expression SQL, source columns)`` of a projection, params inlined."""
+        query = Query(field.model, alias_cols=False)
+        expression = _without_geometry_casts(field.expression.resolve_expression(query, allow_joins=False))
+        sql, params = query.get_compiler(connection=self.connection).compile(expression)
+        sources = [col.target.column for col in expression.flatten() if isinstance(col, Col)]
+        return sql % tuple(self.quote_value(p) for p in params), sources
+
+    def _trigger_name(self, table, field, event):
+        return self.quote_name(f"{table}_{field.column}_{event}")
+
+    def _add_projection_triggers(self, table, fields, backfill=False):
+        for field in fields:
+            expression, sources = self._projection_sql(field)
+            params = {
+                "table": self.quote_name(table),
+                "column": self.quote_name(field.column),
+                "expression": expression,
+            }
+            events = {
+                "insert": "INSERT",
+                "update": "UPDATE OF " + ", ".join(self.quote_name(source) for source in sources),
+            }
+            for suffix, event in events.items():
+                name = self._trigger_name(table, field, suffix)
+                self.execute(self.sql_drop_trigger % {"name": name})
+                self.execute(self.sql_create_projection_trigger % {**params, "name": name, "event": event})
+            if backfill:
+                self.execute(self.sql_update_projection % params)
+
+    def column_sql(self, model, field, include_default=False):
+        if is_projection(field):
+            field = self._as_geometry(field)
+        return super().column_sql(model, field, include_default)
+
+    def create_model(self, model):
+        super().create_model(model)
+        if self._remade_models is not None:
+            # The table is still "new__..."; _remake_table() adds the triggers after the rename
+            self._remade_models.append(model)
+        else:
+            self._add_projection_triggers(model._meta.db_table, self._projections(model))
+
+    def _remake_table(self, model, create_field=None, delete_field=None, alter_fields=None):
+        self._remade_models = []
+        try:
+            super()._remake_table(model, create_field, delete_field, alter_fields)
+            remade = self._remade_models
+        finally:
+            self._remade_models = None
+        # The copy skips generated columns, so the new table's projections start empty
+        for new_model in remade:
+            self._add_projection_triggers(model._meta.db_table, self._projections(new_model), backfill=True)
+
+    def delete_model(self, model, **kwargs):
+        for field in self._projections(model):
+            self.remove_geometry_metadata(model, self._as_geometry(field))
+        super().delete_model(model, **kwargs)
+
+    def add_field(self, model, field):
+        if not is_projection(field):
+            return super().add_field(model, field)
+        self.column_sql(model, field)
+        for sql in self.geometry_sql:
+            self.execute(sql)
+        self.geometry_sql = []
+        self._add_projection_triggers(model._meta.db_table, [field], backfill=True)
+
+    def remove_field(self, model, field):
+        if not is_projection(field):
+            return super().remove_field(model, field)
+        # Like geometry columns, only a table rebuild drops the column
+        self._remake_table(model, delete_field=field)
+
+    @staticmethod
+    def _geometry_column(field):
+        """What SpatiaLite stores of a geometry field; ``geography`` has no equivalent."""
+        return field.column, field.srid, field.geom_type, field.dim, field.null, field.spatial_index
+
+    def alter_field(self, model, old_field, new_field, strict=False):
+        # Geometry columns have no db_type here, which the parent refuses to alter
+        if not (isinstance(old_field, GeometryField) and isinstance(new_field, GeometryField)):
+            return super().alter_field(model, old_field, new_field, strict)
+        if self._geometry_column(old_field) == self._geometry_column(new_field):
+            return
+        self._remake_table(model, alter_fields=[(old_field, new_field)])
+
+    def alter_db_table(self, model, old_db_table, new_db_table):
+        if old_db_table == new_db_table:
+            return super().alter_db_table(model, old_db_table, new_db_table)
+        projections = self._projections(model)
+        for field in projections:
+            self.execute(self.sql_remove_geometry_metadata % {
+                "table": self.quote_name(old_db_table),
+                "column": self.quote_name(field.column),
+            })
+        super().alter_db_table(model, old_db_table, new_db_table)
+        for field in projections:
+            geometry = self._as_geometry(field)
+            self.execute(self.sql_recover_geometry_metadata % {
+                "table": self.geo_quote_name(new_db_table),
+                "column": self.geo_quote_name(field.column),
+                "srid": geometry.srid,
+                "geom_type": self.geo_quote_name(geometry.geom_type),
+                "dim": geometry.dim,
+            })
+        # RecoverGeometryColumn() leaves the column's spatial index disabled,
+        # which would hide the renamed R*Tree from SpatialIndex: rebuild it
+        for field in model._meta.local_concrete_fields:
+            if indexed_geometry(field) is None:
+                continue
+            self.execute(self.sql_drop_table_if_exists % {
+                "table": self.quote_name(f"idx_{new_db_table}_{field.column}"),
+            })
+            self.execute(self.sql_add_spatial_index % {
+                "table": self.quote_name(new_db_table),
+                "column": self.quote_name(field.column),
+            })
+
+    def add_index(self, model, index):
+        if not isinstance(index, PostgresIndex):
+            super().add_index(model, index)
+
+    def remove_index(self, model, index):
+        if not isinstance(index, PostgresIndex):
+            super().remove_index(model, index)
+
+    def _model_indexes_sql(self, model):
+        skipped = {
+            self.quote_name(index.name) for index in model._meta.indexes if isinstance(index, PostgresIndex)
+        }
+        return [sql for sql in super()._model_indexes_sql(model) if str(sql.parts.get("name")) not in skipped]
+
+
+class DatabaseWrapper(SpatiaLiteDatabaseWrapper):
+    SchemaEditorClass = DatabaseSchemaEditor
+    ops_class = DatabaseOperations
+
+    def get_new_connection(self, conn_params):
+        # Plain SQLite cannot hold the geometry columns, so never fall back to it
+        try:
+            return super().get_new_connection(conn_params)
+        except ImproperlyConfigured as e:
+            raise ImproperlyConfigured(
+                f"{e} The app.spatialite backend needs mod_spatialite: install it "
+                "(e.g. the libsqlite3-mod-spatialite package) or point "
+                "SPATIALITE_LIBRARY_PATH at it."
+            ) from e
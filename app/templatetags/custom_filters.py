@@ -188,3 +188,40 @@ def get_projects_count(year_value, projects_qs):
         return cnt
     except Exception:
         return 0
+
+
+@register.filter
+def facet_count(facet, value):
+    """
+    Project count for ``value`` in one facet of ``facet_counts()``, 0 when
+    nothing matches. Usage: {{ facets.sector|facet_count:sector }}
+    """
+    if not facet:
+        return 0
+    entry = facet.get(value)
+    return entry["count"] if entry else 0
+
+
+@register.filter
+def photo_url(obj, variant=None):
+    """
+    URL of a resized photo variant ("thumb", "medium", "thumb_webp", ...),
+    falling back to the original upload until the worker has produced it.
+    Usage: {{ update|photo_url:"medium" }}
+    """
+    from app.images import photo_url as _photo_url
+    try:
+        return _photo_url(obj, variant)
+    except Exception:
+        return ''
+
+
+@register.simple_tag
+def boundary_url(level, fmt="geojson"):
+    """
+    URL of the pre-built boundary file for "counties", "subcounties" or
+    "wards", falling back to the GeoJSON view until build_boundary_assets runs.
+    Usage: {% boundary_url 'wards' %}
+    """
+    from app.boundary_assets import asset_url
+    return asset_url(level, fmt)
@@ -1,3 +1,867 @@
-from django.test import TestCase
+import math
+import random
+import struct
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import combinations
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.gis.measure import D
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models.expressions import Col
+from django.db.utils import ConnectionHandler
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .caching import DATA_VERSION_KEY, bump_data_version, cached_for_spec, data_version, spec_cache_key
+from . import analytics, classification, columnar, intake, tiles, timeline
+from .changes import TOMBSTONE_RETENTION, encode_cursor
+from .facets import facet_counts, facet_for_names
+from .filters import filter_spec_from_request
+from .forms import ReportIntakeForm
+from .replicas import ReplicaRouter, _read_alias
+from .management.commands import load_test
+from .importers import RowError, content_hash, import_projects, parse_project_row
+from .geo import PROJECTED_SRID
+from .models import BackgroundJob, CitizenReport, Kenyawards, Project, ProjectQuerySet
+from .views import ProjectListView
+
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def make_project(**fields):
+    """A saved project with the required fields filled in."""
+    values = {
+        "name": "Borehole",
+        "county": "Kitui",
+        "sector": "Water",
+        "start_date": date(2024, 7, 1),
+        "end_date": date(2025, 6, 30),
+        "budget": Decimal("1000000.00"),
+    }
+    values.update(fields)
+    return Project.objects.create(**values)
+
+
+def square(lon, lat, half_side, srid=4326):
+    return MultiPolygon(
+        Polygon.from_bbox((lon - half_side, lat - half_side, lon + half_side, lat + half_side)), srid=srid
+    )
+
+
+@skipUnless(
+    connection.settings_dict["ENGINE"] == "app.spatialite",
+    "Runs against the SpatiaLite backend",
+)
+class SpatiaLiteBackendTests(TestCase):
+    """The *_utm triggers and the R*Tree pre-filter of ``app.spatialite``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ward = Kenyawards.objects.create(
+            county="Kitui", subcounty="Kitui Central", ward="Township", geom=square(38.0, -1.0, 0.05)
+        )
+        cls.inside = make_project(name="Inside", location=Point(38.0, -1.0, srid=4326))
+        cls.outside = make_project(name="Outside", location=Point(38.2, -1.0, srid=4326))
+
+    def utm(self, project):
+        return Project.objects.filter(pk=project.pk).values_list("location_utm", flat=True).get()
+
+    def test_insert_trigger_fills_projection(self):
+        expected = Point(38.0, -1.0, srid=4326).transform(PROJECTED_SRID, clone=True)
+        location_utm = self.utm(self.inside)
+        self.assertEqual(location_utm.srid, PROJECTED_SRID)
+        self.assertAlmostEqual(location_utm.x, expected.x, places=0)
+        self.assertAlmostEqual(location_utm.y, expected.y, places=0)
+        self.assertIsNotNone(Kenyawards.objects.values_list("geom_utm", flat=True).get(pk=self.ward.pk))
+
+    def test_update_trigger_follows_source(self):
+        Project.objects.filter(pk=self.outside.pk).update(location=Point(38.01, -1.0, srid=4326))
+        expected = Point(38.01, -1.0, srid=4326).transform(PROJECTED_SRID, clone=True)
+        self.assertAlmostEqual(self.utm(self.outside).x, expected.x, places=0)
+
+    def test_topological_lookup_uses_spatial_index(self):
+        queryset = Project.objects.within(self.ward)
+        self.assertIn("SpatialIndex", str(queryset.query))
+        self.assertEqual(list(queryset.values_list("name", flat=True)), ["Inside"])
+
+    def test_dwithin_uses_spatial_index(self):
+        centre = Point(38.0, -1.0, srid=4326).transform(PROJECTED_SRID, clone=True)
+        queryset = Project.objects.filter(location_utm__dwithin=(centre, D(km=5)))
+        self.assertIn("SpatialIndex", str(queryset.query))
+        self.assertEqual(list(queryset.values_list("name", flat=True)), ["Inside"])
+        wider = Project.objects.filter(location_utm__dwithin=(centre, D(km=50)))
+        self.assertEqual(wider.count(), 2)
+
+
+class SpatiaLiteConnectionTests(SimpleTestCase):
+    @override_settings(SPATIALITE_LIBRARY_PATH="/nonexistent/mod_spatialite.so")
+    def test_missing_library_is_improperly_configured(self):
+        wrapper = ConnectionHandler({"default": {"ENGINE": "app.spatialite", "NAME": ":memory:"}})["default"]
+        with self.assertRaisesMessage(ImproperlyConfigured, "needs mod_spatialite"):
+            wrapper.get_new_connection(wrapper.get_connection_params())
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DataVersionTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_stable_until_bumped(self):
+        version = data_version()
+        self.assertEqual(data_version(), version)
+        bump_data_version()
+        self.assertEqual(data_version(), version + 1)
+
+    def test_evicted_version_never_repeats(self):
+        seen = {data_version()}
+        bump_data_version()
+        seen.add(data_version())
+        cache.delete(DATA_VERSION_KEY)
+        self.assertGreater(data_version(), max(seen))
+        cache.delete(DATA_VERSION_KEY)
+        bump_data_version()
+        self.assertGreater(data_version(), max(seen))
+
+    def test_bump_invalidates_cached_results(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"total": len(calls)}
+
+        spec = {"county": "Kitui"}
+        key = spec_cache_key("stats", spec)
+        self.assertEqual(cached_for_spec("stats", spec, compute), {"total": 1})
+        self.assertEqual(cached_for_spec("stats", spec, compute), {"total": 1})
+        bump_data_version()
+        self.assertNotEqual(spec_cache_key("stats", spec), key)
+        self.assertEqual(cached_for_spec("stats", spec, compute), {"total": 2})
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        spec = {"county": "Kitui"}
+        cached_for_spec("stats", spec, lambda: "before")
+        bump_data_version()
+        cached_for_spec("stats", spec, lambda: "after")
+        cache.delete(DATA_VERSION_KEY)
+        self.assertEqual(cached_for_spec("stats", spec, lambda: "fresh"), "fresh")
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def test_replica_views_read_cache_entries_from_the_primary(self):
+        router = ReplicaRouter()
+        cache_entry = DatabaseCache("app_cache", {}).cache_model_class
+        token = _read_alias.set("replica1")
+        try:
+            self.assertEqual(router.db_for_read(Project), "replica1")
+            self.assertEqual(router.db_for_read(cache_entry), "default")
+        finally:
+            _read_alias.reset(token)
+        self.assertEqual(router.db_for_read(Project), "default")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.since = encode_cursor(timezone.now() - timedelta(minutes=1))
+
+    def poll(self, **params):
+        response = self.client.get(reverse("project_changes"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def feature_ids(self, data):
+        return sorted(feature["properties"]["id"] for feature in data["features"])
+
+    def test_snapshot_without_cursor(self):
+        project = make_project(location=Point(38.0, -1.0, srid=4326))
+        data = self.poll()
+        self.assertTrue(data["reset"])
+        self.assertEqual(self.feature_ids(data), [project.pk])
+        self.assertTrue(data["cursor"])
+
+    def test_delta_matches_snapshot_for_coordinate_only_projects(self):
+        project = make_project(latitude=Decimal("-1.300000"), longitude=Decimal("36.800000"))
+        self.assertIsNone(project.location)
+        self.assertEqual(self.feature_ids(self.poll()), [project.pk])
+
+        data = self.poll(since=self.since)
+        self.assertFalse(data["reset"])
+        self.assertEqual(self.feature_ids(data), [project.pk])
+        self.assertEqual(data["removed"], [])
+
+    def test_deleted_and_unmapped_projects_are_removed(self):
+        deleted = make_project(location=Point(38.0, -1.0, srid=4326))
+        deleted_pk = deleted.pk
+        deleted.delete()
+        unmapped = make_project()
+        data = self.poll(since=self.since)
+        self.assertEqual(data["features"], [])
+        self.assertEqual(data["removed"], sorted([deleted_pk, unmapped.pk]))
+
+    def test_projects_leaving_the_filter_are_removed(self):
+        project = make_project(location=Point(38.0, -1.0, srid=4326), status="ongoing")
+        self.assertEqual(self.feature_ids(self.poll(since=self.since, status="ongoing")), [project.pk])
+        data = self.poll(since=self.since, status="completed")
+        self.assertEqual(data["features"], [])
+        self.assertEqual(data["removed"], [project.pk])
+
+    def test_cursor_older_than_tombstones_resets(self):
+        make_project(location=Point(38.0, -1.0, srid=4326))
+        stale = encode_cursor(timezone.now() - TOMBSTONE_RETENTION - timedelta(days=1))
+        self.assertTrue(self.poll(since=stale)["reset"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("project_changes"), {"since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, REPORT_RATE_LIMIT=3, REPORT_RATE_WINDOW_SECONDS=60)
+class IntakeThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def request(self, address="198.51.100.7", forwarded=None):
+        extra = {"REMOTE_ADDR": address}
+        if forwarded:
+            extra["HTTP_X_FORWARDED_FOR"] = forwarded
+        request = RequestFactory().post("/", **extra)
+        request.user = AnonymousUser()
+        return request
+
+    @mock.patch("app.intake.time.time", return_value=6000.0)
+    def test_limit_per_window(self, _):
+        key = intake.client_key(self.request())
+        self.assertEqual([intake.throttle(key) for _ in range(4)], [0, 0, 0, 60])
+        self.assertEqual(intake.throttle(intake.client_key(self.request("198.51.100.8"))), 0)
+
+    def test_new_window_resets_the_count(self):
+        key = intake.client_key(self.request())
+        with mock.patch("app.intake.time.time", return_value=6050.0):
+            for _ in range(3):
+                intake.throttle(key)
+            self.assertEqual(intake.throttle(key), 10)
+        with mock.patch("app.intake.time.time", return_value=6060.0):
+            self.assertEqual(intake.throttle(key), 0)
+
+    @override_settings(REPORT_RATE_LIMIT=0)
+    def test_zero_limit_disables_throttling(self):
+        key = intake.client_key(self.request())
+        self.assertEqual({intake.throttle(key) for _ in range(10)}, {0})
+
+    @override_settings(TRUSTED_PROXY_COUNT=0)
+    def test_client_key_ignores_forwarded_for_without_trusted_proxies(self):
+        spoofed = intake.client_key(self.request(forwarded="203.0.113.1"))
+        self.assertEqual(spoofed, intake.client_key(self.request()))
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_client_key_uses_the_address_our_proxy_saw(self):
+        direct = intake.client_key(self.request("10.0.0.1", forwarded="203.0.113.1"))
+        spoofed = intake.client_key(self.request("10.0.0.1", forwarded="192.0.2.99, 203.0.113.1"))
+        self.assertEqual(direct, spoofed)
+        self.assertNotEqual(direct, intake.client_key(self.request("10.0.0.1", forwarded="203.0.113.2")))
+
+
+class ReportIntakeFormTests(SimpleTestCase):
+    def form(self, photo):
+        return ReportIntakeForm({"report_type": "issue", "description": "Pipe burst"}, {"photo": photo})
+
+    def test_accepts_image_signatures(self):
+        for name, head in (("a.jpg", b"\xff\xd8\xff\xe0"), ("a.png", b"\x89PNG\r\n\x1a\n"),
+                           ("a.webp", b"RIFF\x00\x00\x00\x00WEBP")):
+            self.assertTrue(self.form(SimpleUploadedFile(name, head + b"0" * 64)).is_valid(), name)
+
+    def test_rejects_other_files(self):
+        form = self.form(SimpleUploadedFile("a.jpg", b"%PDF-1.7" + b"0" * 64))
+        self.assertIn("photo", form.errors)
+
+    @override_settings(REPORT_MAX_PHOTO_MB=1)
+    def test_rejects_photos_over_the_limit(self):
+        form = self.form(SimpleUploadedFile("a.jpg", b"\xff\xd8\xff\xe0" + b"0" * (1024 * 1024)))
+        self.assertIn("photo", form.errors)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, REPORT_RATE_LIMIT=2)
+class ReportIntakeViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = make_project()
+        # Apps send no CSRF token; the endpoint must not need one
+        self.client = Client(enforce_csrf_checks=True)
+
+    def submit(self, **data):
+        return self.client.post(
+            reverse("report_intake", args=[self.project.pk]),
+            {"report_type": "issue", "description": "Pipe burst", **data},
+        )
+
+    def test_accepts_and_queues_without_csrf_token(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.submit()
+        self.assertEqual(response.status_code, 202)
+        report = CitizenReport.objects.get(pk=response.json()["id"])
+        self.assertEqual(report.project, self.project)
+        self.assertTrue(report.client_key)
+        self.assertIsNone(report.processed_at)
+        self.assertTrue(BackgroundJob.objects.filter(kind="citizen_report_intake", payload__pk=report.pk).exists())
+
+    def test_throttles_with_retry_after(self):
+        self.assertEqual([self.submit().status_code for _ in range(2)], [202, 202])
+        response = self.submit()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+    def test_invalid_report(self):
+        response = self.submit(report_type="praise")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("report_type", response.json()["errors"])
+
+    def test_unknown_project(self):
+        response = self.client.post(reverse("report_intake", args=[self.project.pk + 1000]), {})
+        self.assertEqual(response.status_code, 404)
+
+
+class FacetForNamesTests(SimpleTestCase):
+    def test_boundary_spellings_get_lookup_counts(self):
+        values = {"Muranga": {"count": 2, "budget": 1.5}, "Tharaka Nithi": {"count": 1, "budget": 4.0}}
+        self.assertEqual(
+            facet_for_names(values, ["Murang'a", "Tharaka-Nithi", "Kitui"]),
+            {"Murang'a": {"count": 2, "budget": 1.5}, "Tharaka-Nithi": {"count": 1, "budget": 4.0}},
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class FacetFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Kenyawards.objects.create(
+            county="Kitui", subcounty="Kitui Central", ward="Township", geom=square(38.0, -1.0, 0.05)
+        )
+        make_project(name="Borehole", location=Point(38.0, -1.0, srid=4326))
+        make_project(name="Clinic", sector="Health", location=Point(38.3, -1.0, srid=4326))
+        make_project(name="Dam", county="Machakos")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_facets_match_the_listed_projects(self):
+        for params in ({"county": "kit"}, {"county": "KITUI", "sector": "heal"}, {"sector": "a"}):
+            request = RequestFactory().get(reverse("project_list"), params)
+            view = ProjectListView()
+            view.setup(request)
+            facets = facet_counts(filter_spec_from_request(request), search=True)
+            self.assertEqual(facets["total"]["count"], view.get_queryset().count(), params)
+
+    def test_partial_county_counts_sectors_within_it(self):
+        facets = facet_counts({"county": ["kit"]}, search=True)
+        self.assertEqual({name: value["count"] for name, value in facets["sector"].items()}, {"Water": 1, "Health": 1})
+        self.assertEqual(facet_counts({"county": ["kit"]})["total"]["count"], 0)
+
+    def test_boundary_filters_narrow_every_facet(self):
+        facets = facet_counts({"ward": ["Township"]})
+        self.assertEqual(facets["total"]["count"], 1)
+        self.assertEqual(list(facets["sector"]), ["Water"])
+        self.assertEqual(facet_counts({"ward": ["Nowhere"]})["total"]["count"], 3)
+
+
+
+def csv_row(project_id, **columns):
+    """A CSV dict row as ``csv.DictReader`` yields it."""
+    row = {
+        "Project ID": project_id,
+        "Project Name": f"Project {project_id}",
+        "Sector": "Water",
+        "Status": "Ongoing",
+        "County": "Kitui",
+        "Start Date": "01/07/2024",
+        "End Date": "30/06/2025",
+        "Budget (KES)": "1,500,000",
+        "Latitude": "-1.3667",
+        "Longitude": "38.0106",
+    }
+    row.update(columns)
+    return row
+
+
+class ImportHashTests(SimpleTestCase):
+    def digest(self, **columns):
+        return parse_project_row(csv_row("KT-1", **columns))[1]["import_hash"]
+
+    def test_formatting_differences_keep_the_hash(self):
+        self.assertEqual(self.digest(), self.digest(**{"Budget (KES)": "1500000.00", "Sector": " Water "}))
+        self.assertEqual(self.digest(), self.digest(**{"Start Date": "2024-07-01", "Latitude": "-1.36670"}))
+
+    def test_edits_change_the_hash(self):
+        self.assertNotEqual(self.digest(), self.digest(**{"Budget (KES)": "1,600,000"}))
+        self.assertNotEqual(self.digest(), self.digest(Status="Completed"))
+        self.assertNotEqual(self.digest(), self.digest(Latitude="", Longitude=""))
+
+    def test_missing_start_date_is_hashed_as_missing(self):
+        # The stored start date defaults to today; the hash must not follow it
+        _, defaults = parse_project_row(csv_row("KT-1", **{"Start Date": ""}))
+        values = {**defaults, "start_date": None, "end_date": date(2025, 6, 30)}
+        self.assertEqual(defaults["import_hash"], content_hash(values))
+
+    def test_invalid_rows(self):
+        for columns in ({"Project ID": " "}, {"Budget (KES)": "12x"}, {"Start Date": "July"}, {"Latitude": "north"}):
+            with self.assertRaises(RowError):
+                parse_project_row(csv_row("KT-1", **columns))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ImportProjectsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def rows(self, count=5, **edits):
+        return [csv_row(f"KT-{i}", **edits.get(f"KT-{i}", {})) for i in range(count)]
+
+    def test_first_import_creates_in_batches(self):
+        progress = []
+        stats = import_projects(self.rows(), batch_size=2, on_progress=lambda s: progress.append(s["processed"]))
+        self.assertEqual((stats["created"], stats["updated"], stats["unchanged"]), (5, 0, 0))
+        self.assertEqual(progress, [2, 4, 5])
+        project = Project.objects.get(project_id="KT-0")
+        self.assertEqual(project.budget, Decimal("1500000.00"))
+        self.assertEqual(project.status, "ongoing")
+        self.assertEqual(project.sector_ref.name, "Water")
+        self.assertEqual(project.county_ref.name, "Kitui")
+        self.assertTrue(project.import_hash)
+
+    def test_reimport_writes_only_changed_rows(self):
+        import_projects(self.rows(), batch_size=2)
+        before = dict(Project.objects.values_list("project_id", "updated_at"))
+
+        stats = import_projects(self.rows(**{"KT-3": {"Budget (KES)": "2,000,000"}}), batch_size=2)
+        self.assertEqual((stats["created"], stats["updated"], stats["unchanged"]), (0, 1, 4))
+        after = dict(Project.objects.values_list("project_id", "updated_at"))
+        self.assertEqual([pid for pid in after if after[pid] != before[pid]], ["KT-3"])
+        self.assertEqual(Project.objects.get(project_id="KT-3").budget, Decimal("2000000.00"))
+
+    def test_dry_run_counts_without_writing(self):
+        import_projects(self.rows(3))
+        stats = import_projects(self.rows(4, **{"KT-0": {"Status": "Completed"}}), dry_run=True)
+        self.assertEqual((stats["created"], stats["updated"], stats["unchanged"]), (1, 1, 2))
+        self.assertEqual(Project.objects.count(), 3)
+        self.assertEqual(Project.objects.get(project_id="KT-0").status, "ongoing")
+
+    def test_rejects_bad_rows_and_reports_missing_projects(self):
+        import_projects(self.rows(3))
+        rejected = []
+        rows = [csv_row("KT-0"), csv_row("KT-9", **{"Budget (KES)": "12x"}), csv_row("KT-1"), csv_row("")]
+        stats = import_projects(rows, on_reject=lambda line, row, message: rejected.append((line, message)))
+        self.assertEqual(stats["failed"], 2)
+        self.assertEqual(stats["errors"], {"Invalid budget": 1, "Missing Project ID": 1})
+        self.assertEqual([line for line, _ in rejected], [3, 5])
+        self.assertEqual(stats["missing"], 1)
+        self.assertFalse(Project.objects.filter(project_id="KT-9").exists())
+
+    def test_later_duplicate_replaces_earlier_row(self):
+        stats = import_projects([csv_row("KT-0"), csv_row("KT-0", **{"Project Name": "Renamed"})])
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(Project.objects.get(project_id="KT-0").name, "Renamed")
+
+    @skipUnless(connection.vendor == "postgresql", "SQLite does not enforce varchar lengths")
+    def test_failed_batch_falls_back_to_single_rows(self):
+        rejected = []
+        rows = self.rows(3, **{"KT-1": {"Project Name": "x" * 300}})
+        stats = import_projects(rows, on_reject=lambda line, row, message: rejected.append(line))
+        self.assertEqual((stats["created"], stats["failed"]), (2, 1))
+        self.assertEqual(rejected, [3])
+        self.assertEqual(
+            sorted(Project.objects.values_list("project_id", flat=True)), ["KT-0", "KT-2"]
+        )
+
+
+class ColumnarPayloadTests(SimpleTestCase):
+    rows = [
+        (7, 38.0106, -1.3667, Decimal("1500000.00"), "ongoing", "Water", "Kitui", "Borehole"),
+        (9, 37.6, -0.5, None, "completed", None, "Embu", "Daraja la Mto – phase 2"),
+        (12, 38.1, -1.4, Decimal("250.50"), "ongoing", "Water", "Kitui", ""),
+    ]
+
+    def test_round_trip(self):
+        header, arrays = columnar.decode(columnar.rows_payload(self.rows))
+        self.assertEqual(header["count"], 3)
+        self.assertEqual(arrays["id"].tolist(), [7, 9, 12])
+        self.assertEqual(arrays["lon"].dtype.name, "float32")
+        self.assertAlmostEqual(float(arrays["lat"][0]), -1.3667, places=5)
+        self.assertEqual(arrays["budget"].tolist(), [1500000.0, 0.0, 250.5])
+
+        def values(name):
+            return [header["dictionaries"][name][code] for code in arrays[name]]
+
+        self.assertEqual(values("status"), ["ongoing", "completed", "ongoing"])
+        self.assertEqual(values("sector"), ["Water", "", "Water"])
+        self.assertEqual(values("county"), ["Kitui", "Embu", "Kitui"])
+        offsets = arrays["name_offsets"]
+        names = [
+            arrays["name"][offsets[i]:offsets[i + 1]].tobytes().decode("utf-8") for i in range(3)
+        ]
+        self.assertEqual(names, [row[7] for row in self.rows])
+
+    def test_columns_are_aligned_for_typed_arrays(self):
+        blob = columnar.rows_payload(self.rows)
+        header, _ = columnar.decode(blob)
+        (header_length,) = struct.unpack_from("<I", blob, 4)
+        self.assertEqual((8 + header_length) % 8, 0)
+        for col in header["columns"].values():
+            self.assertEqual(col["offset"] % 8, 0)
+
+    def test_float64_keeps_full_precision(self):
+        _, arrays = columnar.decode(columnar.rows_payload(self.rows, precision=64))
+        self.assertEqual(arrays["lon"][0], 38.0106)
+
+    def test_empty_and_invalid_payloads(self):
+        header, arrays = columnar.decode(columnar.rows_payload([]))
+        self.assertEqual(header["count"], 0)
+        self.assertEqual(arrays["name_offsets"].tolist(), [0])
+        with self.assertRaises(ValueError):
+            columnar.decode(b"JSON" + columnar.rows_payload(self.rows)[4:])
+
+
+class ColumnarRowsTests(TestCase):
+    def test_rows_match_the_geojson_projects(self):
+        located = make_project(name="Located", location=Point(38.0, -1.0, srid=4326))
+        coordinates_only = make_project(name="Coordinates", latitude=Decimal("-1.2"), longitude=Decimal("38.3"))
+        make_project(name="Unmapped")
+
+        rows = columnar.project_rows(Project.objects.all())
+        self.assertEqual([row[0] for row in rows], [located.pk, coordinates_only.pk])
+        self.assertAlmostEqual(rows[1][1], 38.3)
+        self.assertAlmostEqual(rows[1][2], -1.2)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class WardCoverageSchedulingTests(TestCase):
+    def pending(self):
+        return BackgroundJob.objects.filter(kind="ward_coverage", status="pending").count()
+
+    def test_project_changes_queue_one_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = make_project(location=Point(38.0, -1.0, srid=4326))
+            make_project(name="Dam")
+        self.assertEqual(self.pending(), 1)
+
+        BackgroundJob.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertEqual(self.pending(), 1)
+
+    def test_unrelated_field_updates_do_not_queue(self):
+        project = make_project()
+        BackgroundJob.objects.all().delete()
+        project.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save(update_fields=["name"])
+        self.assertEqual(self.pending(), 0)
+
+        project.status = "completed"
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save(update_fields=["status"])
+        self.assertEqual(self.pending(), 1)
+
+
+class ClassificationBreaksTests(SimpleTestCase):
+    def test_jenks_separates_obvious_clusters(self):
+        values = [1, 2, 3, 10, 11, 12, 50, 51, 52]
+        self.assertEqual(classification.jenks_breaks(values, 3), [1.0, 3.0, 12.0, 52.0])
+
+    def test_jenks_matches_exhaustive_search(self):
+        def variance_sum(values, breaks):
+            classes = classification.assign_classes(np.asarray(values), breaks)
+            return sum(np.var(values[classes == c]) * np.sum(classes == c) for c in set(classes))
+
+        rng = np.random.default_rng(7)
+        for k in (2, 3, 4):
+            values = np.sort(rng.lognormal(10, 1, 12).round(2))
+            breaks = classification.jenks_breaks(values, k)
+            best = min(
+                variance_sum(values, [values[0], *(values[i - 1] for i in cuts), values[-1]])
+                for cuts in combinations(range(1, len(values)), k - 1)
+            )
+            self.assertAlmostEqual(variance_sum(values, breaks), best)
+
+    def test_jenks_with_few_distinct_values(self):
+        self.assertEqual(classification.jenks_breaks([5, 5, 7, 7], 3), [5.0, 5.0, 7.0])
+
+    def test_jenks_subsample_keeps_the_extremes(self):
+        values = np.random.default_rng(1).lognormal(10, 1, classification.JENKS_MAX_VALUES * 2)
+        breaks = classification.jenks_breaks(values, 5)
+        self.assertEqual(len(breaks), 6)
+        self.assertEqual(breaks, sorted(breaks))
+        self.assertEqual((breaks[0], breaks[-1]), (values.min(), values.max()))
+
+    def test_quantile_and_equal_interval_breaks(self):
+        self.assertEqual(classification.quantile_breaks(range(1, 9), 4), [1.0, 2.75, 4.5, 6.25, 8.0])
+        self.assertEqual(classification.equal_interval_breaks([0, 10], 5), [0.0, 2.0, 4.0, 6.0, 8.0, 10.0])
+
+    def test_assign_classes_puts_upper_edges_in_the_lower_class(self):
+        classes = classification.assign_classes(np.array([0, 10, 10.5, 30]), [0, 10, 20, 30])
+        self.assertEqual(classes.tolist(), [0, 0, 1, 2])
+        self.assertEqual(classification.assign_classes(np.array([3, 4]), [3]).tolist(), [0, 0])
+
+
+class TimelineSweepTests(SimpleTestCase):
+    def test_week_edges_start_on_monday(self):
+        edges = timeline._edges(date(2024, 7, 4), date(2024, 7, 10), "week")
+        self.assertEqual(edges.tolist(), [date(2024, 7, 1), date(2024, 7, 8), date(2024, 7, 15)])
+
+    def test_month_edges_cover_the_last_day(self):
+        edges = timeline._edges(date(2024, 1, 15), date(2024, 3, 31), "month")
+        self.assertEqual(edges[0].item(), date(2024, 1, 1))
+        self.assertEqual(edges[-1].item(), date(2024, 4, 1))
+
+    def test_auto_interval_is_the_finest_under_the_limit(self):
+        start = date(2024, 1, 1)
+        self.assertEqual(timeline.auto_interval(start, start + timedelta(days=30)), "day")
+        self.assertEqual(timeline.auto_interval(start, start + timedelta(days=365)), "week")
+        self.assertEqual(timeline.auto_interval(start, start + timedelta(days=3650)), "month")
+
+    def test_sweep_matches_counting_each_bucket(self):
+        rng = np.random.default_rng(3)
+        starts = np.datetime64("2024-01-01") + rng.integers(0, 200, 300).astype("timedelta64[D]")
+        ends = starts + rng.integers(0, 90, 300).astype("timedelta64[D]")
+        budgets = rng.uniform(1, 100, 300).round(2)
+        edges = timeline._edges(starts.min().item(), ends.max().item(), "week")
+
+        active, active_budget, started, ended = timeline.sweep_buckets(starts, ends, budgets, edges)
+        for b, (low, high) in enumerate(zip(edges[:-1], edges[1:])):
+            overlaps = (starts < high) & (ends >= low)
+            self.assertEqual(active[b], overlaps.sum())
+            self.assertAlmostEqual(active_budget[b], budgets[overlaps].sum())
+            self.assertEqual(started[b], ((starts >= low) & (starts < high)).sum())
+            self.assertEqual(ended[b], ((ends >= low) & (ends < high)).sum())
+        self.assertEqual((started.sum(), ended.sum()), (300, 300))
+
+    def test_single_day_span_is_active_in_its_bucket_only(self):
+        day = np.array(["2024-07-03"], dtype="datetime64[D]")
+        edges = timeline._edges(date(2024, 7, 1), date(2024, 7, 5), "day")
+        active, _, started, ended = timeline.sweep_buckets(day, day, np.array([5.0]), edges)
+        self.assertEqual(active.tolist(), [0, 0, 1, 0, 0])
+        self.assertEqual(started.tolist(), ended.tolist())
+
+
+class HotSpotAnalyticsTests(SimpleTestCase):
+    x = np.array([0.0, 1000.0, 5000.0])
+    y = np.array([0.0, 0.0, 3000.0])
+    weights = np.array([1e6, 2e6, 5e5])
+
+    def test_density_integrates_to_the_total_weight(self):
+        density, (minx, miny, maxx, maxy), cell = analytics.kernel_density(self.x, self.y, self.weights, 800, 100)
+        self.assertEqual(density.shape, (round((maxy - miny) / cell), round((maxx - minx) / cell)))
+        # The grid is padded by three bandwidths, which holds all but ~0.5% of each kernel
+        self.assertAlmostEqual((density * cell ** 2).sum() / self.weights.sum(), 1, delta=0.01)
+
+    def test_density_rows_run_north_to_south(self):
+        density, (minx, _, _, maxy), cell = analytics.kernel_density(self.x, self.y, self.weights, 800, 100)
+        row, col = np.unravel_index(density.argmax(), density.shape)
+        peak = (minx + (col + 0.5) * cell, maxy - (row + 0.5) * cell)
+        self.assertLess(np.hypot(peak[0] - 1000, peak[1]), 800)
+
+    def test_density_is_independent_of_the_chunk_size(self):
+        whole, *_ = analytics.kernel_density(self.x, self.y, self.weights, 800, 100)
+        with mock.patch.object(analytics, "KDE_CHUNK", 2):
+            chunked, *_ = analytics.kernel_density(self.x, self.y, self.weights, 800, 100)
+        np.testing.assert_allclose(chunked, whole)
+
+    def test_grid_is_capped(self):
+        density, _, cell = analytics.kernel_density(self.x * 100, self.y * 100, self.weights, 800, 100)
+        self.assertLessEqual(max(density.shape), analytics.MAX_GRID_CELLS)
+        self.assertGreater(cell, 100)
+
+    def test_gi_star_finds_the_high_value_corner(self):
+        grid = np.arange(5) * 1000.0
+        x, y = (axis.ravel() for axis in np.meshgrid(grid, grid))
+        values = np.where((x < 2000) & (y < 2000), 100.0, 1.0)
+
+        z, p, band = analytics.getis_ord_gi_star(values, x, y)
+        self.assertEqual(band, 1000.0)
+        self.assertEqual(analytics.classify_gi(z[0]), "hot_99")
+        self.assertLess(p[0], 0.01)
+        self.assertTrue((z[values == 1.0] < 1).all())
+        np.testing.assert_allclose(p, [math.erfc(abs(v) / math.sqrt(2)) for v in z])
+
+    def test_gi_star_of_constant_values_is_zero(self):
+        z, p, _ = analytics.getis_ord_gi_star(np.full(4, 7.0), np.arange(4.0), np.zeros(4))
+        self.assertEqual(z.tolist(), [0.0] * 4)
+        self.assertEqual(p.tolist(), [1.0] * 4)
+
+    def test_classify_gi_thresholds(self):
+        classes = [analytics.classify_gi(z) for z in (2.6, 2.0, 1.7, 0.0, -1.7, -2.0, -2.6)]
+        self.assertEqual(
+            classes, ["hot_99", "hot_95", "hot_90", "not_significant", "cold_90", "cold_95", "cold_99"]
+        )
+
+
+class BudgetDistributionTests(SimpleTestCase):
+    def test_segment_quantiles_match_numpy(self):
+        rng = np.random.default_rng(5)
+        groups = [np.sort(rng.lognormal(12, 1, n)) for n in (1, 2, 7, 40)]
+        counts = np.array([len(g) for g in groups])
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        result = analytics.segment_quantiles(np.concatenate(groups), starts, counts, analytics.BUDGET_QUANTILES)
+        for row, values in zip(result, groups):
+            np.testing.assert_allclose(row, np.quantile(values, analytics.BUDGET_QUANTILES))
+
+    def test_groups_are_summarised_together(self):
+        budgets = np.array([300.0, 10.0, 20.0, 1000.0, 30.0, 2000.0])
+        groups = np.array([1, 2, 2, 1, 2, 1])
+        result = analytics.budget_distribution(budgets, groups, bins=4)
+
+        self.assertEqual(result["codes"].tolist(), [1, 2])
+        self.assertEqual(result["counts"].tolist(), [3, 3])
+        self.assertEqual(result["totals"].tolist(), [3300.0, 60.0])
+        self.assertEqual(result["quantiles"][:, 4].tolist(), [1000.0, 20.0])
+        # ``order`` maps the sorted rows back to the inputs
+        self.assertEqual(budgets[result["order"]].tolist(), [300.0, 1000.0, 2000.0, 10.0, 20.0, 30.0])
+        self.assertEqual(result["histograms"].sum(axis=1).tolist(), [3, 3])
+        self.assertAlmostEqual(result["bin_edges"][0], 10.0)
+        self.assertAlmostEqual(result["bin_edges"][-1], 2000.0)
+
+    def test_outliers_are_judged_on_the_log_scale(self):
+        budgets = np.array([1e6, 1.1e6, 0.9e6, 1.05e6, 0.95e6, 1.02e6, 5e9])
+        result = analytics.budget_distribution(budgets, np.zeros(len(budgets), dtype=np.int64))
+        flagged = budgets[result["order"]][result["iqr_outlier"] & result["mad_outlier"]]
+        self.assertEqual(flagged.tolist(), [5e9])
+
+    def test_identical_budgets_have_no_outliers(self):
+        result = analytics.budget_distribution(np.full(5, 1e6), np.zeros(5, dtype=np.int64), bins=3)
+        self.assertEqual(result["mad"].tolist(), [0.0])
+        self.assertFalse(result["iqr_outlier"].any() or result["mad_outlier"].any())
+        self.assertEqual(result["histograms"].tolist(), [[5, 0, 0]])
+
+
+class ProjectTileDigestTests(SimpleTestCase):
+    updated = timezone.make_aware(timezone.datetime(2025, 1, 1))
+
+    def digests(self, rows, min_zoom=0, max_zoom=6):
+        with mock.patch.object(tiles.Project.objects, "filter") as projects:
+            projects.return_value.annotate.return_value.order_by.return_value.values_list.return_value = rows
+            return tiles.project_tile_digests(min_zoom, max_zoom)
+
+    def test_one_tile_per_zoom_away_from_edges(self):
+        # The centre of zoom-4 tile (9, 7) is at least 1/16 of a tile from every coarser edge
+        lon, lat = 33.75, math.degrees(math.atan(math.sinh(math.pi / 16)))
+        digests = self.digests([(1, self.updated, 0, lon, lat)], 0, 4)
+        self.assertEqual(set(digests), {(zoom, 9 >> (4 - zoom), 7 >> (4 - zoom)) for zoom in range(5)})
+        self.assertTrue(all(digest.startswith("1:") for digest in digests.values()))
+
+    def test_point_in_the_buffer_is_drawn_in_every_touching_tile(self):
+        digests = self.digests([(1, self.updated, 0, 0.0, 0.0)], 1, 1)
+        self.assertEqual(set(digests), {(1, 0, 0), (1, 0, 1), (1, 1, 0), (1, 1, 1)})
+
+    def test_digest_ignores_order_and_counts_projects(self):
+        rows = [(pk, self.updated, 10, 36.8 + pk / 1000, -1.3) for pk in range(1, 6)]
+        digests = self.digests(rows)
+        self.assertEqual(self.digests(rows[::-1]), digests)
+        self.assertEqual(digests[(0, 0, 0)].split(":")[0], "5")
+        self.assertNotEqual(self.digests(rows[:4])[(0, 0, 0)], digests[(0, 0, 0)])
+
+    def test_progress_changes_the_digest(self):
+        before = self.digests([(1, self.updated, 10, 36.82, -1.29), (2, self.updated, 0, -70.0, 40.0)])
+        after = self.digests([(1, self.updated, 60, 36.82, -1.29), (2, self.updated, 0, -70.0, 40.0)])
+        changed = {tile for tile in before if before[tile] != after[tile]}
+        self.assertEqual(changed, {tile for tile in before if tile[0] == 0 or tile[1] >= 2 ** tile[0] // 2})
+
+    def test_no_located_projects(self):
+        self.assertEqual(self.digests([]), {})
+
+
+class LoadTestHarnessTests(SimpleTestCase):
+    options = {"only": None, "mix": []}
+
+    def test_percentiles(self):
+        report = load_test._percentiles(list(range(1, 101)))
+        self.assertEqual(report["p50_ms"], 50.5)
+        self.assertEqual(report["p99_ms"], 99.01)
+        self.assertEqual((report["mean_ms"], report["max_ms"]), (50.5, 100))
+        self.assertEqual(load_test._percentiles([]), {})
+
+    def test_mix_overrides_and_disables_scenarios(self):
+        weights = load_test.Command()._weights({**self.options, "mix": ["home=2.5", "dashboard=0"]})
+        self.assertEqual(weights["home"], 2.5)
+        self.assertNotIn("dashboard", weights)
+        self.assertEqual(len(weights), len(load_test.SCENARIOS) - 1)
+
+        weights = load_test.Command()._weights({**self.options, "only": ["classes"], "mix": ["home=1"]})
+        self.assertEqual(weights, {"classes": 3, "home": 1.0})
+
+    def test_bad_mix_is_rejected(self):
+        command = load_test.Command()
+        for mix in (["nope=1"], ["home=x"], [f"{name}=0" for name in load_test.SCENARIOS]):
+            with self.subTest(mix=mix), self.assertRaises(CommandError):
+                command._weights({**self.options, "mix": mix})
+
+    def test_every_scenario_builds_a_request(self):
+        options = {
+            "fiscal_years": ["2024/2025"], "sectors": ["Water"],
+            "project_counties": ["Kitui"], "counties": ["Kitui"],
+        }
+        command = load_test.Command()
+        command.filter_choices = options
+        command.fetch = mock.Mock(return_value=(200, 42))
+        rng = random.Random(0)
+        for name, (_, url_name, _) in load_test.SCENARIOS.items():
+            latency, status, size = command._request(name, rng)
+            self.assertEqual((status, size), (200, 42))
+            self.assertEqual(command.fetch.call_args.args[0], reverse(url_name))
+        # An unreachable target counts as an error, not a crash
+        command.fetch.side_effect = OSError
+        self.assertEqual(command._request("home", rng)[1:], (0, 0))
+
+    def test_report_splits_errors_by_scenario(self):
+        samples = [("home", 10.0, 200, 100), ("home", 30.0, 500, 50), ("classes", 5.0, 304, 0)]
+        with mock.patch.object(load_test, "_git_revision", return_value="abc123"):
+            report = load_test.Command()._report(samples, 2.0, "in-process WSGI", 2, {"home": 1, "classes": 1})
+        self.assertEqual(report["total"]["requests"], 3)
+        self.assertEqual(report["total"]["throughput_rps"], 1.5)
+        self.assertEqual(report["endpoints"]["home"]["errors"], 1)
+        self.assertEqual(report["endpoints"]["home"]["error_rate"], 0.5)
+        self.assertEqual(report["endpoints"]["home"]["mean_bytes"], 75)
+        self.assertEqual(report["endpoints"]["classes"]["errors"], 0)
+        self.assertEqual(report["git_revision"], "abc123")
+
+
+class ProjectProjectionTests(SimpleTestCase):
+    """The ``for_list``/``for_map`` projections, checked on the compiled query."""
+
+    def selected(self, queryset):
+        compiler = queryset.query.get_compiler("default")
+        compiler.setup_query()
+        columns = {expression.target.column for expression, _, _ in compiler.select if isinstance(expression, Col)}
+        return columns, set(compiler.annotation_col_map)
+
+    def test_full_instances_leave_out_only_the_projection(self):
+        columns, _ = self.selected(Project.objects.all())
+        self.assertIn("description", columns)
+        self.assertIn("location", columns)
+        self.assertNotIn("location_utm", columns)
+
+    def test_list_reads_a_description_preview(self):
+        columns, annotations = self.selected(Project.objects.for_list())
+        self.assertEqual(columns, set(ProjectQuerySet.LIST_FIELDS))
+        self.assertEqual(annotations, {"description_preview"})
+        _, params = Project.objects.for_list().query.sql_with_params()
+        self.assertEqual(params, (1, ProjectQuerySet.LIST_DESCRIPTION_CHARS))
+
+    def test_map_extracts_coordinates_in_sql(self):
+        columns, annotations = self.selected(Project.objects.for_map("progress"))
+        self.assertEqual(columns, {*ProjectQuerySet.MAP_FIELDS, "progress"})
+        self.assertEqual(annotations, {"lon", "lat"})
+        sql, _ = Project.objects.for_map().query.sql_with_params()
+        # Projects placed only by the longitude/latitude columns still get a point
+        self.assertIn("COALESCE", sql)
+        self.assertIn('"longitude"', sql)
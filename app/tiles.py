@@ -0,0 +1,235 @@
+"""
+Offline vector tiles (MBTiles) for field officers without connectivity.
+
+Tiles are Mapbox Vector Tiles rendered by PostGIS (``ST_AsMVT``). There is
+one layer per admin level plus a ``projects`` point layer. They are written
+gzip-compressed into an MBTiles file: SQLite with the standard ``metadata``
+and ``tiles`` tables, with rows in TMS order.
+
+To regenerate incrementally, the file also keeps a ``tile_digests`` table
+that map viewers ignore. A tile's digest combines the id, ``updated_at``
+and ``progress`` of the projects drawn in it, including the tile buffer.
+Only tiles whose digest has changed are rendered again. Boundaries are static
+and need ``--full`` after a reload.
+"""
+import gzip
+import hashlib
+import json
+import math
+import sqlite3
+from functools import lru_cache
+
+import numpy as np
+from django.db import connection
+
+from .geo import PointX, PointY
+from .models import KenyaCounty, KenyaSubCounty, Kenyawards, Project
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+MAX_LATITUDE = 85.0511287798
+EMPTY_DIGEST = "0:0000000000000000"
+
+# layer -> (model, attribute columns, min zoom); finer boundaries only appear
+# once they are more than a few pixels across.
+BOUNDARY_LAYERS = {
+    "counties": (KenyaCounty, ("county",), 0),
+    "subcounties": (KenyaSubCounty, ("county", "subcounty"), 7),
+    "wards": (Kenyawards, ("county", "subcounty", "ward"), 9),
+}
+PROJECT_FIELDS = ("name", "status", "sector", "county", "progress")
+
+
+def tile_xy(lon, lat, zoom):
+    """Fractional XYZ tile coordinates of ``lon``/``lat`` arrays at ``zoom``."""
+    n = 2 ** zoom
+    lat = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    x = (np.asarray(lon) + 180.0) / 360.0 * n
+    y = (1.0 - np.arcsinh(np.tan(lat)) / math.pi) / 2.0 * n
+    return x, y
+
+
+def tiles_for_bounds(bounds, min_zoom, max_zoom):
+    """Every ``(z, x, y)`` tile touching ``(west, south, east, north)``."""
+    west, south, east, north = bounds
+    for zoom in range(min_zoom, max_zoom + 1):
+        n = 2 ** zoom
+        (x0, x1), (y1, y0) = tile_xy(np.array([west, east]), np.array([south, north]), zoom)
+        for x in range(max(int(x0), 0), min(int(x1), n - 1) + 1):
+            for y in range(max(int(y0), 0), min(int(y1), n - 1) + 1):
+                yield zoom, x, y
+
+
+def project_tile_digests(min_zoom, max_zoom):
+    """
+    ``{(z, x, y): digest}`` for the tiles that draw at least one project.
+
+    One query reads every project's id, ``updated_at``, ``progress`` and
+    coordinates; the tiles each point falls in (buffer included) are then
+    worked out per zoom with NumPy. ``progress`` is hashed as well because
+    ``refresh_project_progress`` changes it without touching ``updated_at``. A digest is the project count plus the XOR of per-project
+    64-bit hashes, so it does not depend on order.
+    """
+    rows = list(
+        Project.objects.filter(location__isnull=False)
+        .annotate(lon=PointX("location"), lat=PointY("location"))
+        .order_by()
+        .values_list("id", "updated_at", "progress", "lon", "lat")
+    )
+    if not rows:
+        return {}
+    hashes = np.array([
+        int.from_bytes(
+            hashlib.blake2b(f"{pk}:{updated.isoformat()}:{progress}".encode(), digest_size=8).digest(), "big"
+        )
+        for pk, updated, progress, _, _ in rows
+    ], dtype=np.uint64)
+    lon = np.array([r[3] for r in rows], dtype=np.float64)
+    lat = np.array([r[4] for r in rows], dtype=np.float64)
+    margin = TILE_BUFFER / TILE_EXTENT
+
+    digests = {}
+    for zoom in range(min_zoom, max_zoom + 1):
+        n = 2 ** zoom
+        fx, fy = tile_xy(lon, lat, zoom)
+        # A point within the buffer of a tile edge is drawn in both tiles
+        candidates = [
+            (np.floor(fx + dx), np.floor(fy + dy))
+            for dx in (-margin, margin) for dy in (-margin, margin)
+        ]
+        xs = np.clip(np.concatenate([c[0] for c in candidates]), 0, n - 1).astype(np.int64)
+        ys = np.clip(np.concatenate([c[1] for c in candidates]), 0, n - 1).astype(np.int64)
+        owner = np.tile(np.arange(len(rows)), len(candidates))
+        pairs = np.unique(np.stack([xs * n + ys, owner], axis=1), axis=0)
+
+        keys, starts, counts = np.unique(pairs[:, 0], return_index=True, return_counts=True)
+        combined = np.bitwise_xor.reduceat(hashes[pairs[:, 1]], starts)
+        for key, count, value in zip(keys.tolist(), counts.tolist(), combined.tolist()):
+            digests[(zoom, key // n, key % n)] = f"{count}:{value:016x}"
+    return digests
+
+
+@lru_cache(maxsize=1)
+def _tile_sql():
+    """One statement returning every layer of tile ``(z, x, y)`` concatenated."""
+    q = connection.ops.quote_name
+    envelope = "ST_TileEnvelope(%(z)s, %(x)s, %(y)s)"
+    mvt_geom = f"ST_AsMVTGeom(ST_Transform({{geom}}, 3857), {envelope}, {TILE_EXTENT}, {TILE_BUFFER}, true)"
+    # Index filter: the tile plus its buffer, in the columns' own SRS
+    search = (
+        f"ST_Transform(ST_Expand({envelope}, "
+        f"(ST_XMax({envelope}) - ST_XMin({envelope})) * {TILE_BUFFER / TILE_EXTENT}), 4326)"
+    )
+
+    layers = []
+    for name, (model, columns, min_zoom) in BOUNDARY_LAYERS.items():
+        table = q(model._meta.db_table)
+        attributes = ", ".join(q(c) for c in columns)
+        layers.append(
+            f"CASE WHEN %(z)s >= {min_zoom} THEN ("
+            f"SELECT ST_AsMVT(t, '{name}', {TILE_EXTENT}, 'geom') FROM ("
+            f"SELECT {q('id')}, {attributes}, {mvt_geom.format(geom=q('geom'))} AS geom "
+            f"FROM {table} WHERE {q('geom')} && {search}) t) END"
+        )
+    table = q(Project._meta.db_table)
+    attributes = ", ".join(q(c) for c in PROJECT_FIELDS)
+    point = f"{q('location')}::geometry"
+    layers.append(
+        f"(SELECT ST_AsMVT(t, 'projects', {TILE_EXTENT}, 'geom') FROM ("
+        f"SELECT {q('id')}, {attributes}, {q('budget')}::float8 AS budget, "
+        f"{mvt_geom.format(geom=point)} AS geom "
+        f"FROM {table} WHERE {q('location')} && ({search})::geography) t)"
+    )
+    return "SELECT " + " || ".join(f"COALESCE({layer}, ''::bytea)" for layer in layers)
+
+
+def render_tile(zoom, x, y):
+    """Gzipped MVT bytes of one tile, or ``b""`` when it has no features."""
+    with connection.cursor() as cursor:
+        cursor.execute(_tile_sql(), {"z": zoom, "x": x, "y": y})
+        data = bytes(cursor.fetchone()[0] or b"")
+    return gzip.compress(data, compresslevel=6) if data else b""
+
+
+def vector_layers(min_zoom, max_zoom):
+    """The ``json`` metadata entry describing the layers and their fields."""
+    layers = [
+        {
+            "id": name,
+            "fields": {"id": "Number", **{c: "String" for c in columns}},
+            "minzoom": max(min_zoom, layer_min),
+            "maxzoom": max_zoom,
+        }
+        for name, (_, columns, layer_min) in BOUNDARY_LAYERS.items()
+        if layer_min <= max_zoom
+    ]
+    layers.append({
+        "id": "projects",
+        "fields": {"id": "Number", "budget": "Number", "progress": "Number",
+                   **{c: "String" for c in PROJECT_FIELDS if c != "progress"}},
+        "minzoom": min_zoom,
+        "maxzoom": max_zoom,
+    })
+    return {"vector_layers": layers}
+
+
+class MBTiles:
+    """Minimal MBTiles 1.3 writer with the ``tile_digests`` side table."""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+                PRIMARY KEY (zoom_level, tile_column, tile_row)
+            );
+            CREATE TABLE IF NOT EXISTS tile_digests (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, digest TEXT,
+                PRIMARY KEY (zoom_level, tile_column, tile_row)
+            );
+        """)
+
+    @staticmethod
+    def _tms_row(zoom, y):
+        return (2 ** zoom - 1) - y
+
+    def digests(self):
+        """``{(z, x, y): digest}`` of the tiles already in the file (XYZ rows)."""
+        return {
+            (z, x, self._tms_row(z, row)): digest
+            for z, x, row, digest in self.db.execute(
+                "SELECT zoom_level, tile_column, tile_row, digest FROM tile_digests"
+            )
+        }
+
+    def write(self, zoom, x, y, data, digest):
+        row = self._tms_row(zoom, y)
+        if data:
+            self.db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (zoom, x, row, data))
+        else:
+            self.db.execute(
+                "DELETE FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", (zoom, x, row)
+            )
+        self.db.execute("INSERT OR REPLACE INTO tile_digests VALUES (?, ?, ?, ?)", (zoom, x, row, digest))
+
+    def delete(self, tiles):
+        for zoom, x, y in tiles:
+            key = (zoom, x, self._tms_row(zoom, y))
+            for table in ("tiles", "tile_digests"):
+                self.db.execute(
+                    f"DELETE FROM {table} WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?", key
+                )
+
+    def set_metadata(self, values):
+        self.db.executemany(
+            "INSERT OR REPLACE INTO metadata VALUES (?, ?)",
+            [(name, value if isinstance(value, str) else json.dumps(value)) for name, value in values.items()],
+        )
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
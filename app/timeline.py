@@ -0,0 +1,145 @@
+"""
+Project timeline data for Gantt-style views (NumPy).
+
+A small filtered set is returned as individual ``start_date``→``end_date``
+spans. Anything larger is aggregated on the server into day, week or month
+buckets. Each bucket gets the number of projects active in it, their summed
+budget, and how many started and ended in it.
+
+The buckets come from one sweep over the sorted start and end dates. A
+project overlaps ``[edge_b, edge_b+1)`` when it starts before the bucket
+ends and ends on or after the day the bucket begins. So the active count
+is ``#(start < edge_b+1) - #(end < edge_b)``. Both terms are a
+``searchsorted`` of all the bucket edges into the sorted dates, and the
+budgets use the same positions in prefix sums.
+"""
+import numpy as np
+
+INTERVALS = ("day", "week", "month")
+# Above this many matching projects "auto" mode aggregates instead of listing spans
+MAX_SPANS = 500
+MAX_BUCKETS = 1000
+# "auto" interval: the finest one that stays under this many buckets
+AUTO_BUCKETS = 120
+
+
+def _edges(first, last, interval):
+    """Bucket edges (``datetime64[D]``) covering ``first``..``last`` inclusive."""
+    first, last = np.datetime64(first, "D"), np.datetime64(last, "D")
+    if interval == "day":
+        return np.arange(first, last + 2, dtype="datetime64[D]")
+    if interval == "week":
+        # Weeks start on Monday; 1970-01-01 was a Thursday
+        monday = first - (first.astype(np.int64) + 3) % 7
+        return np.arange(monday, last + 8, 7, dtype="datetime64[D]")
+    months = np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 2, dtype="datetime64[M]")
+    return months.astype("datetime64[D]")
+
+
+def bucket_count(first, last, interval):
+    return len(_edges(first, last, interval)) - 1
+
+
+def auto_interval(first, last):
+    """Finest interval giving at most ``AUTO_BUCKETS`` buckets."""
+    for interval in INTERVALS:
+        if bucket_count(first, last, interval) <= AUTO_BUCKETS:
+            return interval
+    return "month"
+
+
+def sweep_buckets(starts, ends, budgets, edges):
+    """
+    Per-bucket ``(active, active_budget, started, ended)`` arrays for spans
+    ``starts[i]``..``ends[i]`` (inclusive ``datetime64[D]``) and bucket
+    ``edges``.
+    """
+    order = np.argsort(starts, kind="stable")
+    sorted_starts = starts[order]
+    start_budget = np.concatenate(([0.0], np.cumsum(budgets[order])))
+    order = np.argsort(ends, kind="stable")
+    sorted_ends = ends[order]
+    end_budget = np.concatenate(([0.0], np.cumsum(budgets[order])))
+
+    started_before = np.searchsorted(sorted_starts, edges, side="left")  # start < edge
+    ended_before = np.searchsorted(sorted_ends, edges, side="left")  # end < edge
+    active = started_before[1:] - ended_before[:-1]
+    active_budget = start_budget[started_before[1:]] - end_budget[ended_before[:-1]]
+    return active, active_budget, np.diff(started_before), np.diff(ended_before)
+
+
+def timeline_buckets(projects, interval="auto", window_start=None, window_end=None):
+    """JSON-ready bucketed timeline of ``projects``, clipped to the window."""
+    rows = list(projects.order_by().values_list("start_date", "end_date", "budget"))
+    if not rows:
+        return {"mode": "buckets", "interval": interval, "project_count": 0, "buckets": {}}
+
+    starts = np.array([r[0] for r in rows], dtype="datetime64[D]")
+    ends = np.array([r[1] for r in rows], dtype="datetime64[D]")
+    # An end before the start is a data entry slip; count the start day only
+    ends = np.maximum(ends, starts)
+    budgets = np.array([float(r[2] or 0) for r in rows], dtype=np.float64)
+
+    first = window_start or starts.min().item()
+    last = window_end or ends.max().item()
+    if interval == "auto":
+        interval = auto_interval(first, last)
+    edges = _edges(first, last, interval)
+    if len(edges) - 1 > MAX_BUCKETS:
+        raise ValueError(
+            f"{len(edges) - 1} {interval} buckets requested; use a coarser interval or a shorter window "
+            f"(at most {MAX_BUCKETS})"
+        )
+
+    active, active_budget, started, ended = sweep_buckets(starts, ends, budgets, edges)
+    return {
+        "mode": "buckets",
+        "interval": interval,
+        "project_count": len(rows),
+        "window": [str(edges[0]), str(edges[-1] - 1)],
+        "buckets": {
+            "start": [str(edge) for edge in edges[:-1]],
+            "active": active.tolist(),
+            "active_budget": np.round(active_budget, 2).tolist(),
+            "started": started.tolist(),
+            "ended": ended.tolist(),
+        },
+    }
+
+
+def timeline_spans(projects, limit=MAX_SPANS):
+    """JSON-ready list of up to ``limit`` project spans, earliest start first."""
+    rows = list(
+        projects.order_by("start_date", "id")
+        .values_list("id", "name", "status", "sector", "start_date", "end_date", "progress", "budget")[:limit + 1]
+    )
+    spans = [
+        {
+            "id": pk,
+            "name": name,
+            "status": status,
+            "sector": sector or "",
+            "start": start.isoformat(),
+            "end": max(end, start).isoformat(),
+            "progress": progress,
+            "budget": float(budget) if budget else 0,
+        }
+        for pk, name, status, sector, start, end, progress, budget in rows[:limit]
+    ]
+    return {"mode": "spans", "project_count": len(spans), "truncated": len(rows) > limit, "spans": spans}
+
+
+def project_timeline(projects, mode="auto", interval="auto", window_start=None, window_end=None):
+    """
+    Spans for at most ``MAX_SPANS`` projects overlapping the window,
+    otherwise (or with ``mode="buckets"``) the bucketed aggregate.
+    """
+    if window_start:
+        projects = projects.filter(end_date__gte=window_start)
+    if window_end:
+        projects = projects.filter(start_date__lte=window_end)
+    if mode == "auto":
+        mode = "spans" if projects.count() <= MAX_SPANS else "buckets"
+    if mode == "spans":
+        return timeline_spans(projects)
+    return timeline_buckets(projects, interval, window_start, window_end)
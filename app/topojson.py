@@ -0,0 +1,132 @@
+"""
+Minimal TopoJSON encoder for the administrative boundary layers.
+
+Neighbouring counties, sub-counties and wards share their borders, so
+storing each border once as an *arc* (and quantising coordinates to
+integers) makes the topology far smaller than the equivalent GeoJSON.
+Only (multi)polygons are supported, which is all the boundary tables hold.
+"""
+
+
+def _polygons(geom):
+    """Polygon ring coordinates of a GEOS Polygon or MultiPolygon."""
+    if geom.geom_type == "Polygon":
+        return [geom.coords]
+    return list(geom.coords)
+
+
+def _quantize_ring(ring, translate, scale):
+    points = []
+    for x, y in ring:
+        point = (round((x - translate[0]) / scale[0]), round((y - translate[1]) / scale[1]))
+        if not points or point != points[-1]:
+            points.append(point)
+    if points and points[0] == points[-1]:
+        points.pop()
+    # A ring needs at least three distinct corners once quantised
+    return points if len(points) >= 3 else None
+
+
+def _junctions(rings):
+    """Points where a ring meets a different neighbour than elsewhere."""
+    neighbours = {}
+    junctions = set()
+    for ring in rings:
+        n = len(ring)
+        for i, point in enumerate(ring):
+            a, b = ring[i - 1], ring[(i + 1) % n]
+            pair = (a, b) if a <= b else (b, a)
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _cut(ring, junctions):
+    """Split an (open) ring into closed-path arcs between junctions."""
+    cuts = [i for i, point in enumerate(ring) if point in junctions]
+    if not cuts:
+        # Isolated ring: start at its smallest point so duplicates line up
+        start = ring.index(min(ring))
+        ring = ring[start:] + ring[:start]
+        return [ring + [ring[0]]]
+    start = cuts[0]
+    ring = ring[start:] + ring[:start]
+    cuts = [i - start for i in cuts] + [len(ring)]
+    ring = ring + [ring[0]]
+    return [ring[cuts[k]:cuts[k + 1] + 1] for k in range(len(cuts) - 1)]
+
+
+def topology(name, features, quantization=100000):
+    """
+    Build a TopoJSON ``Topology`` dict with one ``GeometryCollection`` object.
+
+    ``features`` is an iterable of ``(id, properties, geos_geometry)``.
+    """
+    features = [f for f in features if f[2] is not None and not f[2].empty]
+    if not features:
+        return {"type": "Topology", "objects": {name: {"type": "GeometryCollection", "geometries": []}}, "arcs": []}
+
+    x0 = min(f[2].extent[0] for f in features)
+    y0 = min(f[2].extent[1] for f in features)
+    x1 = max(f[2].extent[2] for f in features)
+    y1 = max(f[2].extent[3] for f in features)
+    translate = (x0, y0)
+    scale = ((x1 - x0) / (quantization - 1) or 1, (y1 - y0) / (quantization - 1) or 1)
+
+    # feature -> polygons -> quantised rings
+    shapes = []
+    for _, _, geom in features:
+        polygons = []
+        for polygon in _polygons(geom):
+            exterior = _quantize_ring(polygon[0], translate, scale)
+            if exterior is None:
+                continue  # slivers smaller than one quantisation step
+            holes = [r for r in (_quantize_ring(ring, translate, scale) for ring in polygon[1:]) if r]
+            polygons.append([exterior] + holes)
+        shapes.append(polygons)
+
+    junctions = _junctions(ring for polygons in shapes for rings in polygons for ring in rings)
+
+    arcs, index = [], {}
+
+    def arc_id(arc):
+        key = tuple(arc)
+        if key in index:
+            return index[key]
+        reverse = key[::-1]
+        if reverse in index:
+            return ~index[reverse]
+        index[key] = len(arcs)
+        arcs.append(arc)
+        return index[key]
+
+    geometries = []
+    for (feature_id, properties, _), polygons in zip(features, shapes):
+        polygon_arcs = [
+            [[arc_id(arc) for arc in _cut(ring, junctions)] for ring in rings]
+            for rings in polygons
+        ]
+        geometries.append({
+            "type": "MultiPolygon",
+            "id": feature_id,
+            "arcs": polygon_arcs,
+            "properties": properties,
+        })
+
+    encoded_arcs = []
+    for arc in arcs:
+        previous = (0, 0)
+        deltas = []
+        for x, y in arc:
+            deltas.append([x - previous[0], y - previous[1]])
+            previous = (x, y)
+        encoded_arcs.append(deltas)
+
+    return {
+        "type": "Topology",
+        "bbox": [x0, y0, x1, y1],
+        "transform": {"scale": list(scale), "translate": list(translate)},
+        "objects": {name: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": encoded_arcs,
+    }
@@ -8,6 +8,12 @@ urlpatterns = [
     path('wards-geojson/', views.wards_geojson, name='wards_geojson'),
     path('project-locations-geojson/', views.project_locations_geojson, name='project_locations_geojson'),
     path('spatial-statistics/', views.spatial_statistics, name='spatial_statistics'),
+    path('analytics/hotspots/', views.spending_hotspots, name='spending_hotspots'),
+    path('analytics/budget-distribution/', views.budget_distribution, name='budget_distribution'),
+    path('analytics/classes/', views.choropleth_classes, name='choropleth_classes'),
+    path('analytics/coverage/', views.service_coverage, name='service_coverage'),
+    path('analytics/facets/', views.project_facets, name='project_facets'),
+    path('analytics/timeline/', views.project_timeline_data, name='project_timeline'),
     path('counties-geojson/', views.counties_geojson, name='counties_geojson'),
     path('subcounties-geojson/', views.subcounties_geojson, name='subcounties_geojson'),
     path('wards-geojson/', views.wards_geojson, name='wards_geojson'),
@@ -16,8 +22,11 @@ urlpatterns = [
     #path("get-admin-geojson/", views.get_admin_geojson, name="get_admin_geojson"),
     path('projects/', views.ProjectListView.as_view(), name='project_list'),
     path('projects/map/', views.project_map_view, name='project_map'),
+    path('projects/changes/', views.project_changes, name='project_changes'),
+    path('projects/nearby/', views.projects_nearby, name='projects_nearby'),
     path('projects/<int:pk>/', views.ProjectDetailView.as_view(), name='project_detail'),
     path('projects/<int:project_id>/report/', views.submit_report, name='submit_report'),
+    path('projects/<int:project_id>/report/intake/', views.report_intake, name='report_intake'),
     path('about/', views.about, name='about'),
     path('contact/', views.contact, name='contact'),
 ]
\ No newline at end of file
@@ -1,15 +1,20 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.gis.geos import Point
-from django.http import JsonResponse
+from django.contrib.gis.measure import D
+from django.contrib.gis.db.models.functions import Distance
+from django.http import HttpResponse, JsonResponse
 from django.views.generic import ListView, DetailView
 from django.db.models import Sum, Value, DecimalField
 from django.db.models.functions import Coalesce
 from django.utils.timezone import now
 from .models import Project, ProjectUpdate, CitizenReport
-from .forms import CitizenReportForm
+from .forms import ReportIntakeForm
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.db.models import Q
 from django.db.models import Sum, Value, DecimalField, Count, Q
 from django.core.serializers import serialize
+from django.core.serializers.json import DjangoJSONEncoder
 import json
 from decimal import Decimal
 from django.db.models import Sum, Count, Avg, Q
@@ -26,6 +31,20 @@ from datetime import timedelta
 from django.contrib.gis.db.models.functions import Transform
 from .models import Project, ProjectUpdate, CitizenReport, KenyaCounty, KenyaSubCounty, Kenyawards
 from django.contrib.gis.db.models.functions import AsGeoJSON
+from . import classification, columnar, intake
+from .analytics import budget_distributions, density_surface, ward_hotspots
+from .caching import cached_for_spec
+from .changes import InvalidCursor, changes_since, decode_cursor, encode_cursor
+from .coverage import ward_coverage
+from .facets import facet_counts, facet_for_names
+from .filters import (
+    BOUNDARY_PARAMS, LIST_PARAMS, apply_filter_spec, filter_options, filter_spec_from_request,
+    filter_within_boundaries,
+)
+from .geo import NearestTo
+from .lookups import filter_lookup, lookup_ids, lookup_names, search_lookup
+from .replicas import use_read_replica
+from .timeline import INTERVALS, project_timeline
 
 
 def _clean_get(request, name):
@@ -37,6 +56,7 @@ def _clean_getlist(request, name):
     """Return list cleaned of empty/'None' entries."""
     return [v for v in request.GET.getlist(name) if v and v != "None"]
 
+@use_read_replica
 def home(request):
     # Start with all projects
     projects = Project.objects.all()
@@ -59,24 +79,12 @@ def home(request):
     if selected_statuses:
         projects = projects.filter(status__in=selected_statuses)
     if selected_sectors:
-        projects = projects.filter(sector__in=selected_sectors)
+        projects = filter_lookup(projects, "sector", selected_sectors)
     if selected_counties:
-        projects = projects.filter(county__in=selected_counties)
+        projects = filter_lookup(projects, "county", selected_counties)
 
     # Enhanced spatial filtering
-    if selected_subcounties:
-        subcounty_geoms = KenyaSubCounty.objects.filter(subcounty__in=selected_subcounties)
-        if subcounty_geoms.exists():
-            combined_geom = subcounty_geoms.aggregate(union=Union('geom'))['union']
-            if combined_geom:
-                projects = projects.filter(location__within=combined_geom)
-
-    if selected_wards:
-        ward_geoms = Kenyawards.objects.filter(ward__in=selected_wards)
-        if ward_geoms.exists():
-            combined_geom = ward_geoms.aggregate(union=Union('geom'))['union']
-            if combined_geom:
-                projects = projects.filter(location__within=combined_geom)
+    projects = filter_within_boundaries(projects, selected_subcounties, selected_wards)
 
     # Budget filters
     if min_budget:
@@ -186,7 +194,7 @@ def home(request):
     county_stats = []
     counties = KenyaCounty.objects.all()
     for county in counties:
-        county_projects = projects.filter(location__within=county.geom)
+        county_projects = projects.within(county)
         project_count = county_projects.count()
         total_budget_county = county_projects.aggregate(Sum('budget'))['budget__sum'] or 0
         
@@ -291,38 +299,22 @@ def home(request):
     ).order_by('-count')
 
     # ---------------- Enhanced Dropdown Data ----------------
-    fiscal_years_qs = Project.objects.dates("start_date", "year").order_by("-start_date")
-    fiscal_years = sorted({year.year for year in fiscal_years_qs}, reverse=True)
+    options = filter_options()
+    fiscal_years = options["fiscal_years"]
 
     status_choices = [choice[0] for choice in Project.STATUS_CHOICES]
     status_labels = dict(Project.STATUS_CHOICES)
 
-    sectors = (
-        Project.objects.exclude(sector__isnull=True)
-        .exclude(sector="")
-        .values_list("sector", flat=True)
-        .distinct()
-        .order_by("sector")
-    )
-
-    counties = list(
-        KenyaCounty.objects.exclude(county__isnull=True)
-        .exclude(county="")
-        .values_list("county", flat=True)
-        .distinct()
-        .order_by("county")
-    )
+    sectors = options["sectors"]
+    counties = options["counties"]
     
     # Enhanced hierarchical data
-    county_subcounties = {}
-    for sc in KenyaSubCounty.objects.all().order_by("county", "subcounty"):
-        if sc.county and sc.subcounty:
-            county_subcounties.setdefault(sc.county, []).append(sc.subcounty)
+    county_subcounties = options["county_subcounties"]
+    subcounty_wards = options["subcounty_wards"]
 
-    subcounty_wards = {}
-    for w in Kenyawards.objects.all().order_by("subcounty", "ward"):
-        if w.subcounty and w.ward:
-            subcounty_wards.setdefault(w.subcounty, []).append(w.ward)
+    # The county dropdown lists boundary spellings; key its counts the same way
+    facets = facet_counts(filter_spec_from_request(request, LIST_PARAMS + BOUNDARY_PARAMS))
+    facets = {**facets, "county": facet_for_names(facets["county"], counties)}
 
     # Get subcounties and wards based on selected counties
     filtered_subcounties = list(
@@ -344,25 +336,14 @@ def home(request):
     # ---------------- Enhanced GeoJSON for Projects ----------------
     features = []
     valid_projects = 0
+    map_projects = projects.for_map(
+        "start_date", "end_date", "description", "implementing_agency", "contractor", "project_manager"
+    )
     
-    for project in projects:
-        point_geom = None
-        
-        if project.location and hasattr(project.location, 'x') and hasattr(project.location, 'y'):
-            point_geom = {
-                "type": "Point",
-                "coordinates": [float(project.location.x), float(project.location.y)]
-            }
-        elif project.latitude and project.longitude:
-            try:
-                point_geom = {
-                    "type": "Point",
-                    "coordinates": [float(project.longitude), float(project.latitude)]
-                }
-            except (TypeError, ValueError):
-                continue
-        
-        if point_geom:
+    for project in map_projects:
+        if project.lon is not None and project.lat is not None:
+            point_geom = {"type": "Point", "coordinates": [project.lon, project.lat]}
+            point = Point(project.lon, project.lat, srid=4326)
             # Calculate project health score
             health_score = calculate_project_health(project, current_date)
             
@@ -374,8 +355,8 @@ def home(request):
                     "name": project.name,
                     "status": project.status,
                     "county": project.county,
-                    "subcounty": get_subcounty_from_location(project.location) if project.location else "",
-                    "ward": get_ward_from_location(project.location) if project.location else "",
+                    "subcounty": get_subcounty_from_location(point),
+                    "ward": get_ward_from_location(point),
                     "sector": project.sector or "",
                     "budget": float(project.budget) if project.budget else 0,
                     "start_date": project.start_date.strftime("%Y-%m-%d") if project.start_date else "",
@@ -431,7 +412,8 @@ def home(request):
         "projects_by_region": list(projects_by_region),
         "budget_utilization": budget_utilization,
         
-        # Filter options
+        # Filter options, with counts under the other filters
+        "facets": facets,
         "fiscal_years": fiscal_years,
         "status_choices": status_choices,
         "sectors": sectors,
@@ -499,8 +481,11 @@ def get_subcounty_from_location(location):
     """Get subcounty name from location using spatial query"""
     if location:
         try:
-            subcounty = KenyaSubCounty.objects.filter(geom__contains=location).first()
-            return subcounty.subcounty if subcounty else ""
+            subcounty = (
+                KenyaSubCounty.objects.filter(geom_utm__contains=location)
+                .values_list("subcounty", flat=True).first()
+            )
+            return subcounty or ""
         except:
             return ""
     return ""
@@ -510,8 +495,11 @@ def get_ward_from_location(location):
     """Get ward name from location using spatial query"""
     if location:
         try:
-            ward = Kenyawards.objects.filter(geom__contains=location).first()
-            return ward.ward if ward else ""
+            ward = (
+                Kenyawards.objects.filter(geom_utm__contains=location)
+                .values_list("ward", flat=True).first()
+            )
+            return ward or ""
         except:
             return ""
     return ""
@@ -519,253 +507,392 @@ def get_ward_from_location(location):
 
 # ---------------- Enhanced API Endpoints ----------------
 
+def _cached_json(prefix, spec, build):
+    """JSON response for ``build()``, serialised once per data version and spec."""
+    body = cached_for_spec(prefix, spec, lambda: json.dumps(build(), cls=DjangoJSONEncoder))
+    return HttpResponse(body, content_type="application/json")
+
+
+@use_read_replica
 def counties_geojson(request):
-    """Return counties GeoJSON with enhanced statistics"""
+    """Return counties GeoJSON with enhanced statistics (geometry=0: statistics only)"""
     try:
-        counties = KenyaCounty.objects.all()
-        selected_counties = _clean_getlist(request, "county")
-        
-        if selected_counties:
-            counties = counties.filter(county__in=selected_counties)
-        
-        features = []
-        for county in counties:
-            # Enhanced spatial queries
-            projects_in_county = Project.objects.filter(location__within=county.geom)
-            project_count = projects_in_county.count()
-            total_budget = projects_in_county.aggregate(Sum('budget'))['budget__sum'] or 0
-            completed_projects = projects_in_county.filter(status='completed').count()
-            
-            feature = {
-                "type": "Feature",
-                "geometry": json.loads(county.geom.geojson),
-                "properties": {
-                    "id": county.id,
-                    "county": county.county,
-                    "pop_2009": county.pop_2009,
-                    "project_count": project_count,
-                    "total_budget": total_budget,
-                    "completed_projects": completed_projects,
-                    "completion_rate": round((completed_projects / project_count * 100), 1) if project_count else 0,
-                    "budget_per_capita": round(total_budget / (county.pop_2009 or 1), 2),
-                    "area_sqkm": round(county.geom.area * 10000, 2)
-                }
-            }
-            features.append(feature)
-        
-        return JsonResponse({
-            "type": "FeatureCollection",
-            "features": features
-        })
-        
+        selected_counties = sorted(set(_clean_getlist(request, "county")))
+        with_geometry = request.GET.get("geometry") != "0"
+        return _cached_json(
+            "counties-geojson", {"county": selected_counties, "geometry": with_geometry},
+            lambda: _counties_feature_collection(selected_counties, with_geometry),
+        )
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
 
+def _counties_feature_collection(selected_counties, with_geometry=True):
+    counties = KenyaCounty.objects.all()
+    if selected_counties:
+        counties = counties.filter(county__in=selected_counties)
+    
+    features = []
+    for county in counties:
+        # Enhanced spatial queries
+        projects_in_county = Project.objects.within(county)
+        project_count = projects_in_county.count()
+        total_budget = projects_in_county.aggregate(Sum('budget'))['budget__sum'] or 0
+        completed_projects = projects_in_county.filter(status='completed').count()
+        
+        feature = {
+            "type": "Feature",
+            "geometry": json.loads(county.geom.geojson) if with_geometry else None,
+            "properties": {
+                "id": county.id,
+                "county": county.county,
+                "pop_2009": county.pop_2009,
+                "project_count": project_count,
+                "total_budget": total_budget,
+                "completed_projects": completed_projects,
+                "completion_rate": round((completed_projects / project_count * 100), 1) if project_count else 0,
+                "budget_per_capita": round(total_budget / (county.pop_2009 or 1), 2),
+                "area_sqkm": round(county.geom.area * 10000, 2)
+            }
+        }
+        features.append(feature)
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features
+    }
+
+
+@use_read_replica
 def subcounties_geojson(request):
-    """Return subcounties GeoJSON with enhanced filtering"""
+    """Return subcounties GeoJSON with enhanced filtering (geometry=0: statistics only)"""
     try:
         county_filter = request.GET.get('county')
-        selected_subcounties = _clean_getlist(request, "subcounty")
-        
-        if county_filter:
-            subcounties = KenyaSubCounty.objects.filter(county=county_filter)
-        else:
-            subcounties = KenyaSubCounty.objects.all()
-        
-        if selected_subcounties:
-            subcounties = subcounties.filter(subcounty__in=selected_subcounties)
-        
-        features = []
-        for subcounty in subcounties:
-            projects_in_subcounty = Project.objects.filter(location__within=subcounty.geom)
-            project_count = projects_in_subcounty.count()
-            total_budget = projects_in_subcounty.aggregate(Sum('budget'))['budget__sum'] or 0
-            
-            feature = {
-                "type": "Feature",
-                "geometry": json.loads(subcounty.geom.geojson),
-                "properties": {
-                    "id": subcounty.id,
-                    "subcounty": subcounty.subcounty,
-                    "county": subcounty.county,
-                    "province": subcounty.province,
-                    "project_count": project_count,
-                    "total_budget": total_budget,
-                    "avg_budget": round(total_budget / project_count, 2) if project_count else 0
-                }
-            }
-            features.append(feature)
-        
-        return JsonResponse({
-            "type": "FeatureCollection",
-            "features": features
-        })
-        
+        selected_subcounties = sorted(set(_clean_getlist(request, "subcounty")))
+        with_geometry = request.GET.get("geometry") != "0"
+        return _cached_json(
+            "subcounties-geojson",
+            {"county": county_filter, "subcounty": selected_subcounties, "geometry": with_geometry},
+            lambda: _subcounties_feature_collection(county_filter, selected_subcounties, with_geometry),
+        )
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
 
+def _subcounties_feature_collection(county_filter, selected_subcounties, with_geometry=True):
+    if county_filter:
+        subcounties = KenyaSubCounty.objects.filter(county=county_filter)
+    else:
+        subcounties = KenyaSubCounty.objects.all()
+    
+    if selected_subcounties:
+        subcounties = subcounties.filter(subcounty__in=selected_subcounties)
+    
+    features = []
+    for subcounty in subcounties:
+        projects_in_subcounty = Project.objects.within(subcounty)
+        project_count = projects_in_subcounty.count()
+        total_budget = projects_in_subcounty.aggregate(Sum('budget'))['budget__sum'] or 0
+        
+        feature = {
+            "type": "Feature",
+            "geometry": json.loads(subcounty.geom.geojson) if with_geometry else None,
+            "properties": {
+                "id": subcounty.id,
+                "subcounty": subcounty.subcounty,
+                "county": subcounty.county,
+                "province": subcounty.province,
+                "project_count": project_count,
+                "total_budget": total_budget,
+                "avg_budget": round(total_budget / project_count, 2) if project_count else 0
+            }
+        }
+        features.append(feature)
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features
+    }
+
+
+@use_read_replica
 def wards_geojson(request):
-    """Return wards GeoJSON with project statistics"""
+    """Return wards GeoJSON with project statistics (geometry=0: statistics only)"""
     try:
         county_filter = request.GET.get('county')
         subcounty_filter = request.GET.get('subcounty')
-        selected_wards = _clean_getlist(request, "ward")
-        
-        wards = Kenyawards.objects.all()
-        
-        if county_filter:
-            wards = wards.filter(county=county_filter)
-        if subcounty_filter:
-            wards = wards.filter(subcounty=subcounty_filter)
-        if selected_wards:
-            wards = wards.filter(ward__in=selected_wards)
+        selected_wards = sorted(set(_clean_getlist(request, "ward")))
+        with_geometry = request.GET.get("geometry") != "0"
+        return _cached_json(
+            "wards-geojson",
+            {"county": county_filter, "subcounty": subcounty_filter, "ward": selected_wards,
+             "geometry": with_geometry},
+            lambda: _wards_feature_collection(county_filter, subcounty_filter, selected_wards, with_geometry),
+        )
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def _wards_feature_collection(county_filter, subcounty_filter, selected_wards, with_geometry=True):
+    wards = Kenyawards.objects.all()
+    
+    if county_filter:
+        wards = wards.filter(county=county_filter)
+    if subcounty_filter:
+        wards = wards.filter(subcounty=subcounty_filter)
+    if selected_wards:
+        wards = wards.filter(ward__in=selected_wards)
+    
+    features = []
+    for ward in wards:
+        projects_in_ward = Project.objects.within(ward)
+        project_count = projects_in_ward.count()
+        total_budget = projects_in_ward.aggregate(Sum('budget'))['budget__sum'] or 0
         
-        features = []
-        for ward in wards:
-            projects_in_ward = Project.objects.filter(location__within=ward.geom)
-            project_count = projects_in_ward.count()
-            total_budget = projects_in_ward.aggregate(Sum('budget'))['budget__sum'] or 0
-            
-            feature = {
-                "type": "Feature",
-                "geometry": json.loads(ward.geom.geojson),
-                "properties": {
-                    "id": ward.id,
-                    "ward": ward.ward,
-                    "subcounty": ward.subcounty,
-                    "county": ward.county,
-                    "project_count": project_count,
-                    "total_budget": total_budget,
-                    "project_density": round(project_count / (ward.geom.area * 10000), 4) if ward.geom.area else 0
-                }
+        feature = {
+            "type": "Feature",
+            "geometry": json.loads(ward.geom.geojson) if with_geometry else None,
+            "properties": {
+                "id": ward.id,
+                "ward": ward.ward,
+                "subcounty": ward.subcounty,
+                "county": ward.county,
+                "project_count": project_count,
+                "total_budget": total_budget,
+                "project_density": round(project_count / (ward.geom.area * 10000), 4) if ward.geom.area else 0
             }
-            features.append(feature)
-        
+        }
+        features.append(feature)
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features
+    }
+
+
+@use_read_replica
+def project_locations_geojson(request):
+    """API endpoint for filtered project locations (GeoJSON, or format=columnar)"""
+    try:
+        # Same year/status/sector/county filters as the main view
+        spec = {
+            name: value for name, value in filter_spec_from_request(request).items()
+            if name in ("year", "status", "sector", "county")
+        }
+        if request.GET.get("format") == "columnar":
+            # Typed-array payload for JavaScript clients (layout in app/columnar.py)
+            precision = 64 if request.GET.get("precision") == "64" else 32
+            body = cached_for_spec(
+                "project-locations-columnar", {**spec, "precision": precision},
+                lambda: columnar.project_payload(apply_filter_spec(Project.objects.all(), spec), precision),
+            )
+            return HttpResponse(body, content_type=columnar.CONTENT_TYPE)
+        return _cached_json(
+            "project-locations-geojson", spec,
+            lambda: _project_locations_feature_collection(spec),
+        )
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def _project_locations_feature_collection(spec):
+    projects = apply_filter_spec(Project.objects.for_map(), spec)
+    
+    # Build GeoJSON
+    features = []
+    for project in projects:
+        if project.lon is not None and project.lat is not None:
+            features.append(_project_location_feature(project))
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features
+    }
+
+
+def _project_location_feature(project):
+    """
+    GeoJSON feature served by the project locations and change feed
+    endpoints, for a project loaded with ``Project.objects.for_map()``
+    """
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [project.lon, project.lat]},
+        "properties": {
+            "id": project.id,
+            "name": project.name,
+            "status": project.status,
+            "county": project.county,
+            "sector": project.sector or "",
+            "budget": float(project.budget) if project.budget else 0,
+        }
+    }
+
+
+def project_changes(request):
+    """
+    Incremental feed for map clients: everything without ``since``, then only
+    the features added/changed and the ids removed since the returned cursor.
+
+    Served from the primary so a client never misses a write that has not
+    reached a replica yet.
+    """
+    try:
+        spec = {
+            name: value for name, value in filter_spec_from_request(request).items()
+            if name in ("year", "status", "sector", "county")
+        }
+        cursor = encode_cursor(timezone.now())
+        since = request.GET.get("since")
+
+        changes = None
+        if since:
+            try:
+                changes = changes_since(decode_cursor(since), apply_filter_spec(Project.objects.for_map(), spec))
+            except InvalidCursor as e:
+                return JsonResponse({"error": str(e)}, status=400)
+
+        if changes is None:
+            # First request, or a cursor older than the tombstone retention
+            snapshot = _project_locations_feature_collection(spec)
+            return JsonResponse({**snapshot, "removed": [], "reset": True, "cursor": cursor})
+
+        changed, removed = changes
         return JsonResponse({
             "type": "FeatureCollection",
-            "features": features
+            "features": [_project_location_feature(project) for project in changed],
+            "removed": removed,
+            "reset": False,
+            "cursor": cursor,
         })
-        
+
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
 
-def project_locations_geojson(request):
-    """API endpoint for filtered project locations"""
+NEARBY_MAX_RADIUS_M = 200000
+NEARBY_MAX_RESULTS = 500
+
+
+@use_read_replica
+def projects_nearby(request):
+    """
+    Projects around ``near=lon,lat``: within ``radius_m`` metres and/or the
+    ``k`` nearest, nearest first, combined with the usual filters.
+
+    Both are index scans: the radius through planar ``ST_DWithin`` on
+    ``Project.location_utm``, the ordering through the ``<->`` operator on
+    the ``location`` geography.
+    """
     try:
-        # Apply the same filters as the main view
-        projects = Project.objects.all()
-        
-        # Apply filters from request
-        selected_year = _clean_get(request, "year")
-        selected_statuses = _clean_getlist(request, "status")
-        selected_sectors = _clean_getlist(request, "sector")
-        selected_counties = _clean_getlist(request, "county")
-        
-        if selected_year:
-            projects = projects.filter(start_date__year=selected_year)
-        if selected_statuses:
-            projects = projects.filter(status__in=selected_statuses)
-        if selected_sectors:
-            projects = projects.filter(sector__in=selected_sectors)
-        if selected_counties:
-            projects = projects.filter(county__in=selected_counties)
-        
-        # Build GeoJSON
+        try:
+            lon, lat = (float(v) for v in request.GET.get("near", "").split(","))
+        except ValueError:
+            return JsonResponse({"error": "near must be 'lon,lat'"}, status=400)
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+            return JsonResponse({"error": "near is outside lon/lat range"}, status=400)
+        try:
+            radius_m = request.GET.get("radius_m")
+            radius_m = float(radius_m) if radius_m else None
+            k = request.GET.get("k")
+            k = int(k) if k else None
+        except ValueError:
+            return JsonResponse({"error": "radius_m must be a number and k an integer"}, status=400)
+        if radius_m is not None and not 0 < radius_m <= NEARBY_MAX_RADIUS_M:
+            return JsonResponse({"error": f"radius_m must be between 0 and {NEARBY_MAX_RADIUS_M}"}, status=400)
+        if k is not None and not 1 <= k <= NEARBY_MAX_RESULTS:
+            return JsonResponse({"error": f"k must be between 1 and {NEARBY_MAX_RESULTS}"}, status=400)
+        if radius_m is None and k is None:
+            k = 10
+
+        spec = filter_spec_from_request(request)
+        point = Point(lon, lat, srid=4326)
+        projects = apply_filter_spec(Project.objects.filter(location__isnull=False), spec)
+        if radius_m is not None:
+            projects = projects.filter(location_utm__dwithin=(point, D(m=radius_m)))
+        limit = k or NEARBY_MAX_RESULTS
+        nearest = list(
+            projects.for_map()
+            .order_by(NearestTo("location", point))
+            .annotate(distance=Distance("location", point))[:limit + 1]
+        )
+        truncated = k is None and len(nearest) > limit
+
         features = []
-        for project in projects:
-            point_geom = None
-            
-            if project.location and hasattr(project.location, 'x') and hasattr(project.location, 'y'):
-                point_geom = {
-                    "type": "Point",
-                    "coordinates": [float(project.location.x), float(project.location.y)]
-                }
-            elif project.latitude and project.longitude:
-                try:
-                    point_geom = {
-                        "type": "Point",
-                        "coordinates": [float(project.longitude), float(project.latitude)]
-                    }
-                except (TypeError, ValueError):
-                    continue
-            
-            if point_geom:
-                features.append({
-                    "type": "Feature",
-                    "geometry": point_geom,
-                    "properties": {
-                        "id": project.id,
-                        "name": project.name,
-                        "status": project.status,
-                        "county": project.county,
-                        "sector": project.sector or "",
-                        "budget": float(project.budget) if project.budget else 0,
-                    }
-                })
-        
+        for project in nearest[:limit]:
+            feature = _project_location_feature(project)
+            feature["properties"]["distance_m"] = round(project.distance.m, 1)
+            features.append(feature)
+
         return JsonResponse({
             "type": "FeatureCollection",
-            "features": features
+            "features": features,
+            "near": [lon, lat],
+            "radius_m": radius_m,
+            "k": k,
+            "truncated": truncated,
+            "filters": spec,
         })
-        
+
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
-    
-    
 
+
+@use_read_replica
 def spatial_statistics(request):
     """Enhanced spatial analytics endpoint"""
     try:
-        # Regional analysis
-        counties = KenyaCounty.objects.all()
-        regional_stats = []
+        # Keyed by date too: the overdue count changes at midnight without a data change
+        return _cached_json("spatial-statistics", {"date": timezone.now().date().isoformat()}, _spatial_statistics)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def _spatial_statistics():
+    # Regional analysis
+    counties = KenyaCounty.objects.all()
+    regional_stats = []
+    
+    for county in counties:
+        projects_in_county = Project.objects.within(county)
+        project_count = projects_in_county.count()
         
-        for county in counties:
-            projects_in_county = Project.objects.filter(location__within=county.geom)
-            project_count = projects_in_county.count()
+        if project_count > 0:
+            stats = projects_in_county.aggregate(
+                total_budget=Sum('budget'),
+                avg_budget=Avg('budget'),
+                completed=Count('id', filter=Q(status='completed')),
+                delayed=Count('id', filter=Q(status='delayed')),
+                high_budget=Count('id', filter=Q(budget__gt=Avg('budget')))
+            )
             
-            if project_count > 0:
-                stats = projects_in_county.aggregate(
-                    total_budget=Sum('budget'),
-                    avg_budget=Avg('budget'),
-                    completed=Count('id', filter=Q(status='completed')),
-                    delayed=Count('id', filter=Q(status='delayed')),
-                    high_budget=Count('id', filter=Q(budget__gt=Avg('budget')))
-                )
-                
-                regional_stats.append({
-                    'county': county.county,
-                    'project_count': project_count,
-                    'total_budget': stats['total_budget'] or 0,
-                    'completion_rate': round((stats['completed'] / project_count * 100), 1),
-                    'delay_rate': round((stats['delayed'] / project_count * 100), 1),
-                    'high_budget_projects': stats['high_budget'] or 0,
-                    'budget_per_capita': round((stats['total_budget'] or 0) / (county.pop_2009 or 1), 2)
-                })
-        
-        # Spatial distribution analysis
-        spatial_distribution = {
-            'urban_counties': regional_stats[:5],  # Top 5 by project count
-            'rural_counties': regional_stats[-5:],  # Bottom 5 by project count
-            'total_regions': len(regional_stats),
-            'avg_projects_per_county': round(sum(s['project_count'] for s in regional_stats) / len(regional_stats), 1)
+            regional_stats.append({
+                'county': county.county,
+                'project_count': project_count,
+                'total_budget': stats['total_budget'] or 0,
+                'completion_rate': round((stats['completed'] / project_count * 100), 1),
+                'delay_rate': round((stats['delayed'] / project_count * 100), 1),
+                'high_budget_projects': stats['high_budget'] or 0,
+                'budget_per_capita': round((stats['total_budget'] or 0) / (county.pop_2009 or 1), 2)
+            })
+    
+    # Spatial distribution analysis
+    spatial_distribution = {
+        'urban_counties': regional_stats[:5],  # Top 5 by project count
+        'rural_counties': regional_stats[-5:],  # Bottom 5 by project count
+        'total_regions': len(regional_stats),
+        'avg_projects_per_county': round(sum(s['project_count'] for s in regional_stats) / len(regional_stats), 1)
+    }
+    
+    return {
+        'regional_stats': regional_stats,
+        'spatial_distribution': spatial_distribution,
+        'summary': {
+            'total_counties_covered': len([s for s in regional_stats if s['project_count'] > 0]),
+            'total_budget_allocation': sum(s['total_budget'] for s in regional_stats),
+            'avg_completion_rate': round(sum(s['completion_rate'] for s in regional_stats) / len(regional_stats), 1)
         }
-        
-        return JsonResponse({
-            'regional_stats': regional_stats,
-            'spatial_distribution': spatial_distribution,
-            'summary': {
-                'total_counties_covered': len([s for s in regional_stats if s['project_count'] > 0]),
-                'total_budget_allocation': sum(s['total_budget'] for s in regional_stats),
-                'avg_completion_rate': round(sum(s['completion_rate'] for s in regional_stats) / len(regional_stats), 1)
-            }
-        })
-        
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500)
+    }
 
 
     """Comprehensive project analytics"""
@@ -777,9 +904,9 @@ def spatial_statistics(request):
         selected_sectors = _clean_getlist(request, "sector")
         
         if selected_counties:
-            projects = projects.filter(county__in=selected_counties)
+            projects = filter_lookup(projects, "county", selected_counties)
         if selected_sectors:
-            projects = projects.filter(sector__in=selected_sectors)
+            projects = filter_lookup(projects, "sector", selected_sectors)
         
         # Performance metrics
         performance_metrics = projects.aggregate(
@@ -819,54 +946,222 @@ def spatial_statistics(request):
 
 
 
+@use_read_replica
+def spending_hotspots(request):
+    """Budget-weighted density grid (method=kde) or ward Gi* hot spots (method=gistar)"""
+    try:
+        spec = filter_spec_from_request(request)
+        method = request.GET.get("method", "kde")
+        if method not in ("kde", "gistar"):
+            return JsonResponse({"error": "method must be 'kde' or 'gistar'"}, status=400)
 
+        try:
+            bandwidth_m = min(max(float(request.GET.get("bandwidth_m", 5000)), 100), 100000)
+            cell_m = min(max(float(request.GET.get("cell_m", 1000)), 50), 50000)
+            distance_m = request.GET.get("distance_m")
+            distance_m = float(distance_m) if distance_m else None
+        except ValueError:
+            return JsonResponse({"error": "bandwidth_m, cell_m and distance_m must be numbers"}, status=400)
+
+        projects = apply_filter_spec(Project.objects.all(), spec)
+
+        if method == "kde":
+            key = {**spec, "bandwidth_m": bandwidth_m, "cell_m": cell_m}
+            result = cached_for_spec(
+                "hotspots-kde", key, lambda: density_surface(projects, bandwidth_m, cell_m)
+            )
+        else:
+            key = {**spec, "distance_m": distance_m}
+            result = cached_for_spec(
+                "hotspots-gistar", key,
+                lambda: ward_hotspots(projects, spec.get("county"), distance_m),
+            )
 
+        return JsonResponse({**result, "filters": spec})
 
-# ---------------- Dashboard View ---------------- #
-def dashboard(request):
-    # Apply filters if any
-    filters = Q()
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
 
-    # Status filter
-    status_filter = request.GET.getlist('status')
-    if status_filter:
-        filters &= Q(status__in=status_filter)
 
-    # County filter
-    county_filter = request.GET.getlist('county')
-    if county_filter:
-        filters &= Q(county__in=county_filter)
+@use_read_replica
+def budget_distribution(request):
+    """Budget quantiles, log-scale histogram and outliers per sector, county or overall"""
+    try:
+        spec = filter_spec_from_request(request)
+        group_by = request.GET.get("group_by", "sector")
+        if group_by not in ("sector", "county", "all"):
+            return JsonResponse({"error": "group_by must be 'sector', 'county' or 'all'"}, status=400)
+        try:
+            bins = min(max(int(request.GET.get("bins", 20)), 5), 60)
+        except ValueError:
+            return JsonResponse({"error": "bins must be an integer"}, status=400)
+
+        projects = apply_filter_spec(Project.objects.all(), spec)
+        result = cached_for_spec(
+            "budget-distribution", {**spec, "group_by": group_by, "bins": bins},
+            lambda: budget_distributions(projects, group_by, bins),
+        )
+        return JsonResponse({**result, "filters": spec})
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
 
-    # Sector filter
-    sector_filter = request.GET.getlist('sector')
-    if sector_filter:
-        filters &= Q(sector__in=sector_filter)
 
-    # Budget range filter
-    min_budget = request.GET.get('min_budget')
-    max_budget = request.GET.get('max_budget')
-    if min_budget and min_budget != '':
+@use_read_replica
+def choropleth_classes(request):
+    """Shared class breaks (jenks, quantile, equal_interval) for a boundary layer metric"""
+    try:
+        spec = filter_spec_from_request(request)
+        level = request.GET.get("level", "counties")
+        metric = request.GET.get("metric", "count")
+        method = request.GET.get("method", "jenks")
+        if level not in ("counties", "subcounties", "wards"):
+            return JsonResponse({"error": "level must be 'counties', 'subcounties' or 'wards'"}, status=400)
+        if metric not in classification.METRICS:
+            return JsonResponse({"error": f"metric must be one of {', '.join(classification.METRICS)}"}, status=400)
+        if metric == "per_capita" and level != "counties":
+            return JsonResponse({"error": "per_capita is only available for counties"}, status=400)
+        if method not in classification.METHODS:
+            return JsonResponse({"error": f"method must be one of {', '.join(classification.METHODS)}"}, status=400)
         try:
-            filters &= Q(budget__gte=Decimal(min_budget))
-        except Exception:
-            pass
-    if max_budget and max_budget != '':
+            k = int(request.GET.get("classes", 5))
+        except ValueError:
+            return JsonResponse({"error": "classes must be an integer"}, status=400)
+        k = min(max(k, classification.MIN_CLASSES), classification.MAX_CLASSES)
+
+        projects = apply_filter_spec(Project.objects.all(), spec)
+        return _cached_json(
+            "choropleth-classes", {**spec, "level": level, "metric": metric, "method": method, "classes": k},
+            lambda: {**classification.classify(level, metric, method, k, projects), "filters": spec},
+        )
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@use_read_replica
+def service_coverage(request):
+    """Precomputed distance from each ward to the nearest project of the given sectors/statuses"""
+    try:
+        sectors = sorted(set(_clean_getlist(request, "sector")))
+        statuses = sorted(set(_clean_getlist(request, "status"))) or ["completed"]
+        if not sectors:
+            return JsonResponse({"error": "at least one sector is required"}, status=400)
+        valid_statuses = dict(Project.STATUS_CHOICES)
+        if any(status not in valid_statuses for status in statuses):
+            return JsonResponse({"error": f"status must be one of {', '.join(valid_statuses)}"}, status=400)
+
+        return _cached_json(
+            "ward-coverage", {"sector": sectors, "status": statuses},
+            lambda: {
+                **ward_coverage(list(lookup_ids("sector", sectors).values_list("pk", flat=True)), statuses),
+                "filters": {"sector": sectors, "status": statuses},
+            },
+        )
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@use_read_replica
+def project_facets(request):
+    """Project count and budget per status, sector, county, year and agency, each ignoring its own filter"""
+    try:
+        spec = filter_spec_from_request(request)
+        return JsonResponse({**facet_counts(spec), "filters": spec})
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@use_read_replica
+def project_timeline_data(request):
+    """Gantt spans for a small filtered set, else active projects/budget per day, week or month"""
+    try:
+        spec = filter_spec_from_request(request)
+        mode = request.GET.get("mode", "auto")
+        interval = request.GET.get("interval", "auto")
+        if mode not in ("auto", "spans", "buckets"):
+            return JsonResponse({"error": "mode must be 'auto', 'spans' or 'buckets'"}, status=400)
+        if interval != "auto" and interval not in INTERVALS:
+            return JsonResponse({"error": f"interval must be 'auto' or one of {', '.join(INTERVALS)}"}, status=400)
+        window = {}
+        for name in ("from", "to"):
+            value = request.GET.get(name)
+            if value:
+                try:
+                    window[name] = datetime.strptime(value, "%Y-%m-%d").date()
+                except ValueError:
+                    return JsonResponse({"error": f"{name} must be a YYYY-MM-DD date"}, status=400)
+        if "from" in window and "to" in window and window["from"] > window["to"]:
+            return JsonResponse({"error": "from must not be after to"}, status=400)
+
+        projects = apply_filter_spec(Project.objects.all(), spec)
         try:
-            filters &= Q(budget__lte=Decimal(max_budget))
-        except Exception:
-            pass
+            return _cached_json(
+                "timeline", {**spec, "mode": mode, "interval": interval, **window},
+                lambda: {
+                    **project_timeline(projects, mode, interval, window.get("from"), window.get("to")),
+                    "filters": spec,
+                },
+            )
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+# ---------------- Dashboard View ---------------- #
+@use_read_replica
+def dashboard(request):
+    spec = filter_spec_from_request(request)
+    projects = apply_filter_spec(Project.objects.all(), spec)
+
+    # Aggregate panels are cached per filter combination until the data changes;
+    # the schedule panels also change at midnight, so their key carries the date
+    today = timezone.now().date()
+    panels = cached_for_spec("dashboard-panels", spec, lambda: _dashboard_panels(projects))
+    schedule = cached_for_spec(
+        "dashboard-schedule", {**spec, "date": today.isoformat()},
+        lambda: _dashboard_schedule_panels(projects, today),
+    )
+
+    # Recent Updates
+    recent_updates = ProjectUpdate.objects.select_related('project').order_by('-created_at')[:5]
+
+    # Citizen Reports Summary
+    report_summary = CitizenReport.objects.values('report_type').annotate(
+        count=Count('id'),
+        approved=Count('id', filter=Q(is_approved=True))
+    ).order_by('report_type')
 
-    # Date range filter
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    if start_date and start_date != '':
-        filters &= Q(start_date__gte=start_date)
-    if end_date and end_date != '':
-        filters &= Q(end_date__lte=end_date)
+    options = filter_options()
 
-    # Apply filters to projects
-    projects = Project.objects.filter(filters)
+    # Context
+    context = {
+        **panels,
+        **schedule,
+        "status_choices": Project.STATUS_CHOICES,
+        "counties": options["project_counties"],
+        "sectors": options["sectors"],
+        "projects": projects,
+        "facets": facet_counts(spec),
+        "recent_updates": recent_updates,
+        "report_summary": report_summary,
+        # selected filters for dropdowns
+        "selected_statuses": spec.get("status", []),
+        "selected_counties": spec.get("county", []),
+        "selected_sectors": spec.get("sector", []),
+        "min_progress": spec.get("min_progress", ""),
+        "max_progress": spec.get("max_progress", ""),
+    }
 
+    return render(request, "app/dashboard.html", context)
+
+
+def _dashboard_panels(projects):
+    """Everything on the dashboard that only depends on the filtered projects."""
     # Key Metrics
     total_projects = projects.count()
     total_budget = projects.aggregate(
@@ -880,42 +1175,39 @@ def dashboard(request):
     # Calculate average budget
     avg_budget = projects.aggregate(avg=Avg('budget'))['avg'] or 0
 
-    # Calculate time metrics
-    now = timezone.now().date()
-    
-    # Projects behind schedule (past end date but not completed)
-    behind_schedule = projects.filter(
-        end_date__lt=now
-    ).exclude(status='completed').count()
-    
     # Projects ahead of schedule (completed before end date)
     ahead_of_schedule = projects.filter(
         status='completed',
         end_date__gt=F('actual_completion_date')
     ).count() if hasattr(Project, 'actual_completion_date') else 0
 
+    # Ongoing projects reporting under 25% progress
+    low_progress_projects = projects.filter(status='ongoing', progress__lt=25).count()
+
     # Status Distribution
-    status_distribution = projects.values('status').annotate(count=Count('id'))
+    status_distribution = projects.for_stats('status').annotate(count=Count('id'))
     status_data = {status[0]: 0 for status in Project.STATUS_CHOICES}
     for item in status_distribution:
         status_data[item['status']] = item['count']
 
-    # Budget by Sector
+    # Budget by Sector (grouped on the integer lookup key)
+    sector_names = lookup_names('sector')
     sector_budget = (
-        projects.values('sector')
+        projects.for_stats('sector_ref')
         .annotate(total_budget=Sum('budget'))
         .order_by('-total_budget')[:10]
     )
-    sector_labels = [item['sector'] or 'Unknown' for item in sector_budget]
+    sector_labels = [sector_names.get(item['sector_ref'], 'Unknown') for item in sector_budget]
     sector_values = [float(item['total_budget'] or 0) for item in sector_budget]
 
     # Projects by County
+    county_names = lookup_names('county')
     county_counts = (
-        projects.values('county')
+        projects.for_stats('county_ref')
         .annotate(count=Count('id'))
         .order_by('-count')[:10]
     )
-    county_labels = [item['county'] for item in county_counts]
+    county_labels = [county_names.get(item['county_ref'], 'Unknown') for item in county_counts]
     county_values = [item['count'] for item in county_counts]
 
     # Monthly Project Timeline
@@ -930,7 +1222,7 @@ def dashboard(request):
 
     # Budget Utilization by Status
     budget_by_status = (
-        projects.values('status')
+        projects.for_stats('status')
         .annotate(total_budget=Sum('budget'))
         .order_by('status')
     )
@@ -939,13 +1231,14 @@ def dashboard(request):
 
     # Top Performing Counties by Completion Rate
     county_performance = []
-    for county in projects.values_list('county', flat=True).distinct():
-        county_projects = projects.filter(county=county)
-        total = county_projects.count()
-        completed = county_projects.filter(status='completed').count()
-        rate = round((completed / total) * 100, 1) if total > 0 else 0
+    county_totals = projects.for_stats('county_ref').annotate(
+        total=Count('id'), completed=Count('id', filter=Q(status='completed'))
+    )
+    for item in county_totals:
+        total = item['total']
+        rate = round((item['completed'] / total) * 100, 1) if total > 0 else 0
         county_performance.append({
-            'county': county,
+            'county': county_names.get(item['county_ref'], 'Unknown'),
             'completion_rate': rate,
             'total_projects': total
         })
@@ -955,33 +1248,15 @@ def dashboard(request):
     performance_labels = [item['county'] for item in county_performance]
     performance_values = [item['completion_rate'] for item in county_performance]
 
-    # Recent Updates
-    recent_updates = ProjectUpdate.objects.select_related('project').order_by('-created_at')[:5]
-
-    # Citizen Reports Summary
-    report_summary = CitizenReport.objects.values('report_type').annotate(
-        count=Count('id'),
-        approved=Count('id', filter=Q(is_approved=True))
-    ).order_by('report_type')
-
-    # Status Choices
-    status_choices = Project.STATUS_CHOICES
-
-    # Counties
-    counties = Project.objects.values_list("county", flat=True).distinct().order_by("county")
-
-    # Sectors
-    sectors = Project.objects.values_list("sector", flat=True).distinct().order_by("sector")
-
     # GeoJSON for Map
     features = []
-    for project in projects:
-        if project.location:
-            lng, lat = project.location.x, project.location.y
-        elif project.longitude and project.latitude:
-            lng, lat = float(project.longitude), float(project.latitude)
-        else:
+    map_projects = projects.for_map(
+        "project_id", "start_date", "end_date", "description", "implementing_agency", "contractor", "progress"
+    )
+    for project in map_projects:
+        if project.lon is None or project.lat is None:
             continue
+        lng, lat = project.lon, project.lat
 
         features.append(
             {
@@ -1003,23 +1278,19 @@ def dashboard(request):
                     "description": project.description or "",
                     "implementing_agency": project.implementing_agency or "",
                     "contractor": project.contractor or "",
+                    "progress": project.progress,
                 },
             }
         )
     geojson = {"type": "FeatureCollection", "features": features}
 
-    # Context
-    context = {
+    return {
         "total_projects": total_projects,
         "total_budget": total_budget,
         "completion_rate": completion_rate,
         "avg_budget": avg_budget,
-        "behind_schedule": behind_schedule,
         "ahead_of_schedule": ahead_of_schedule,
-        "status_choices": status_choices,
-        "counties": counties,
-        "sectors": sectors,
-        "projects": projects,
+        "low_progress_projects": low_progress_projects,
         "geojson": json.dumps(geojson),
         "status_data": status_data,
         "sector_labels": json.dumps(sector_labels),
@@ -1032,15 +1303,17 @@ def dashboard(request):
         "budget_status_values": json.dumps(budget_status_values),
         "performance_labels": json.dumps(performance_labels),
         "performance_values": json.dumps(performance_values),
-        "recent_updates": recent_updates,
-        "report_summary": report_summary,
-        # selected filters for dropdowns
-        "selected_statuses": status_filter,
-        "selected_counties": county_filter,
-        "selected_sectors": sector_filter,
     }
 
-    return render(request, "app/dashboard.html", context)
+
+def _dashboard_schedule_panels(projects, today):
+    """Dashboard counts that depend on the current date as well as the data."""
+    # Projects behind schedule (past end date but not completed)
+    behind_schedule = projects.filter(
+        end_date__lt=today
+    ).exclude(status='completed').count()
+    return {"behind_schedule": behind_schedule}
+
 
 # ---------------- Other views remain the same ---------------- #
 # ... (home, ProjectListView, ProjectDetailView, project_map_view, submit_report, about, contact)
@@ -1052,14 +1325,22 @@ class ProjectListView(ListView):
     template_name = 'app/project_list.html'
     context_object_name = 'projects'
     paginate_by = 12
+
+    SORT_OPTIONS = {
+        'newest': '-created_at',
+        'progress': 'progress',
+        '-progress': '-progress',
+        'last_update': '-last_update_at',
+        '-budget': '-budget',
+    }
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().for_list()
         
         # Apply filters from GET parameters
         county = self.request.GET.get('county')
         if county:
-            queryset = queryset.filter(county__icontains=county)
+            queryset = search_lookup(queryset, "county", county)
             
         status = self.request.GET.get('status')
         if status:
@@ -1067,11 +1348,11 @@ class ProjectListView(ListView):
             
         sector = self.request.GET.get('sector')
         if sector:
-            queryset = queryset.filter(sector__icontains=sector)
+            queryset = search_lookup(queryset, "sector", sector)
             
         agency = self.request.GET.get('agency')
         if agency:
-            queryset = queryset.filter(implementing_agency__icontains=agency)
+            queryset = search_lookup(queryset, "implementing_agency", agency)
             
         # Budget range filter
         min_budget = self.request.GET.get('min_budget')
@@ -1100,16 +1381,34 @@ class ProjectListView(ListView):
                 queryset = queryset.filter(end_date__lte=end_date)
             except (ValueError):
                 pass
-                
-        return queryset.order_by('-created_at')
+
+        # Progress range filter
+        min_progress = self.request.GET.get('min_progress')
+        max_progress = self.request.GET.get('max_progress')
+        if min_progress:
+            try:
+                queryset = queryset.filter(progress__gte=int(min_progress))
+            except ValueError:
+                pass
+        if max_progress:
+            try:
+                queryset = queryset.filter(progress__lte=int(max_progress))
+            except ValueError:
+                pass
+
+        sort = self.SORT_OPTIONS.get(self.request.GET.get('sort'), '-created_at')
+        return queryset.order_by(sort, '-id')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get all filter options from database
-        counties = Project.objects.exclude(county__isnull=True).exclude(county='').values_list('county', flat=True).distinct().order_by('county')
-        sectors = Project.objects.exclude(sector__isnull=True).exclude(sector='').values_list('sector', flat=True).distinct().order_by('sector')
-        agencies = Project.objects.exclude(implementing_agency__isnull=True).exclude(implementing_agency='').values_list('implementing_agency', flat=True).distinct().order_by('implementing_agency')
+        # Get all filter options (cached until the project data changes)
+        options = filter_options()
+        # Counted with the same contains-matching as get_queryset()
+        context['facets'] = facet_counts(filter_spec_from_request(self.request), search=True)
+        counties = options["project_counties"]
+        sectors = options["sectors"]
+        agencies = options["agencies"]
         
         # Get current filter values
         selected_county = self.request.GET.get('county', '')
@@ -1120,6 +1419,9 @@ class ProjectListView(ListView):
         selected_max_budget = self.request.GET.get('max_budget', '')
         selected_start_date = self.request.GET.get('start_date', '')
         selected_end_date = self.request.GET.get('end_date', '')
+        selected_min_progress = self.request.GET.get('min_progress', '')
+        selected_max_progress = self.request.GET.get('max_progress', '')
+        selected_sort = self.request.GET.get('sort', '')
         
         # Get filtered projects for statistics
         filtered_projects = self.get_queryset()
@@ -1164,6 +1466,9 @@ class ProjectListView(ListView):
             'selected_max_budget': selected_max_budget,
             'selected_start_date': selected_start_date,
             'selected_end_date': selected_end_date,
+            'selected_min_progress': selected_min_progress,
+            'selected_max_progress': selected_max_progress,
+            'selected_sort': selected_sort,
             'total_projects': total_projects,
             'total_budget': total_budget,
             'avg_budget': avg_budget,
@@ -1184,6 +1489,7 @@ class ProjectDetailView(DetailView):
 
 
 # ---------------- Project Map ---------------- #
+@use_read_replica
 def project_map_view(request):
     # Start with all projects that have location data
     projects = Project.objects.filter(location__isnull=False)
@@ -1195,24 +1501,25 @@ def project_map_view(request):
     
     county_filter = request.GET.getlist('county')
     if county_filter:
-        projects = projects.filter(county__in=county_filter)
+        projects = filter_lookup(projects, "county", county_filter)
     
     sector_filter = request.GET.getlist('sector')
     if sector_filter:
-        projects = projects.filter(sector__in=sector_filter)
+        projects = filter_lookup(projects, "sector", sector_filter)
+
+    min_progress = request.GET.get('min_progress')
+    if min_progress:
+        try:
+            projects = projects.filter(progress__gte=int(min_progress))
+        except ValueError:
+            pass
     
     # Get filter options
     status_choices = [choice[0] for choice in Project.STATUS_CHOICES]
     status_labels = dict(Project.STATUS_CHOICES)
-    counties = Project.objects.values_list('county', flat=True).distinct().order_by('county')
-    sectors = (
-        Project.objects
-        .exclude(sector__isnull=True)
-        .exclude(sector='')
-        .values_list('sector', flat=True)
-        .distinct()
-        .order_by('sector')
-    )
+    options = filter_options()
+    counties = options["project_counties"]
+    sectors = options["sectors"]
     
     # Deep Insights Calculations
     total_projects = projects.count()
@@ -1272,7 +1579,11 @@ def project_map_view(request):
     
     # Create GeoJSON
     features = []
-    for project in projects:
+    map_projects = projects.for_map(
+        "start_date", "end_date", "description", "implementing_agency", "project_manager",
+        "progress", "last_update_at",
+    )
+    for project in map_projects:
         budget = project.budget or Decimal(0)
         budget_percentage = (budget / total_budget * Decimal(100)) if total_budget and budget else Decimal(0)
 
@@ -1280,7 +1591,7 @@ def project_map_view(request):
             "type": "Feature",
             "geometry": {
                 "type": "Point",
-                "coordinates": [project.location.x, project.location.y],
+                "coordinates": [project.lon, project.lat],
             },
             "properties": {
                 "id": project.id,
@@ -1294,7 +1605,9 @@ def project_map_view(request):
                 "description": project.description or "",
                 "implementing_agency": project.implementing_agency or "",
                 "project_manager": project.project_manager or "",
-                "budget_percentage": float(budget_percentage)  # convert Decimal to float for JSON
+                "budget_percentage": float(budget_percentage),  # convert Decimal to float for JSON
+                "progress": project.progress,
+                "last_update_at": project.last_update_at.isoformat() if project.last_update_at else "",
             }
         })
     
@@ -1309,6 +1622,7 @@ def project_map_view(request):
         "selected_statuses": status_filter,
         "selected_counties": county_filter,
         "selected_sectors": sector_filter,
+        "min_progress": min_progress or "",
         "total_projects": total_projects,
         "total_budget": total_budget,
         "county_distribution": county_distribution,
@@ -1323,21 +1637,67 @@ def project_map_view(request):
     return render(request, 'app/project_map.html', context)
 
 # ---------------- Citizen Report ---------------- #
+@csrf_exempt
 def submit_report(request, project_id):
+    # Spool the photo to disk as it arrives; must be set before CSRF reads the body
+    request.upload_handlers = [TemporaryFileUploadHandler(request)]
+    return _submit_report(request, project_id)
+
+
+@csrf_protect
+def _submit_report(request, project_id):
     project = get_object_or_404(Project, id=project_id)
+    status = 200
     if request.method == 'POST':
-        form = CitizenReportForm(request.POST, request.FILES)
-        if form.is_valid():
-            report = form.save(commit=False)
-            report.project = project
-            if request.user.is_authenticated:
-                report.reported_by = request.user
-            report.save()
+        key = intake.client_key(request)
+        form = ReportIntakeForm(request.POST, request.FILES)
+        if intake.throttle(key):
+            form.add_error(None, "You have sent several reports in a short time. Please wait a minute and try again.")
+            status = 429
+        elif form.is_valid():
+            intake.accept_report(project.pk, form.cleaned_data, key, request.user)
             return render(request, 'app/report_success.html', {'project': project})
     else:
-        form = CitizenReportForm()
+        form = ReportIntakeForm()
     context = {"form": form, "project": project}
-    return render(request, 'app/submit_report.html', context)
+    return render(request, 'app/submit_report.html', context, status=status)
+
+
+@csrf_exempt
+def report_intake(request, project_id):
+    """
+    JSON intake for citizen reports (mobile clients, campaign bursts).
+
+    Answers 202 with the report id once the report row and its job exist;
+    photo verification, variants and moderation flags follow in the
+    ``citizen_report_intake`` job. 429 with ``Retry-After`` when the client
+    is over ``REPORT_RATE_LIMIT``.
+
+    Apps send no CSRF token, so the endpoint is exempt and relies on the
+    rate limit and form validation. For the same reason a session cookie is
+    not taken as consent: reports are stored without ``reported_by``.
+    """
+    # Spool the photo to disk as it arrives instead of holding it in memory
+    request.upload_handlers = [TemporaryFileUploadHandler(request)]
+    try:
+        if request.method != "POST":
+            return JsonResponse({"error": "POST report_type, description and an optional photo"}, status=405)
+        key = intake.client_key(request)
+        retry_after = intake.throttle(key)
+        if retry_after:
+            response = JsonResponse({"error": "Too many reports from this client"}, status=429)
+            response["Retry-After"] = str(retry_after)
+            return response
+        if not Project.objects.filter(pk=project_id).exists():
+            return JsonResponse({"error": "Project not found"}, status=404)
+        form = ReportIntakeForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+        report = intake.accept_report(project_id, form.cleaned_data, key)
+        return JsonResponse({"id": report.pk, "status": "accepted"}, status=202)
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
 
 
 # ---------------- Static Pages ---------------- #
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings, read automatically from the working directory.
+
+Set WARM_CACHES_ON_START=1 to run ``manage.py warm_caches`` in every worker
+as soon as it has loaded the application. The release step already warms
+the shared database cache, so this is mainly useful with a per-process
+cache backend (CACHE_BACKEND=...locmem.LocMemCache).
+"""
+import os
+import threading
+
+
+def post_worker_init(worker):
+    if os.getenv("WARM_CACHES_ON_START", "False").lower() not in ["true", "1", "yes"]:
+        return
+
+    def warm():
+        from django.core.management import call_command
+        from django.db import connections
+
+        try:
+            call_command("warm_caches")
+        except Exception:
+            worker.log.exception("Cache warm-up failed")
+        finally:
+            connections.close_all()
+
+    # Run in the background so the worker starts accepting requests at once
+    threading.Thread(target=warm, name="warm-caches", daemon=True).start()